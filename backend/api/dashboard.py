@@ -5,15 +5,16 @@ This module provides endpoints for retrieving dashboard data and
 managing security settings for the authenticated user.
 """
 import logging
-import random
-from datetime import datetime, timedelta
 from typing import Any
 
+from core.exceptions import FxRateNotFoundError
+from core.responses import etag_matches, trusted_response
 from core.security import get_current_user, invalidate_all_user_sessions
 from db.database import get_db
-from fastapi import APIRouter, Depends, Request, Response
-from schemas.dashboard import DashboardData, Transaction
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
+from schemas.dashboard import DashboardData
 from schemas.user import AuthResponse
+from services.dashboard import get_dashboard
 from sqlalchemy.orm import Session
 
 # Configure logger
@@ -24,67 +25,48 @@ router = APIRouter(tags=["dashboard"])
 
 
 @router.get("/dashboard-data", response_model=DashboardData)
-async def get_dashboard_data(
+def get_dashboard_data(
     request: Request,
     response: Response,
     user: AuthResponse = Depends(get_current_user),
-) -> DashboardData:
+    db: Session = Depends(get_db),
+) -> Response | dict[str, Any]:
     """
-    Return randomized dashboard data for the authenticated user.
+    Return dashboard data for the authenticated user from the ledger.
+
+    Declared with ``def`` so FastAPI runs the ledger queries in its
+    threadpool instead of on the event loop. The dashboard comes from the
+    aggregate cache when it is current and carries an ETag; a request whose
+    If-None-Match still matches gets a 304 without touching the database.
 
     Args:
         request: The request object
         response: The response object
         user: The authenticated user (from dependency)
+        db: Database session (from dependency)
 
     Returns:
-        Dashboard data including account information and transactions
+        Dashboard data including account information and transactions, or
+        an empty 304 response if the client's copy is current
+
+    Raises:
+        HTTPException: 422 if an account's currency has no FX rate into the
+            reporting currency
     """
     logger.info(f"Dashboard data requested for user {user.user_id}")
 
-    # Generate random financial data (same as original implementation)
-    account_balance = round(random.uniform(5000, 15000), 2)
-    upcoming_bills = round(random.uniform(500, 3000), 2)
-    monthly_savings = round(random.uniform(200, 1000), 2)
-
-    # Generate fake recent transactions
-    transaction_types = [
-        "Grocery",
-        "Rent",
-        "Utilities",
-        "Entertainment",
-        "Income",
-        "Shopping",
-    ]
-    recent_transactions = []
-
-    now = datetime.now()
-    for i in range(5):
-        txn_date = now - timedelta(days=random.randint(0, 14))
-        txn_amount = round(random.uniform(-500, 1000), 2)
-        txn_type = random.choice(transaction_types)
-
-        recent_transactions.append(
-            Transaction(
-                id=f"txn-{i + 1}",
-                date=txn_date,
-                amount=txn_amount,
-                type=txn_type,
-                description=f"{txn_type} {'payment' if txn_amount < 0 else 'deposit'}",
-            )
+    try:
+        dashboard = get_dashboard(db, user)
+    except FxRateNotFoundError as e:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=str(e)
         )
+    headers = {"ETag": dashboard.etag, "Cache-Control": "private, no-cache"}
+    if etag_matches(request.headers.get("if-none-match"), dashboard.etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
 
-    logger.debug(
-        f"Generated {len(recent_transactions)} transactions for user {user.user_id}"
-    )
-
-    return DashboardData(
-        account_balance=account_balance,
-        upcoming_bills=upcoming_bills,
-        monthly_savings=monthly_savings,
-        recent_transactions=recent_transactions,
-        account_name=f"{user.username}'s Account",
-    )
+    response.headers.update(headers)
+    return trusted_response(dashboard.data, body=dashboard.body, headers=headers)
 
 
 @router.post("/security/logout-all-devices")
@@ -0,0 +1,104 @@
+"""
+Server-sent event stream.
+
+This module pushes new postings, balance changes and verification verdicts
+to the authenticated user's open browser tabs, so the frontend does not
+have to poll.
+"""
+import logging
+import time
+from collections.abc import AsyncIterator
+from functools import partial
+
+from core.config import settings
+from core.events import (
+    READY,
+    RESYNC,
+    Subscription,
+    encode_event,
+    event_bus,
+)
+from core.exceptions import EventStreamUnavailableError
+from core.responses import EventStreamResponse
+from core.security import get_current_user
+from fastapi import APIRouter, Depends, HTTPException, status
+from schemas.user import AuthResponse
+
+# Configure logger
+logger = logging.getLogger(__name__)
+
+# Create router
+router = APIRouter(tags=["events"])
+
+# Milliseconds a disconnected client waits before reconnecting
+RECONNECT_DELAY_MS = 3_000
+
+# Sent when a stream is idle so proxies and clients keep the connection open
+HEARTBEAT = b": ping\n\n"
+
+
+async def _stream(subscription: Subscription) -> AsyncIterator[bytes]:
+    """
+    Encode a subscription's events until it is closed or the client leaves.
+
+    The subscription is released by the response's on_close callback, which
+    also runs when the stream ends before this generator starts.
+    """
+    event_id = 0
+    yield b"retry: %d\n" % RECONNECT_DELAY_MS + encode_event(
+        event_id,
+        READY,
+        {"user_id": subscription.user_id, "server_time": int(time.time())},
+    )
+    while not subscription.closed:
+        events, overflowed = await subscription.get(settings.EVENTS_HEARTBEAT)
+        chunk = []
+        if overflowed:
+            event_id += 1
+            chunk.append(encode_event(event_id, RESYNC, {}))
+        for item in events:
+            event_id += 1
+            chunk.append(encode_event(event_id, item.type, item.data))
+        if chunk:
+            yield b"".join(chunk)
+        elif not subscription.closed:
+            yield HEARTBEAT
+
+
+@router.get("/events")
+async def stream_events(
+    user: AuthResponse = Depends(get_current_user),
+) -> EventStreamResponse:
+    """
+    Stream the authenticated user's ledger and verification events.
+
+    The response is a text/event-stream. It starts with a ``ready`` event
+    and then carries ``posting``, ``balance`` and ``verification`` events as
+    they are committed. A ``resync`` event means events were dropped because
+    the client fell behind (or missed them while reconnecting) and it should
+    refetch the dashboard. Idle streams receive a keep-alive comment every
+    EVENTS_HEARTBEAT seconds.
+
+    Args:
+        user: The authenticated user (from dependency)
+
+    Returns:
+        Streaming event response
+
+    Raises:
+        HTTPException: 503 if the worker has no room for another stream
+    """
+    try:
+        subscription = event_bus.subscribe(user.user_id)
+    except EventStreamUnavailableError as e:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail=str(e)
+        )
+
+    logger.debug(f"Event stream opened for user {user.user_id}")
+    return EventStreamResponse(
+        _stream(subscription),
+        on_disconnect=subscription.close,
+        on_close=partial(event_bus.unsubscribe, subscription),
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
@@ -0,0 +1,66 @@
+"""
+Ledger export endpoints.
+
+This module streams the authenticated user's full ledger or audit trail
+as NDJSON, CSV or Parquet for accountants and bulk consumers.
+"""
+import logging
+from datetime import datetime
+from typing import Literal
+
+from core.exceptions import ExportUnavailableError
+from core.security import get_current_user
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import StreamingResponse
+from schemas.user import AuthResponse
+from services.export import EXPORT_MEDIA_TYPES, stream_export
+
+# Configure logger
+logger = logging.getLogger(__name__)
+
+# Create router
+router = APIRouter(prefix="/export", tags=["export"])
+
+
+@router.get("/{dataset}")
+def export_dataset(
+    dataset: Literal["postings", "entries"],
+    export_format: Literal["ndjson", "csv", "parquet"] = Query(
+        "ndjson", alias="format", description="Output format"
+    ),
+    start: datetime | None = Query(None, description="Posted at or after"),
+    end: datetime | None = Query(None, description="Posted before"),
+    user: AuthResponse = Depends(get_current_user),
+) -> StreamingResponse:
+    """
+    Stream all of the user's postings or journal entries as a file download.
+
+    ``postings`` is the ledger, one row per posting on the user's accounts.
+    ``entries`` is the audit trail, one row per journal entry with its
+    chain hashes and signature. Rows are in ID order and streamed as they
+    are read, so there is no size limit and no response model.
+
+    Args:
+        dataset: "postings" or "entries"
+        export_format: "ndjson", "csv" or "parquet"
+        start: Only rows posted at or after this time
+        end: Only rows posted before this time
+        user: The authenticated user (from dependency)
+
+    Returns:
+        Streaming file response
+
+    Raises:
+        HTTPException: 501 if Parquet is requested but pyarrow is missing
+    """
+    try:
+        body = stream_export(user.user_id, dataset, export_format, start, end)
+    except ExportUnavailableError as e:
+        raise HTTPException(status_code=status.HTTP_501_NOT_IMPLEMENTED, detail=str(e))
+
+    filename = f"ledger-{dataset}.{export_format}"
+    return StreamingResponse(
+        body,
+        media_type=EXPORT_MEDIA_TYPES[export_format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
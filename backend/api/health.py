@@ -7,9 +7,15 @@ session management functionality.
 import logging
 from typing import Any
 
+from core.config import settings
+from core.events import event_bus
+from core.profiling import profiler
 from core.security import get_current_user
+from core.session_cache import session_cache
+from db.database import pool_stats
 from fastapi import APIRouter, Cookie, Depends, Request, Response
 from schemas.user import AuthResponse
+from services.dashboard_cache import dashboard_cache
 
 # Configure logger
 logger = logging.getLogger(__name__)
@@ -30,6 +36,105 @@ async def health_check() -> dict[str, Any]:
     return {"status": "ok", "version": "0.1.0"}
 
 
+@router.get("/health/session-cache")
+async def session_cache_stats() -> dict[str, Any]:
+    """
+    Report session cache size and hit/miss counters.
+
+    Returns:
+        Dictionary with session cache statistics
+    """
+    return session_cache.stats()
+
+
+@router.get("/health/dashboard-cache")
+async def dashboard_cache_stats() -> dict[str, Any]:
+    """
+    Report dashboard cache size and hit/miss counters.
+
+    Returns:
+        Dictionary with dashboard cache statistics
+    """
+    return dashboard_cache.stats()
+
+
+@router.get("/health/events")
+async def event_stream_stats() -> dict[str, Any]:
+    """
+    Report open event streams and delivery counters of this worker.
+
+    Returns:
+        Dictionary with event bus statistics
+    """
+    return event_bus.stats()
+
+
+@router.get("/health/pool")
+async def database_pool_stats() -> dict[str, Any]:
+    """
+    Report database connection pool usage.
+
+    Use this to size worker counts and pool settings against the shared
+    SQLite database that the frontend writes to.
+
+    Returns:
+        Dictionary with pool statistics per engine
+    """
+    return pool_stats()
+
+
+@router.get("/health/profiler")
+async def query_profiler_stats(
+    user: AuthResponse = Depends(get_current_user),
+) -> dict[str, Any]:
+    """
+    Report query profiler counters and recently flagged requests.
+
+    The flagged requests hold raw SQL and query plans, so they are only
+    reported in development; other environments get the counters.
+
+    Args:
+        user: The authenticated user (from dependency)
+
+    Returns:
+        Dictionary with profiler statistics, or enabled=False
+    """
+    if not settings.PROFILER_ENABLED:
+        return {"enabled": False}
+    stats = profiler.stats()
+    if not settings.is_development:
+        del stats["recent"]
+    return {"enabled": True, **stats}
+
+
+@router.get("/health/verification")
+async def verification_stats(request: Request) -> dict[str, Any]:
+    """
+    Report verification queue depth, throughput and model request counters.
+
+    Returns:
+        Dictionary with verification pipeline statistics
+    """
+    pipeline = request.app.state.verification
+    if pipeline is None:
+        return {"enabled": False}
+    return {"enabled": True, **pipeline.stats()}
+
+
+@router.get("/health/session-sweeper")
+async def session_sweeper_stats(request: Request) -> dict[str, Any]:
+    """
+    Report the expired-session sweeps run by this worker.
+
+    Returns:
+        Dictionary with session sweeper statistics
+    """
+    sweeper = request.app.state.session_sweeper
+    if sweeper is None:
+        return {"enabled": False}
+    return {"enabled": True, **sweeper.stats()}
+
+
 @router.get("/session/refresh")
 async def refresh_session(
     request: Request,
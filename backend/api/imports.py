@@ -0,0 +1,119 @@
+"""
+Statement import endpoints.
+
+This module provides endpoints for uploading bank statements into the
+authenticated user's accounts and checking on import jobs.
+"""
+import logging
+import os
+import shutil
+import tempfile
+
+from core.exceptions import (
+    AccountNotFoundError,
+    ImportConflictError,
+    ImportFormatError,
+    ImportJobNotFoundError,
+    LedgerReadOnlyError,
+)
+from core.security import get_current_user
+from db.database import get_db
+from fastapi import APIRouter, Depends, File, Form, HTTPException, UploadFile, status
+from schemas.imports import ImportJobResponse
+from schemas.user import AuthResponse
+from services.importer import get_import_job, import_statement
+from sqlalchemy.orm import Session
+
+# Configure logger
+logger = logging.getLogger(__name__)
+
+# Create router
+router = APIRouter(prefix="/imports", tags=["imports"])
+
+
+@router.post("", response_model=ImportJobResponse)
+def upload_statement(
+    file: UploadFile = File(..., description="CSV or OFX statement"),
+    account_id: int = Form(..., description="Account the statement belongs to"),
+    statement_format: str | None = Form(
+        None, alias="format", description="csv or ofx (default: from file name)"
+    ),
+    resume_job_id: int | None = Form(None, description="Import job to resume"),
+    user: AuthResponse = Depends(get_current_user),
+    db: Session = Depends(get_db),
+) -> ImportJobResponse:
+    """
+    Import an uploaded statement into one of the user's accounts.
+
+    The upload is copied to a temporary file in blocks and streamed into
+    the ledger in chunks, so memory stays flat for any file size. Uploading
+    the same file again resumes an interrupted import or returns the
+    completed job.
+
+    Args:
+        file: The statement file
+        account_id: The account the statement belongs to
+        statement_format: csv or ofx, inferred from the file name if omitted
+        resume_job_id: Resume this job even if the file content changed
+        user: The authenticated user (from dependency)
+        db: Database session (from dependency)
+
+    Returns:
+        The import job status, with the throughput of this run
+
+    Raises:
+        HTTPException: 400 for unsupported formats, 404 for unknown accounts
+            or jobs, 409 if the job is running elsewhere, 503 in read-only mode
+    """
+    fd, path = tempfile.mkstemp(suffix=os.path.splitext(file.filename or "")[1])
+    try:
+        with os.fdopen(fd, "wb") as f:
+            shutil.copyfileobj(file.file, f)
+
+        return import_statement(
+            db,
+            user.user_id,
+            account_id,
+            path,
+            filename=file.filename,
+            statement_format=statement_format,
+            resume_job_id=resume_job_id,
+        )
+    except ImportFormatError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    except (AccountNotFoundError, ImportJobNotFoundError) as e:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+    except ImportConflictError as e:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(e))
+    except LedgerReadOnlyError as e:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail=str(e)
+        )
+    finally:
+        os.unlink(path)
+
+
+@router.get("/{job_id}", response_model=ImportJobResponse)
+def get_import_status(
+    job_id: int,
+    user: AuthResponse = Depends(get_current_user),
+    db: Session = Depends(get_db),
+) -> ImportJobResponse:
+    """
+    Return the status of one of the user's import jobs.
+
+    Args:
+        job_id: The import job
+        user: The authenticated user (from dependency)
+        db: Database session (from dependency)
+
+    Returns:
+        The import job status
+
+    Raises:
+        HTTPException: 404 if the job is unknown
+    """
+    try:
+        return get_import_job(db, job_id, user.user_id)
+    except ImportJobNotFoundError as e:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
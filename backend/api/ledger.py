@@ -0,0 +1,68 @@
+"""
+Ledger audit endpoints.
+
+This module provides endpoints for verifying individual transactions
+against the sealed Merkle blocks of the ledger.
+"""
+import logging
+
+from core.exceptions import EntryNotFoundError, EntryNotSealedError
+from core.security import get_current_user
+from db.database import get_db
+from fastapi import APIRouter, Depends, HTTPException, status
+from schemas.ledger import InclusionProof
+from schemas.user import AuthResponse
+from services.blocks import get_inclusion_proof
+from sqlalchemy.orm import Session
+
+# Configure logger
+logger = logging.getLogger(__name__)
+
+# Create router
+router = APIRouter(prefix="/ledger", tags=["ledger"])
+
+
+@router.get("/proof/{transaction_id}", response_model=InclusionProof)
+def get_transaction_proof(
+    transaction_id: str,
+    user: AuthResponse = Depends(get_current_user),
+    db: Session = Depends(get_db),
+) -> InclusionProof:
+    """
+    Return the Merkle inclusion proof of one of the user's transactions.
+
+    The proof holds O(log n) sibling hashes. Recomputing the entry hash from
+    the transaction and walking the path to the block's Merkle root confirms
+    the transaction without reading the rest of the ledger.
+
+    Args:
+        transaction_id: The transaction identifier (as in Transaction.id) or
+            its journal entry ID
+        user: The authenticated user (from dependency)
+        db: Database session (from dependency)
+
+    Returns:
+        The inclusion proof
+
+    Raises:
+        HTTPException: 404 if the transaction is unknown, 409 if it has not
+            been sealed into a block yet
+    """
+    # The proof covers the whole journal entry, whichever posting is named
+    entry_id, dash, posting_id = transaction_id.partition("-")
+    if not entry_id.isdigit() or (dash and not posting_id.isdigit()):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Transaction not found"
+        )
+
+    try:
+        return get_inclusion_proof(db, int(entry_id), user.user_id)
+    except EntryNotFoundError:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Transaction not found"
+        )
+    except EntryNotSealedError:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Transaction is not sealed into a block yet",
+        )
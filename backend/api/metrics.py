@@ -0,0 +1,95 @@
+"""
+Prometheus metrics endpoint.
+
+This module exposes the request and database histograms of this worker,
+together with the cache, event stream and connection pool counters the
+health endpoints report, in the Prometheus text format.
+"""
+import logging
+from typing import Any
+
+from core.events import event_bus
+from core.metrics import CONTENT_TYPE, metrics, render_samples
+from core.session_cache import session_cache
+from db.database import pool_stats
+from fastapi import APIRouter, Response
+from services.dashboard_cache import dashboard_cache
+
+# Configure logger
+logger = logging.getLogger(__name__)
+
+# Create router
+router = APIRouter(tags=["metrics"])
+
+
+def _cache_lines(caches: dict[str, dict[str, Any]]) -> list[str]:
+    """Render the counters of the in-process caches."""
+    lines = []
+    for name, kind, documentation in (
+        ("hits", "counter", "Cache lookups answered from the cache."),
+        ("misses", "counter", "Cache lookups that missed."),
+        ("evictions", "counter", "Entries evicted to respect the size limit."),
+        ("size", "gauge", "Entries currently held."),
+    ):
+        lines += render_samples(
+            f"cache_{name}" + ("_total" if kind == "counter" else ""),
+            kind,
+            documentation,
+            [
+                ({"cache": cache}, stats[name])
+                for cache, stats in caches.items()
+                if name in stats
+            ],
+        )
+    return lines
+
+
+def _pool_lines() -> list[str]:
+    """Render the usage of the database connection pools."""
+    pools = {mode: stats for mode, stats in pool_stats().items() if "size" in stats}
+    lines = []
+    for name, documentation in (
+        ("checked_out", "Connections currently in use."),
+        ("overflow", "Connections open beyond the pool size."),
+    ):
+        lines += render_samples(
+            f"db_pool_{name}",
+            "gauge",
+            documentation,
+            [({"engine": mode}, stats[name]) for mode, stats in pools.items()],
+        )
+    return lines
+
+
+@router.get("/metrics", response_class=Response)
+async def prometheus_metrics() -> Response:
+    """
+    Report request, query, cache and pool metrics of this worker.
+
+    Returns:
+        The metrics in the Prometheus text exposition format
+    """
+    events = event_bus.stats()
+    lines = [
+        *metrics.render(),
+        *_cache_lines(
+            {
+                "session": session_cache.stats(),
+                "dashboard": dashboard_cache.stats(),
+            }
+        ),
+        *_pool_lines(),
+        *render_samples(
+            "event_streams",
+            "gauge",
+            "Open server-sent event streams.",
+            [({}, events["streams"])],
+        ),
+        *render_samples(
+            "event_resyncs_total",
+            "counter",
+            "Streams that fell behind and were told to resync.",
+            [({}, events["resyncs"])],
+        ),
+    ]
+    return Response("\n".join(lines) + "\n", media_type=CONTENT_TYPE)
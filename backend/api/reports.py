@@ -0,0 +1,69 @@
+"""
+Financial report endpoints.
+
+This module provides the trial balance, income statement, balance sheet
+and monthly cash flow of the authenticated user's ledger for a period.
+"""
+import logging
+from datetime import datetime
+from typing import Any
+
+from core.exceptions import FxRateNotFoundError, InvalidPeriodError
+from core.responses import trusted_response
+from core.security import get_current_user
+from db.database import get_db
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from schemas.report import FinancialReport
+from schemas.user import AuthResponse
+from services.reporting import get_financial_report
+from sqlalchemy.orm import Session
+
+# Configure logger
+logger = logging.getLogger(__name__)
+
+# Create router
+router = APIRouter(tags=["reports"])
+
+
+@router.get("/reports", response_model=FinancialReport)
+def get_reports(
+    start: datetime | None = Query(
+        None, description="Start of the period (default: start of this year)"
+    ),
+    end: datetime | None = Query(
+        None, description="End of the period, exclusive (default: end of today)"
+    ),
+    user: AuthResponse = Depends(get_current_user),
+    db: Session = Depends(get_db),
+) -> Response | dict[str, Any]:
+    """
+    Return the authenticated user's financial statements for a period.
+
+    Declared with ``def`` so FastAPI runs the ledger queries in its
+    threadpool. Reports are cached until a new journal entry is added or
+    the FX rates change.
+
+    Args:
+        start: Start of the period
+        end: End of the period (exclusive)
+        user: The authenticated user (from dependency)
+        db: Database session (from dependency)
+
+    Returns:
+        Trial balance, income statement, balance sheet and cash flow
+
+    Raises:
+        HTTPException: 400 if the period does not end after it starts, 422
+            if an account's currency has no FX rate into the reporting
+            currency for the period
+    """
+    try:
+        report = get_financial_report(db, user.user_id, start, end)
+    except InvalidPeriodError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    except FxRateNotFoundError as e:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=str(e)
+        )
+
+    return trusted_response(report)
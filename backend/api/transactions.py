@@ -0,0 +1,91 @@
+"""
+Transaction listing endpoints.
+
+This module provides cursor-paginated, filterable access to the
+authenticated user's transaction history.
+"""
+import logging
+from datetime import datetime
+from decimal import Decimal
+from typing import Any
+
+from core.config import settings
+from core.exceptions import InvalidCursorError
+from core.responses import trusted_response
+from core.security import get_current_user
+from db.database import get_db
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from schemas.transaction import TransactionPage
+from schemas.user import AuthResponse
+from services.transactions import list_transactions
+from sqlalchemy.orm import Session
+
+# Configure logger
+logger = logging.getLogger(__name__)
+
+# Create router
+router = APIRouter(tags=["transactions"])
+
+
+@router.get("/transactions", response_model=TransactionPage)
+def get_transactions(
+    cursor: str | None = Query(None, description="Cursor from the previous page"),
+    limit: int = Query(
+        settings.TRANSACTIONS_PAGE_SIZE,
+        ge=1,
+        le=settings.TRANSACTIONS_MAX_PAGE_SIZE,
+        description="Page size",
+    ),
+    account_id: int | None = Query(None, description="Only this account"),
+    start: datetime | None = Query(None, description="Posted at or after"),
+    end: datetime | None = Query(None, description="Posted before"),
+    type_: str | None = Query(None, alias="type", description="Transaction type"),
+    min_amount: Decimal | None = Query(None, description="Minimum amount"),
+    max_amount: Decimal | None = Query(None, description="Maximum amount"),
+    user: AuthResponse = Depends(get_current_user),
+    db: Session = Depends(get_db),
+) -> Response | dict[str, Any]:
+    """
+    Return one page of the authenticated user's transactions, newest first.
+
+    Pass the returned ``next_cursor`` back as ``cursor`` with the same
+    filters to get the following page. Deep pages cost the same as the
+    first one.
+
+    Args:
+        cursor: Cursor from the previous page, or None for the first page
+        limit: Page size, capped at TRANSACTIONS_MAX_PAGE_SIZE
+        account_id: Only transactions of this account of the user
+        start: Only transactions at or after this time
+        end: Only transactions before this time
+        type_: Only transactions of this type
+        min_amount: Only transactions of at least this amount
+        max_amount: Only transactions of at most this amount
+        user: The authenticated user (from dependency)
+        db: Database session (from dependency)
+
+    Returns:
+        The page of transactions and the cursor of the next page
+
+    Raises:
+        HTTPException: 400 if the cursor is malformed
+    """
+    try:
+        page = list_transactions(
+            db,
+            user.user_id,
+            limit,
+            cursor=cursor,
+            account_id=account_id,
+            start=start,
+            end=end,
+            category=type_,
+            min_amount=min_amount,
+            max_amount=max_amount,
+        )
+    except InvalidCursorError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor"
+        )
+
+    return trusted_response(page)
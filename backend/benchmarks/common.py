@@ -0,0 +1,341 @@
+"""
+Shared helpers for the backend benchmarks.
+
+Benchmarks run offline against a throwaway SQLite database seeded with the
+same user and session tables the SvelteKit frontend creates, and drive the
+API either in-process or through a real uvicorn server.
+"""
+import asyncio
+import hashlib
+import os
+import secrets
+import socket
+import sqlite3
+import subprocess
+import sys
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any
+
+import httpx
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+# Mirrors frontend/src/lib/server/db/schema.ts
+AUTH_SCHEMA = """
+CREATE TABLE IF NOT EXISTS user (
+    id TEXT PRIMARY KEY NOT NULL,
+    age INTEGER,
+    username TEXT NOT NULL UNIQUE,
+    password_hash TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS session (
+    id TEXT PRIMARY KEY NOT NULL,
+    user_id TEXT NOT NULL REFERENCES user(id),
+    expires_at INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS session_expires_at_idx ON session (expires_at);
+"""
+
+
+def seed_auth_database(path: Path, users: int, sessions_per_user: int = 1) -> list[str]:
+    """
+    Create the auth tables and fill them with users and live sessions.
+
+    Args:
+        path: SQLite database file to create
+        users: Number of users to create
+        sessions_per_user: Number of sessions per user
+
+    Returns:
+        The raw session tokens, as a browser would send them in the cookie
+    """
+    expires_at = int(time.time()) + 30 * 24 * 3600
+    tokens = []
+    con = sqlite3.connect(path)
+    try:
+        con.executescript(AUTH_SCHEMA)
+        con.executemany(
+            "INSERT INTO user (id, username, password_hash) VALUES (?, ?, ?)",
+            ((f"user-{i}", f"user{i}", "x") for i in range(users)),
+        )
+        rows = []
+        for i in range(users):
+            for _ in range(sessions_per_user):
+                token = secrets.token_hex(16)
+                tokens.append(token)
+                session_id = hashlib.sha256(token.encode()).hexdigest()
+                rows.append((session_id, f"user-{i}", expires_at))
+        con.executemany("INSERT INTO session VALUES (?, ?, ?)", rows)
+        con.commit()
+    finally:
+        con.close()
+    return tokens
+
+
+def seed_ledger_database(
+    users: int, entries_per_user: int, batch_size: int = 1_000
+) -> dict[str, dict[str, int]]:
+    """
+    Create the ledger tables and post synthetic entries for the first users.
+
+    Entries go through the ledger service, so they are chained, signed and
+    sealed into blocks like real ones, and are interleaved across users so
+    every user has entries in the sealed blocks. The environment
+    (DATABASE_URL, DATABASE_READ_ONLY=false, LEDGER_SIGNING_KEY_PATH) must
+    be set before calling; the backend is imported here so its settings
+    pick it up.
+
+    Args:
+        users: Number of users (user-0 ... user-N) to give a ledger
+        entries_per_user: Journal entries posted per user
+        batch_size: Entries posted per transaction
+
+    Returns:
+        Per user ID, the ID of the checking account and of the first entry
+    """
+    from datetime import UTC, datetime
+
+    import db.models  # noqa: F401
+    from core.config import settings
+    from db.database import Base, SessionLocal, engine
+    from db.models.ledger import Account, AccountType
+    from schemas.ledger import JournalEntryCreate, PostingCreate
+    from services.ledger import post_entries
+    from utils.crypto import generate_signing_key
+
+    if not os.path.exists(settings.LEDGER_SIGNING_KEY_PATH):
+        generate_signing_key(settings.LEDGER_SIGNING_KEY_PATH)
+    # The auth tables belong to the frontend and are seeded separately
+    Base.metadata.create_all(
+        engine,
+        tables=[
+            table
+            for table in Base.metadata.sorted_tables
+            if table.name not in ("user", "session")
+        ],
+    )
+
+    now = int(time.time())
+    ledgers: dict[str, dict[str, int]] = {}
+    with SessionLocal() as db:
+        accounts = {}
+        for i in range(users):
+            for name, kind in (
+                ("Checking", AccountType.ASSET),
+                ("Groceries", AccountType.EXPENSE),
+                ("Salary", AccountType.INCOME),
+            ):
+                account = Account(
+                    user_id=f"user-{i}", name=name, type=kind, created_at=now
+                )
+                db.add(account)
+                accounts[i, name] = account
+        db.flush()
+
+        entries = []
+        for n in range(users * entries_per_user):
+            i = n % users
+            salary = n // users % 10 == 0
+            amount = 250_000 if salary else 1_000 + n % 9_000
+            counter = accounts[i, "Salary" if salary else "Groceries"].id
+            checking = accounts[i, "Checking"].id
+            entries.append(
+                JournalEntryCreate(
+                    posted_at=datetime.fromtimestamp(
+                        now - (users * entries_per_user - n) * 600, UTC
+                    ),
+                    category="Salary" if salary else "Grocery",
+                    description=f"Synthetic entry {n}",
+                    postings=[
+                        PostingCreate(
+                            account_id=checking,
+                            amount_minor=amount if salary else -amount,
+                        ),
+                        PostingCreate(
+                            account_id=counter,
+                            amount_minor=-amount if salary else amount,
+                        ),
+                    ],
+                )
+            )
+
+        for start in range(0, len(entries), batch_size):
+            entry_ids = post_entries(db, entries[start : start + batch_size])
+            db.commit()
+            for n, entry_id in enumerate(entry_ids, start=start):
+                ledgers.setdefault(
+                    f"user-{n % users}",
+                    {
+                        "account_id": accounts[n % users, "Checking"].id,
+                        "entry_id": entry_id,
+                    },
+                )
+    return ledgers
+
+
+def percentile(samples: list[float], pct: float) -> float:
+    """
+    Nearest-rank percentile of a list of samples.
+
+    Args:
+        samples: The measured values
+        pct: Percentile between 0 and 100
+
+    Returns:
+        The percentile value, or 0.0 for an empty list
+    """
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    rank = max(0, min(len(ordered) - 1, round(pct / 100 * len(ordered)) - 1))
+    return ordered[rank]
+
+
+def summarize(latencies: list[float], elapsed: float) -> dict[str, Any]:
+    """
+    Summarize request latencies in seconds as throughput and percentiles.
+
+    Args:
+        latencies: Per-request latencies in seconds
+        elapsed: Wall-clock duration of the run in seconds
+
+    Returns:
+        Dictionary with request count, throughput and latency percentiles in ms
+    """
+    return {
+        "requests": len(latencies),
+        "throughput_rps": round(len(latencies) / elapsed, 1) if elapsed else 0.0,
+        "p50_ms": round(percentile(latencies, 50) * 1000, 3),
+        "p95_ms": round(percentile(latencies, 95) * 1000, 3),
+        "p99_ms": round(percentile(latencies, 99) * 1000, 3),
+        "max_ms": round(max(latencies, default=0.0) * 1000, 3),
+    }
+
+
+def free_port() -> int:
+    """Ask the OS for a free TCP port on localhost."""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+@contextmanager
+def run_server_process(
+    env: dict[str, str], timeout: float = 30.0
+) -> Iterator[tuple[str, subprocess.Popen]]:
+    """
+    Run the API under uvicorn in a subprocess.
+
+    Args:
+        env: Environment overrides for the server (settings)
+        timeout: Seconds to wait for the server to become healthy
+
+    Yields:
+        Tuple of (base URL of the running server, server process)
+    """
+    port = free_port()
+    process = subprocess.Popen(
+        [
+            sys.executable, "-m", "uvicorn", "main:app",
+            "--host", "127.0.0.1", "--port", str(port),
+            "--log-level", "warning", "--no-access-log",
+        ],
+        cwd=BACKEND_DIR,
+        env={**os.environ, "LOG_LEVEL": "WARNING", **env},
+    )
+    base_url = f"http://127.0.0.1:{port}"
+    try:
+        deadline = time.monotonic() + timeout
+        while True:
+            try:
+                httpx.get(f"{base_url}/api/health", timeout=1.0)
+                break
+            except httpx.TransportError:
+                if process.poll() is not None or time.monotonic() > deadline:
+                    raise RuntimeError("Benchmark server failed to start") from None
+                time.sleep(0.1)
+        yield base_url, process
+    finally:
+        process.terminate()
+        process.wait(timeout=10)
+
+
+@contextmanager
+def run_server(env: dict[str, str], timeout: float = 30.0) -> Iterator[str]:
+    """
+    Run the API under uvicorn in a subprocess.
+
+    Args:
+        env: Environment overrides for the server (settings)
+        timeout: Seconds to wait for the server to become healthy
+
+    Yields:
+        The base URL of the running server
+    """
+    with run_server_process(env, timeout) as (base_url, _):
+        yield base_url
+
+
+def process_rss(pid: int) -> int:
+    """
+    Resident set size of a process in bytes (Linux only).
+
+    Args:
+        pid: The process ID
+
+    Returns:
+        The RSS in bytes
+    """
+    with open(f"/proc/{pid}/status") as status:
+        for line in status:
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1]) * 1024
+    raise RuntimeError(f"No RSS reported for process {pid}")
+
+
+async def run_http_load(
+    base_url: str,
+    path: str,
+    tokens: list[str],
+    clients: int,
+    requests_per_client: int,
+) -> dict[str, Any]:
+    """
+    Drive an endpoint with concurrent clients, each on its own session.
+
+    Args:
+        base_url: Base URL of the server
+        path: Request path
+        tokens: Session tokens, assigned to clients round-robin
+        clients: Number of concurrent clients
+        requests_per_client: Sequential requests issued by each client
+
+    Returns:
+        Summary of the run (see summarize), plus the error count
+    """
+    latencies: list[float] = []
+    errors = 0
+    limits = httpx.Limits(max_connections=clients, max_keepalive_connections=clients)
+
+    async with httpx.AsyncClient(
+        base_url=base_url, limits=limits, timeout=60.0
+    ) as client:
+
+        async def worker(index: int) -> None:
+            nonlocal errors
+            cookies = {"auth-session": tokens[index % len(tokens)]} if tokens else {}
+            for _ in range(requests_per_client):
+                start = time.perf_counter()
+                response = await client.get(path, cookies=cookies)
+                latencies.append(time.perf_counter() - start)
+                if response.status_code != 200:
+                    errors += 1
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker(i) for i in range(clients)))
+        elapsed = time.perf_counter() - started
+
+    return {**summarize(latencies, elapsed), "errors": errors}
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Idle connection benchmark for the server-sent event stream.
+
+Runs the API under uvicorn against a seeded SQLite database, opens a
+growing number of idle /api/events streams and reports the server's
+resident memory per open stream, plus how long the streams took to open.
+Memory is read from /proc, so this runs on Linux only.
+
+Usage:
+    python benchmarks/event_stream.py --streams 1000 5000
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+from urllib.parse import urlsplit
+
+# Add the backend directory to sys.path before imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import httpx  # noqa: E402
+from benchmarks.common import (  # noqa: E402
+    process_rss,
+    run_server_process,
+    seed_auth_database,
+)
+
+
+async def open_stream(
+    host: str, port: int, token: str
+) -> tuple[asyncio.StreamReader, asyncio.StreamWriter]:
+    """Open one event stream and wait for its ready event."""
+    reader, writer = await asyncio.open_connection(host, port)
+    writer.write(
+        f"GET /api/events HTTP/1.1\r\nHost: {host}\r\n"
+        f"Cookie: auth-session={token}\r\nAccept: text/event-stream\r\n\r\n".encode()
+    )
+    await writer.drain()
+    await reader.readuntil(b"event: ready")
+    return reader, writer
+
+
+async def run(base_url: str, pid: int, tokens: list[str], counts: list[int]) -> list:
+    """Open streams up to each count and sample the server's memory."""
+    url = urlsplit(base_url)
+    streams: list[tuple[asyncio.StreamReader, asyncio.StreamWriter]] = []
+    baseline = process_rss(pid)
+    results = []
+    for count in counts:
+        started = time.perf_counter()
+        while len(streams) < count:
+            batch = [
+                tokens[index % len(tokens)]
+                for index in range(len(streams), min(count, len(streams) + 200))
+            ]
+            streams.extend(
+                await asyncio.gather(
+                    *(open_stream(url.hostname, url.port, token) for token in batch)
+                )
+            )
+        elapsed = time.perf_counter() - started
+        await asyncio.sleep(1.0)
+
+        rss = process_rss(pid)
+        async with httpx.AsyncClient(base_url=base_url) as client:
+            stats = (await client.get("/api/health/events")).json()
+        results.append(
+            {
+                "streams": stats["streams"],
+                "open_s": round(elapsed, 3),
+                "rss_mb": round(rss / 2**20, 1),
+                "kb_per_stream": round((rss - baseline) / 1024 / count, 1),
+            }
+        )
+
+    for _, writer in streams:
+        writer.close()
+    return results
+
+
+def main() -> None:
+    """Run the benchmark and print the results as JSON."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--streams", type=int, nargs="+", default=[1000, 5000])
+    parser.add_argument("--users", type=int, default=1000)
+    parser.add_argument("--output", type=Path, help="Write results to this file")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = Path(tmp) / "auth.db"
+        tokens = seed_auth_database(db_path, users=args.users)
+        env = {
+            "DATABASE_URL": f"sqlite:///{db_path}",
+            "EVENTS_MAX_STREAMS": str(max(args.streams)),
+        }
+        with run_server_process(env) as (base_url, process):
+            results = asyncio.run(
+                run(base_url, process.pid, tokens, sorted(args.streams))
+            )
+
+    output = json.dumps({"users": args.users, "results": results}, indent=2)
+    if args.output:
+        args.output.write_text(output)
+    print(output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+"""
+Startup time of the API and the command-line tools.
+
+Runs each target in a fresh interpreter a few times and reports the best
+wall time, together with the slowest imports from ``python -X importtime``,
+so a regression can be traced to the module that caused it. The API target
+imports main (what every worker pays before serving); the scripts are run
+with --help, which is what they cost before doing any work. A target that
+exceeds its budget fails the run.
+
+Budgets are generous multiples of times measured on a single-core sandbox;
+pass --budget-scale to adapt them to slower or faster machines.
+
+Usage:
+    python benchmarks/import_time.py
+    python benchmarks/import_time.py --targets main --top 20
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any
+
+# Add the backend directory to sys.path before imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.common import BACKEND_DIR  # noqa: E402
+
+# Interpreter arguments per target
+TARGETS = {
+    "main": ["-c", "import main"],
+    "config": ["-c", "import core.config"],
+    "init_db": ["init_db.py", "--help"],
+    "import_statements": ["import_statements.py", "--help"],
+    "import_rates": ["import_rates.py", "--help"],
+    "verify_ledger": ["verify_ledger.py", "--help"],
+    "generate_data": ["generate_data.py", "--help"],
+}
+
+# Wall-time budgets in milliseconds, including interpreter startup
+BUDGETS_MS = {
+    "main": 2_500,
+    "config": 700,
+    "init_db": 400,
+    "import_statements": 400,
+    "import_rates": 400,
+    "verify_ledger": 400,
+    "generate_data": 400,
+}
+
+
+def run_target(
+    arguments: list[str], env: dict[str, str], importtime: bool = False
+) -> tuple[float, str]:
+    """
+    Run a target once in a fresh interpreter.
+
+    Args:
+        arguments: Interpreter arguments
+        env: Environment of the interpreter
+        importtime: Collect the -X importtime report
+
+    Returns:
+        Tuple of (wall time in seconds, importtime report or "")
+    """
+    flags = ["-X", "importtime"] if importtime else []
+    command = [sys.executable, *flags, *arguments]
+    started = time.perf_counter()
+    completed = subprocess.run(
+        command, cwd=BACKEND_DIR, env=env, capture_output=True, text=True
+    )
+    elapsed = time.perf_counter() - started
+    if completed.returncode != 0:
+        raise RuntimeError(f"{' '.join(arguments)} failed:\n{completed.stderr}")
+    return elapsed, completed.stderr if importtime else ""
+
+
+def slowest_imports(report: str, top: int) -> list[dict[str, Any]]:
+    """
+    Pick the modules that took longest to import from an importtime report.
+
+    Modules are ranked by their own time, excluding their submodules, which
+    points at the module doing the work rather than the package above it.
+
+    Args:
+        report: Standard error of a ``-X importtime`` run
+        top: Number of modules to return
+
+    Returns:
+        The slowest modules with their self and cumulative milliseconds
+    """
+    imports = []
+    for line in report.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        own, cumulative, name = line[len("import time:") :].split("|")
+        if not own.strip().isdigit():
+            # The header line
+            continue
+        imports.append(
+            {
+                "module": name.strip(),
+                "self_ms": round(int(own) / 1000, 1),
+                "cumulative_ms": round(int(cumulative) / 1000, 1),
+            }
+        )
+    imports.sort(key=lambda item: -item["self_ms"])
+    return imports[:top]
+
+
+def measure_imports(
+    targets: list[str], repeat: int = 3, top: int = 8
+) -> dict[str, dict[str, Any]]:
+    """
+    Measure the startup time of the targets.
+
+    The targets run against a throwaway SQLite path, so nothing is created
+    in the working tree.
+
+    Args:
+        targets: Names from TARGETS
+        repeat: Timed runs per target; the best is reported
+        top: Slowest imports listed per target
+
+    Returns:
+        Per target: best and median wall time and the slowest imports
+    """
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        env = {
+            **os.environ,
+            "DATABASE_URL": f"sqlite:///{Path(tmp) / 'startup.db'}",
+            "LOG_LEVEL": "WARNING",
+        }
+        for name in targets:
+            arguments = TARGETS[name]
+            # The first run warms the bytecode and file system caches
+            run_target(arguments, env)
+            times = sorted(run_target(arguments, env)[0] for _ in range(repeat))
+            _, report = run_target(arguments, env, importtime=True)
+            results[name] = {
+                "best_ms": round(times[0] * 1000, 1),
+                "median_ms": round(times[len(times) // 2] * 1000, 1),
+                "slowest_imports": slowest_imports(report, top),
+            }
+    return results
+
+
+def check_budgets(
+    results: dict[str, dict[str, Any]], scale: float = 1.0
+) -> list[str]:
+    """
+    Compare startup times with their budgets.
+
+    Args:
+        results: Output of measure_imports
+        scale: Multiplier applied to every budget
+
+    Returns:
+        Descriptions of the targets over budget
+    """
+    return [
+        f"import/{name}: {result['best_ms']} ms over the "
+        f"{BUDGETS_MS[name] * scale:.0f} ms budget"
+        for name, result in results.items()
+        if name in BUDGETS_MS and result["best_ms"] > BUDGETS_MS[name] * scale
+    ]
+
+
+def main() -> None:
+    """Measure startup times and check them against the budgets."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument(
+        "--targets", nargs="+", choices=list(TARGETS), default=list(TARGETS)
+    )
+    parser.add_argument("--repeat", type=int, default=5, help="Timed runs per target")
+    parser.add_argument("--top", type=int, default=8, help="Slowest imports listed")
+    parser.add_argument(
+        "--budget-scale", type=float, default=1.0, help="Multiplier for the budgets"
+    )
+    parser.add_argument("--output", type=Path, help="Write results to this file")
+    args = parser.parse_args()
+
+    results = measure_imports(args.targets, args.repeat, args.top)
+    over_budget = check_budgets(results, args.budget_scale)
+    output = json.dumps({"results": results, "over_budget": over_budget}, indent=2)
+    if args.output:
+        args.output.write_text(output)
+    print(output)
+
+    if over_budget:
+        print("\n".join(["Over budget:", *over_budget]), file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
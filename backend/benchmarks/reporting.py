@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+"""
+Benchmark of the financial reports on a heavy ledger.
+
+Generates one synthetic user with many purchases a day into a throwaway
+SQLite database (or uses an existing database) and times building the
+trial balance, income statement, balance sheet and cash flow for a full
+year, a year with partial first and last days, and one month, cold (cache
+cleared) and cached. For comparison it also times loading the year's raw
+postings into NumPy columns, which is what the reports avoid by reading
+full days from the balance checkpoints.
+
+Usage:
+    python benchmarks/reporting.py
+    python benchmarks/reporting.py --purchases 3000 --days 365
+    python benchmarks/reporting.py --database sqlite:////tmp/ledger.db --user u1
+"""
+import argparse
+import itertools
+import json
+import os
+import sys
+import tempfile
+import time
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import Any
+
+# Add the backend directory to sys.path before imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np  # noqa: E402
+
+SECONDS_PER_DAY = 86_400
+
+
+def best_of(func: Any, repeat: int) -> float:
+    """Return the best wall time of repeated calls in milliseconds."""
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - started)
+    return round(best * 1000, 2)
+
+
+def run(user_id: str, repeat: int) -> dict[str, Any]:
+    """Time the reports of a user over their ledger's history."""
+    # Imported here so the settings see the benchmark environment
+    from db.database import SessionLocal
+    from db.models.ledger import Account, Posting
+    from services.reporting import get_financial_report, report_cache
+    from sqlalchemy import func, select
+
+    with SessionLocal() as db:
+        first, last = db.execute(
+            select(func.min(Posting.posted_at), func.max(Posting.posted_at))
+            .join(Account, Account.id == Posting.account_id)
+            .where(Account.user_id == user_id)
+        ).one()
+        if first is None:
+            raise SystemExit(f"User {user_id} has no postings")
+        busiest = db.execute(
+            select(Posting.account_id, func.count())
+            .join(Account, Account.id == Posting.account_id)
+            .where(Account.user_id == user_id)
+            .group_by(Posting.account_id)
+            .order_by(func.count().desc())
+            .limit(1)
+        ).one()
+
+        start = first - first % SECONDS_PER_DAY
+        end = last - last % SECONDS_PER_DAY + SECONDS_PER_DAY
+        periods = {
+            "history": (start, end),
+            "partial_days": (start + SECONDS_PER_DAY // 2, end - SECONDS_PER_DAY // 2),
+            "last_30_days": (end - 30 * SECONDS_PER_DAY, end),
+        }
+
+        results: dict[str, Any] = {}
+        for name, (low, high) in periods.items():
+            low_dt = datetime.fromtimestamp(low, UTC)
+            high_dt = datetime.fromtimestamp(high, UTC)
+
+            def cold(low_dt=low_dt, high_dt=high_dt) -> None:
+                report_cache.clear()
+                get_financial_report(db, user_id, low_dt, high_dt)
+
+            results[name] = {
+                "days": round((high - low) / SECONDS_PER_DAY, 1),
+                "cold_ms": best_of(cold, repeat),
+                "cached_ms": best_of(
+                    lambda low_dt=low_dt, high_dt=high_dt: get_financial_report(
+                        db, user_id, low_dt, high_dt
+                    ),
+                    repeat,
+                ),
+            }
+
+        account_ids = db.scalars(
+            select(Account.id).where(Account.user_id == user_id)
+        ).all()
+        scan = (
+            select(Posting.account_id, Posting.posted_at, Posting.amount_minor)
+            .where(
+                Posting.account_id.in_(account_ids),
+                Posting.posted_at >= start,
+                Posting.posted_at < end,
+            )
+        )
+
+        def load_postings() -> np.ndarray:
+            rows = db.execute(scan)
+            values = itertools.chain.from_iterable(rows)
+            return np.fromiter(values, dtype=np.int64).reshape(-1, 3)
+
+        postings = len(load_postings())
+        return {
+            "user_id": user_id,
+            "postings": postings,
+            "busiest_account_postings": busiest[1],
+            "reports": results,
+            "posting_scan_ms": best_of(load_postings, max(1, repeat // 2)),
+        }
+
+
+def main() -> None:
+    """Generate or open a ledger, time the reports and print JSON."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument(
+        "--database", help="Use this DATABASE_URL instead of generating a ledger"
+    )
+    parser.add_argument("--user", help="User to report on (default: the first)")
+    parser.add_argument("--days", type=int, default=365, help="Days of history")
+    parser.add_argument(
+        "--purchases", type=float, default=1_000, help="Purchases per day"
+    )
+    parser.add_argument("--repeat", type=int, default=5, help="Timed runs")
+    parser.add_argument("--output", type=Path, help="Write results to this file")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        os.environ.update(
+            {
+                "DATABASE_URL": args.database or f"sqlite:///{Path(tmp) / 'r.db'}",
+                "DATABASE_READ_ONLY": "false",
+                "LEDGER_SIGNING_KEY_PATH": str(Path(tmp) / "signing_key.pem"),
+                "LOG_LEVEL": "WARNING",
+            }
+        )
+        from db.database import SessionLocal, engine
+        from db.models.user import User
+        from services.synthetic import SyntheticOptions, generate_ledger
+        from sqlalchemy import select
+        from utils.crypto import generate_signing_key
+
+        generated = None
+        if not args.database:
+            generate_signing_key(os.environ["LEDGER_SIGNING_KEY_PATH"])
+            today = int(time.time()) // SECONDS_PER_DAY * SECONDS_PER_DAY
+            report = generate_ledger(
+                engine,
+                SyntheticOptions(
+                    users=1,
+                    start=today - args.days * SECONDS_PER_DAY,
+                    days=args.days,
+                    purchases_per_day=args.purchases,
+                ),
+            )
+            generated = {"entries": report.entries, "seconds": round(report.elapsed)}
+
+        user_id = args.user
+        if user_id is None:
+            with SessionLocal() as db:
+                user_id = db.scalar(select(User.id).order_by(User.id).limit(1))
+        results = {"generated": generated, **run(user_id, args.repeat)}
+
+    output = json.dumps(results, indent=2)
+    if args.output:
+        args.output.write_text(output)
+    print(output)
+
+
+if __name__ == "__main__":
+    main()
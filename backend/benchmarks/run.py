@@ -0,0 +1,486 @@
+#!/usr/bin/env python3
+"""
+Benchmark suite for the API hot paths.
+
+Seeds a throwaway SQLite database with users, sessions and a signed,
+sealed ledger, then drives each scenario with concurrent clients twice:
+in-process through an ASGI transport (the application alone) and over
+HTTP against a uvicorn server (the full stack). Throughput and p50/p95/p99
+latencies, the best of a few rounds, are written as JSON and compared with
+a stored baseline; a scenario whose throughput drops or whose p95 grows by
+more than the tolerance is reported as a regression and the run exits
+non-zero.
+
+Baselines are only comparable on the same machine and with the same
+parameters; the stored one was recorded on a single-core sandbox. Record
+one with --update-baseline before a change and rerun after it, and raise
+--tolerance on noisy machines. The startup time of the API and the
+command-line tools is measured too (see import_time.py) and fails the run
+when over its budget, with or without a baseline.
+
+Scenarios:
+    health        GET /api/health (no authentication)
+    session       GET /api/session/refresh (get_current_user)
+    dashboard     GET /api/dashboard-data
+    transactions  GET /api/transactions
+    proof         GET /api/ledger/proof/{id} (ledger read path)
+    ledger_write  POST /api/imports with a small statement (ledger write path)
+
+Usage:
+    python benchmarks/run.py
+    python benchmarks/run.py --update-baseline
+    python benchmarks/run.py --drivers asgi --scenarios dashboard session
+    python benchmarks/run.py --env SESSION_CACHE_ENABLED=false
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+# Add the backend directory to sys.path before imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import httpx  # noqa: E402
+from benchmarks.common import (  # noqa: E402
+    BACKEND_DIR,
+    run_server,
+    seed_auth_database,
+    seed_ledger_database,
+    summarize,
+)
+from benchmarks.import_time import (  # noqa: E402
+    TARGETS,
+    check_budgets,
+    measure_imports,
+)
+
+# Baseline compared against by default
+BASELINE_PATH = Path(__file__).resolve().parent / "baseline.json"
+
+# Parameters that must match for results to be comparable
+COMPARED_PARAMETERS = (
+    "users",
+    "ledger_users",
+    "entries",
+    "clients",
+    "requests",
+    "rounds",
+)
+
+# Statement lines uploaded per ledger_write request
+STATEMENT_ROWS = 10
+
+
+@dataclass(frozen=True)
+class Scenario:
+    """One request pattern of the suite."""
+
+    name: str
+    method: str
+    # May contain {entry_id}, filled in per user
+    path: str
+    authenticated: bool = True
+    upload: bool = False
+    # Cap on concurrent clients; SQLite serializes writers, so more
+    # concurrent writes only measure lock waits (and busy timeouts)
+    max_clients: int | None = None
+
+
+SCENARIOS = {
+    scenario.name: scenario
+    for scenario in (
+        Scenario("health", "GET", "/api/health", authenticated=False),
+        Scenario("session", "GET", "/api/session/refresh"),
+        Scenario("dashboard", "GET", "/api/dashboard-data"),
+        Scenario("transactions", "GET", "/api/transactions?limit=50"),
+        Scenario("proof", "GET", "/api/ledger/proof/{entry_id}"),
+        Scenario(
+            "ledger_write", "POST", "/api/imports", upload=True, max_clients=4
+        ),
+    )
+}
+
+
+@dataclass(frozen=True)
+class BenchUser:
+    """A seeded user with a ledger, as a client acts on it."""
+
+    token: str
+    account_id: int
+    entry_id: int
+
+
+def statement(client_index: int, sequence: int) -> bytes:
+    """Create a small CSV statement whose content is unique to the request."""
+    lines = ["Date,Amount,Type,Description,Reference"]
+    for row in range(STATEMENT_ROWS):
+        lines.append(
+            f"2024-03-{1 + row % 28:02d},-{1 + row}.99,Grocery,Market,"
+            f"B{client_index}-{sequence}-{row}-{time.time_ns()}"
+        )
+    return ("\n".join(lines) + "\n").encode()
+
+
+def build_request(
+    client: httpx.AsyncClient,
+    scenario: Scenario,
+    user: BenchUser,
+    origin: str,
+    client_index: int,
+    sequence: int,
+) -> httpx.Request:
+    """Build one request of a scenario for a user."""
+    headers = {"Origin": origin}
+    if scenario.authenticated:
+        headers["Cookie"] = f"auth-session={user.token}"
+    path = scenario.path.format(entry_id=user.entry_id)
+
+    if not scenario.upload:
+        return client.build_request(scenario.method, path, headers=headers)
+    return client.build_request(
+        scenario.method,
+        path,
+        headers=headers,
+        files={"file": ("bench.csv", statement(client_index, sequence))},
+        data={"account_id": str(user.account_id), "format": "csv"},
+    )
+
+
+async def run_scenario(
+    client: httpx.AsyncClient,
+    origin: str,
+    scenario: Scenario,
+    users: list[BenchUser],
+    clients: int,
+    requests_per_client: int,
+    warmup: int,
+    rounds: int,
+) -> dict[str, Any]:
+    """
+    Drive a scenario with concurrent clients, each acting as its own user.
+
+    Args:
+        client: HTTP client bound to the application or server
+        origin: Origin header sent with every request (CSRF check)
+        scenario: The scenario
+        users: Seeded users, assigned to clients round-robin
+        clients: Number of concurrent clients (capped by the scenario)
+        requests_per_client: Timed requests issued by each client per round
+        warmup: Untimed requests issued by each client first
+        rounds: Timed rounds; the best value of each figure is reported
+
+    Returns:
+        The best value of each figure (see summarize) over the rounds, the
+        number of clients, the error count and the errors by status code
+    """
+    errors: dict[str, int] = {}
+    clients = min(clients, scenario.max_clients or clients)
+
+    async def worker(
+        index: int, first: int, count: int, latencies: list[float] | None
+    ) -> None:
+        user = users[index % len(users)]
+        for sequence in range(first, first + count):
+            request = build_request(client, scenario, user, origin, index, sequence)
+            start = time.perf_counter()
+            response = await client.send(request)
+            await response.aread()
+            if latencies is None:
+                continue
+            latencies.append(time.perf_counter() - start)
+            if response.status_code != 200:
+                status = str(response.status_code)
+                errors[status] = errors.get(status, 0) + 1
+
+    await asyncio.gather(*(worker(i, 0, warmup, None) for i in range(clients)))
+
+    summaries = []
+    for round_index in range(rounds):
+        latencies: list[float] = []
+        first = warmup + round_index * requests_per_client
+        started = time.perf_counter()
+        await asyncio.gather(
+            *(
+                worker(i, first, requests_per_client, latencies)
+                for i in range(clients)
+            )
+        )
+        summaries.append(summarize(latencies, time.perf_counter() - started))
+
+    # Interference only ever slows a round down, so the best round is the
+    # most reproducible figure
+    best = {
+        key: (max if key == "throughput_rps" else min)(s[key] for s in summaries)
+        for key in summaries[0]
+    }
+    return {
+        **best,
+        "clients": clients,
+        "errors": sum(errors.values()),
+        "error_statuses": errors,
+    }
+
+
+async def run_in_process(
+    scenarios: list[Scenario], users: list[BenchUser], args: argparse.Namespace
+) -> dict[str, dict[str, Any]]:
+    """Drive the scenarios through the application in this process."""
+    # Imported here so the settings see the benchmark environment
+    from main import app
+
+    results = {}
+    async with app.router.lifespan_context(app):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(
+            transport=transport, base_url="http://testserver", timeout=60.0
+        ) as client:
+            for scenario in scenarios:
+                results[scenario.name] = await run_scenario(
+                    client,
+                    "http://testserver",
+                    scenario,
+                    users,
+                    args.clients,
+                    args.requests,
+                    args.warmup,
+                    args.rounds,
+                )
+    return results
+
+
+async def run_over_http(
+    base_url: str,
+    scenarios: list[Scenario],
+    users: list[BenchUser],
+    args: argparse.Namespace,
+) -> dict[str, dict[str, Any]]:
+    """Drive the scenarios against a running server."""
+    limits = httpx.Limits(
+        max_connections=args.clients, max_keepalive_connections=args.clients
+    )
+    results = {}
+    async with httpx.AsyncClient(
+        base_url=base_url, limits=limits, timeout=60.0
+    ) as client:
+        for scenario in scenarios:
+            results[scenario.name] = await run_scenario(
+                client,
+                base_url,
+                scenario,
+                users,
+                args.clients,
+                args.requests,
+                args.warmup,
+                args.rounds,
+            )
+    return results
+
+
+def compare(
+    report: dict[str, Any], baseline: dict[str, Any], tolerance: float
+) -> tuple[dict[str, Any], list[str]]:
+    """
+    Compare results with a baseline.
+
+    Args:
+        report: The results of this run
+        baseline: A stored report
+        tolerance: Allowed relative drop in throughput or growth in p95
+
+    Returns:
+        Tuple of (current/baseline ratios per driver and scenario,
+        descriptions of the regressions)
+    """
+    ratios: dict[str, Any] = {}
+    regressions = []
+    for driver, scenarios in report["results"].items():
+        for name, current in scenarios.items():
+            previous = baseline.get("results", {}).get(driver, {}).get(name)
+            if not previous:
+                continue
+            throughput = current["throughput_rps"] / max(
+                previous["throughput_rps"], 1e-9
+            )
+            p95 = current["p95_ms"] / max(previous["p95_ms"], 1e-9)
+            ratios.setdefault(driver, {})[name] = {
+                "throughput": round(throughput, 3),
+                "p95": round(p95, 3),
+            }
+            if throughput < 1 - tolerance:
+                regressions.append(
+                    f"{driver}/{name}: throughput {current['throughput_rps']} "
+                    f"vs {previous['throughput_rps']} req/s"
+                )
+            if p95 > 1 + tolerance:
+                regressions.append(
+                    f"{driver}/{name}: p95 {current['p95_ms']} "
+                    f"vs {previous['p95_ms']} ms"
+                )
+            if current["errors"]:
+                regressions.append(f"{driver}/{name}: {current['errors']} errors")
+    return ratios, regressions
+
+
+def git_revision() -> str | None:
+    """Return the commit the backend is checked out at, if known."""
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=BACKEND_DIR,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main() -> None:
+    """Seed the database, run the suite and compare with the baseline."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument(
+        "--scenarios", nargs="+", choices=list(SCENARIOS), default=list(SCENARIOS)
+    )
+    parser.add_argument(
+        "--drivers", nargs="+", choices=["asgi", "http"], default=["asgi", "http"]
+    )
+    parser.add_argument("--clients", type=int, default=20)
+    parser.add_argument(
+        "--requests", type=int, default=25, help="Timed requests per client and round"
+    )
+    parser.add_argument(
+        "--warmup", type=int, default=2, help="Untimed requests per client"
+    )
+    parser.add_argument(
+        "--rounds", type=int, default=3, help="Timed rounds per scenario"
+    )
+    parser.add_argument("--users", type=int, default=1000)
+    parser.add_argument(
+        "--ledger-users", type=int, default=20, help="Users given a ledger"
+    )
+    parser.add_argument(
+        "--entries", type=int, default=500, help="Journal entries per ledger user"
+    )
+    parser.add_argument(
+        "--env",
+        nargs="+",
+        default=[],
+        metavar="KEY=VALUE",
+        help="Settings overrides for the API",
+    )
+    parser.add_argument(
+        "--skip-imports", action="store_true", help="Do not measure startup time"
+    )
+    parser.add_argument("--output", type=Path, help="Write results to this file")
+    parser.add_argument("--baseline", type=Path, default=BASELINE_PATH)
+    parser.add_argument(
+        "--update-baseline",
+        action="store_true",
+        help="Store the results as the new baseline",
+    )
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.25,
+        help="Allowed relative regression before failing",
+    )
+    args = parser.parse_args()
+
+    scenarios = [SCENARIOS[name] for name in args.scenarios]
+    # Measured first, in fresh interpreters, before this process loads the app
+    imports = None if args.skip_imports else measure_imports(list(TARGETS))
+    overrides = dict(item.split("=", 1) for item in args.env)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = Path(tmp) / "bench.db"
+        env = {
+            "DATABASE_URL": f"sqlite:///{db_path}",
+            "DATABASE_READ_ONLY": "false",
+            "LEDGER_SIGNING_KEY_PATH": str(Path(tmp) / "signing_key.pem"),
+            "VERDICT_CACHE_PATH": "",
+            "LOG_LEVEL": "WARNING",
+            **overrides,
+        }
+        os.environ.update(env)
+
+        tokens = seed_auth_database(db_path, users=args.users)
+        ledgers = seed_ledger_database(args.ledger_users, args.entries)
+        users = [
+            BenchUser(
+                token=tokens[i],
+                account_id=ledgers[f"user-{i}"]["account_id"],
+                entry_id=ledgers[f"user-{i}"]["entry_id"],
+            )
+            for i in range(args.ledger_users)
+        ]
+
+        results = {}
+        if "asgi" in args.drivers:
+            results["asgi"] = asyncio.run(run_in_process(scenarios, users, args))
+        if "http" in args.drivers:
+            with run_server(env) as base_url:
+                results["http"] = asyncio.run(
+                    run_over_http(base_url, scenarios, users, args)
+                )
+
+    report: dict[str, Any] = {
+        "parameters": {
+            "users": args.users,
+            "ledger_users": args.ledger_users,
+            "entries": args.entries,
+            "clients": args.clients,
+            "requests": args.requests,
+            "rounds": args.rounds,
+            "env": overrides,
+        },
+        "environment": {
+            "revision": git_revision(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+        },
+        "results": results,
+    }
+
+    regressions: list[str] = []
+    if imports is not None:
+        report["imports"] = imports
+        regressions.extend(check_budgets(imports))
+    if not args.update_baseline and args.baseline.exists():
+        baseline = json.loads(args.baseline.read_text())
+        mismatched = [
+            name
+            for name in COMPARED_PARAMETERS
+            if baseline.get("parameters", {}).get(name) != report["parameters"][name]
+        ]
+        if mismatched:
+            report["comparison"] = {"skipped": f"parameters differ: {mismatched}"}
+        else:
+            ratios, regressions = compare(report, baseline, args.tolerance)
+            report["comparison"] = {
+                "baseline": baseline.get("environment", {}).get("revision"),
+                "ratios": ratios,
+                "regressions": regressions,
+            }
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        args.output.write_text(output)
+    if args.update_baseline:
+        args.baseline.write_text(output + "\n")
+    print(output)
+
+    if regressions:
+        print("\n".join(["Regressions:", *regressions]), file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Load test for session validation in sync and async database mode.
+
+Runs the API under uvicorn twice against the same seeded SQLite database,
+once with the sync engine and once with DATABASE_ASYNC enabled, and drives
+/api/session/refresh with concurrent clients. The session cache is disabled
+by default so every request reaches the database.
+
+Usage:
+    python benchmarks/session_load.py --clients 200 --requests 25
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+# Add the backend directory to sys.path before imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.common import (  # noqa: E402
+    run_http_load,
+    run_server,
+    seed_auth_database,
+)
+
+MODES = {
+    "sync": {"DATABASE_ASYNC": "false"},
+    "async": {"DATABASE_ASYNC": "true"},
+}
+
+
+def main() -> None:
+    """Run the load test for each engine mode and print the results as JSON."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--clients", type=int, default=200)
+    parser.add_argument("--requests", type=int, default=25)
+    parser.add_argument("--users", type=int, default=1000)
+    parser.add_argument(
+        "--with-cache", action="store_true", help="Keep the session cache enabled"
+    )
+    parser.add_argument("--output", type=Path, help="Write results to this file")
+    args = parser.parse_args()
+
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = Path(tmp) / "auth.db"
+        tokens = seed_auth_database(db_path, users=args.users)
+
+        for mode, env in MODES.items():
+            env = {
+                **env,
+                "DATABASE_URL": f"sqlite:///{db_path}",
+                "SESSION_CACHE_ENABLED": str(args.with_cache).lower(),
+            }
+            with run_server(env) as base_url:
+                results[mode] = asyncio.run(
+                    run_http_load(
+                        base_url,
+                        "/api/session/refresh",
+                        tokens,
+                        clients=args.clients,
+                        requests_per_client=args.requests,
+                    )
+                )
+
+    output = json.dumps({"clients": args.clients, "results": results}, indent=2)
+    if args.output:
+        args.output.write_text(output)
+    print(output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+"""
+Throughput benchmark for the dual-model verification pipeline.
+
+Runs the pipeline against two in-process stub model servers with a simulated
+per-request latency and measures how many transactions per minute are
+verified for a range of batch sizes. Nothing is stored and no network
+access is needed. With --cache the memory tier of the verdict cache is
+enabled and --distinct controls how many different transactions recur.
+
+Usage:
+    python benchmarks/verification_throughput.py --items 2000 --latency 0.5
+    python benchmarks/verification_throughput.py --cache --distinct 200
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+from datetime import UTC, datetime
+from pathlib import Path
+
+# Add the backend directory to sys.path before imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import httpx  # noqa: E402
+from schemas.verification import (  # noqa: E402
+    VerificationItem,
+    VerificationPosting,
+    VerificationStatus,
+)
+from services.verification import ModelClient, VerificationPipeline  # noqa: E402
+from services.verification.cache import VerdictCache  # noqa: E402
+from services.verification.stub_server import create_stub_app  # noqa: E402
+
+
+def make_items(count: int, distinct: int) -> list[VerificationItem]:
+    """Create synthetic balanced transactions, some with large amounts."""
+    now = datetime.now(UTC)
+    return [
+        VerificationItem(
+            entry_id=i,
+            posted_at=now,
+            category="Grocery",
+            description=f"Grocery payment {i}",
+            postings=[
+                VerificationPosting(
+                    account="Groceries",
+                    account_type="expense",
+                    amount_minor=(i % distinct) * 100_000 % 9_700_000,
+                    currency="USD",
+                ),
+                VerificationPosting(
+                    account="Checking",
+                    account_type="asset",
+                    amount_minor=-((i % distinct) * 100_000 % 9_700_000),
+                    currency="USD",
+                ),
+            ],
+        )
+        for i in range(1, count + 1)
+    ]
+
+
+async def run(
+    items: list[VerificationItem],
+    batch_size: int,
+    concurrency: int,
+    latency: float,
+    error_rate: float,
+    cache: bool,
+) -> dict:
+    """Verify all items once and report throughput and outcomes."""
+    clients = [
+        ModelClient(
+            name,
+            f"http://{name}/v1",
+            concurrency=concurrency,
+            transport=httpx.ASGITransport(
+                app=create_stub_app(latency, max_amount, error_rate)
+            ),
+            backend="stub",
+        )
+        for name, max_amount in [("primary", 10_000_000), ("secondary", 5_000_000)]
+    ]
+    stored = []
+    pipeline = VerificationPipeline(
+        *clients,
+        sink=stored.extend,
+        queue_size=len(items),
+        batch_size=batch_size,
+        batch_wait=0.05,
+        max_in_flight=concurrency,
+        cache=VerdictCache(memory_size=len(items), max_age=3600) if cache else None,
+    )
+
+    await pipeline.start()
+    started = time.perf_counter()
+    for item in items:
+        pipeline.submit(item)
+    await pipeline.join()
+    elapsed = time.perf_counter() - started
+    stats = pipeline.stats()
+    await pipeline.stop()
+
+    return {
+        "batch_size": batch_size,
+        "elapsed_s": round(elapsed, 3),
+        "items_per_minute": round(len(stored) / elapsed * 60),
+        "outcomes": {
+            str(status): sum(1 for r in stored if r.status == status)
+            for status in VerificationStatus
+        },
+        "failed": stats["failed"],
+        "requests": sum(model["requests"] for model in stats["models"]),
+        "retries": sum(model["retries"] for model in stats["models"]),
+        "cache_hit_rate": stats["cache"]["hit_rate"] if cache else None,
+    }
+
+
+def main() -> None:
+    """Run the benchmark for each batch size and print the results as JSON."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--items", type=int, default=2000)
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[5, 25, 50])
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument(
+        "--latency", type=float, default=0.5, help="Seconds per model request"
+    )
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument(
+        "--distinct", type=int, default=97, help="Distinct transaction shapes"
+    )
+    parser.add_argument(
+        "--cache", action="store_true", help="Enable the memory verdict cache"
+    )
+    parser.add_argument("--output", type=Path, help="Write results to this file")
+    args = parser.parse_args()
+
+    items = make_items(args.items, args.distinct)
+    results = [
+        asyncio.run(
+            run(
+                items,
+                batch_size,
+                args.concurrency,
+                args.latency,
+                args.error_rate,
+                args.cache,
+            )
+        )
+        for batch_size in args.batch_sizes
+    ]
+
+    output = json.dumps(
+        {"items": args.items, "concurrency": args.concurrency, "results": results},
+        indent=2,
+    )
+    if args.output:
+        args.output.write_text(output)
+    print(output)
+
+
+if __name__ == "__main__":
+    main()
@@ -11,6 +11,12 @@ from typing import Literal
 from pydantic import Field, field_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
+# Project root; relative file paths in the settings are resolved against it,
+# as relative SQLite database paths are, whatever the working directory
+BASE_DIR = os.path.dirname(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+)
+
 
 class Settings(BaseSettings):
     """Application settings that can be loaded from environment variables"""
@@ -22,6 +28,65 @@ class Settings(BaseSettings):
     )
     DATABASE_READ_ONLY: bool = True
     DATABASE_ECHO: bool = False
+    DATABASE_ASYNC: bool = Field(
+        False,
+        description="Use the async engine (aiosqlite/asyncpg) for session lookups",
+    )
+
+    # Connection pool settings
+    DATABASE_POOL_SIZE: int = Field(5, ge=1, description="Persistent connections")
+    DATABASE_MAX_OVERFLOW: int = Field(
+        10, ge=0, description="Extra connections allowed under load"
+    )
+    DATABASE_POOL_TIMEOUT: float = Field(
+        30.0, gt=0, description="Seconds to wait for a free connection"
+    )
+    DATABASE_POOL_RECYCLE: int = Field(
+        -1, description="Seconds before a connection is replaced (-1 disables)"
+    )
+    DATABASE_POOL_PRE_PING: bool = False
+
+    # SQLite connection tuning
+    SQLITE_MMAP_SIZE: int = Field(
+        256 * 1024 * 1024, ge=0, description="Bytes of the file to memory-map"
+    )
+    SQLITE_CACHE_SIZE: int = Field(
+        -64_000, description="Page cache size (negative values are KiB)"
+    )
+    SQLITE_TEMP_STORE_MEMORY: bool = True
+
+    # Ledger settings
+    LEDGER_CHAIN_CHECKPOINT_INTERVAL: int = Field(
+        10_000, ge=1, description="Entries per hash-chain verification segment"
+    )
+    LEDGER_BLOCK_SIZE: int = Field(
+        1024, ge=1, description="Entries sealed into each Merkle block"
+    )
+    LEDGER_SIGNING_KEY_PATH: str = Field(
+        "data/ledger_signing_key.pem",
+        description="Ed25519 private key (PKCS#8 PEM) that signs journal entries; "
+        "relative paths are resolved against the project root",
+        validate_default=True,
+    )
+    LEDGER_VERIFY_KEY_PATH: str = Field(
+        "",
+        description="Ed25519 public key (PEM) for audits; derived from the "
+        "signing key when empty",
+    )
+
+    # Currency settings
+    REPORTING_CURRENCY: str = Field(
+        "USD",
+        pattern=r"^[A-Z]{3}$",
+        description="ISO 4217 currency that dashboard totals and reports are "
+        "converted into",
+    )
+    FX_RATES_TTL: float = Field(
+        60.0,
+        gt=0,
+        description="Seconds the in-memory FX rate index is used before it is "
+        "reloaded; bounds staleness after rates added by other processes",
+    )
 
     # API settings
     API_V1_PREFIX: str = "/api"
@@ -29,10 +94,49 @@ class Settings(BaseSettings):
     PROJECT_DESCRIPTION: str = "API for Double-LLMedger financial transactions ledger"
     VERSION: str = "0.1.0"
 
+    # Import settings
+    IMPORT_CHUNK_SIZE: int = Field(
+        1_000, ge=1, description="Statement rows written per transaction"
+    )
+    IMPORT_SUSPENSE_ACCOUNT: str = Field(
+        "Import suspense",
+        description="Account that balances imported statement lines",
+    )
+
+    # Pagination settings
+    TRANSACTIONS_PAGE_SIZE: int = Field(50, ge=1, description="Default page size")
+    TRANSACTIONS_MAX_PAGE_SIZE: int = Field(
+        200, ge=1, description="Largest page size a client may request"
+    )
+
+    # Serialization settings
+    FAST_SERIALIZATION: bool = Field(
+        True,
+        description="Encode list-heavy responses with orjson, skipping "
+        "response model validation",
+    )
+
+    # Export settings
+    EXPORT_BATCH_SIZE: int = Field(
+        10_000, ge=1, description="Rows fetched and encoded per export chunk"
+    )
+
     # Server settings
     HOST: str = "0.0.0.0"
     PORT: int = 8000
     RELOAD: bool = True
+    WORKERS: int = Field(
+        0, ge=0, description="Worker processes of serve.py; 0 uses the CPU count"
+    )
+    GRACEFUL_TIMEOUT: float = Field(
+        30.0, gt=0, description="Seconds workers get to finish requests on stop"
+    )
+
+    # Warm-up settings
+    WARMUP_ENABLED: bool = True
+    WARMUP_SESSIONS: int = Field(
+        1_000, ge=0, description="Recent sessions loaded into the cache at startup"
+    )
 
     # CORS settings
     CORS_ORIGINS: list[str] = ["http://localhost:5173"]
@@ -41,6 +145,136 @@ class Settings(BaseSettings):
     SECRET_KEY: str = "change_this_to_a_secure_random_value"
     ALLOWED_ORIGIN: str = "http://localhost:5173"
 
+    # Session cache settings
+    SESSION_CACHE_ENABLED: bool = True
+    SESSION_CACHE_MAX_SIZE: int = Field(
+        10_000, ge=0, description="Maximum number of cached sessions"
+    )
+    SESSION_CACHE_TTL: float = Field(
+        30.0,
+        gt=0,
+        description="Seconds a validated session is served before re-validation",
+    )
+
+    # Session sweeper settings
+    SESSION_SWEEP_ENABLED: bool = Field(
+        True,
+        description="Delete expired sessions in the background; needs "
+        "DATABASE_READ_ONLY=false",
+    )
+    SESSION_SWEEP_INTERVAL: float = Field(
+        300.0, gt=0, description="Seconds between sweeps for expired sessions"
+    )
+    SESSION_SWEEP_BATCH_SIZE: int = Field(
+        1_000, ge=1, description="Expired sessions deleted per transaction"
+    )
+
+    # Dashboard cache settings
+    DASHBOARD_CACHE_ENABLED: bool = True
+    DASHBOARD_CACHE_MAX_SIZE: int = Field(
+        10_000, ge=0, description="Maximum number of cached dashboards"
+    )
+    DASHBOARD_CACHE_TTL: float = Field(
+        30.0,
+        gt=0,
+        description="Seconds a dashboard is served before it is rebuilt; bounds "
+        "staleness after writes made by other processes",
+    )
+
+    # Report cache settings
+    REPORT_CACHE_MAX_SIZE: int = Field(
+        1_000, ge=0, description="Maximum number of cached financial reports"
+    )
+
+    # Event stream settings
+    EVENTS_QUEUE_SIZE: int = Field(
+        256, ge=1, description="Events queued per stream before a resync"
+    )
+    EVENTS_MAX_STREAMS: int = Field(
+        10_000, ge=0, description="Concurrent event streams per worker"
+    )
+    EVENTS_HEARTBEAT: float = Field(
+        15.0, gt=0, description="Seconds between keep-alive comments on a stream"
+    )
+
+    # Metrics settings
+    METRICS_ENABLED: bool = Field(
+        True,
+        description="Serve /metrics and record the duration of database queries",
+    )
+
+    # Query profiler settings
+    PROFILER_ENABLED: bool = Field(
+        False, description="Profile the SQL queries of sampled requests"
+    )
+    PROFILER_SAMPLE_RATE: float = Field(
+        1.0, ge=0, le=1, description="Fraction of requests to profile"
+    )
+    PROFILER_SLOW_QUERY_MS: float = Field(
+        100.0, ge=0, description="Milliseconds after which a query is reported"
+    )
+    PROFILER_EXPLAIN: bool = Field(
+        False, description="Capture EXPLAIN QUERY PLAN for slow SQLite queries"
+    )
+    PROFILER_REPEAT_THRESHOLD: int = Field(
+        5, ge=2, description="Executions of one query shape reported as N+1"
+    )
+    PROFILER_HISTORY: int = Field(
+        100, ge=1, description="Flagged request profiles kept for inspection"
+    )
+
+    # Verification settings
+    VERIFICATION_ENABLED: bool = Field(
+        False, description="Run the dual-model verification pipeline in the API"
+    )
+    VERIFICATION_BACKEND: Literal["http", "stub"] = Field(
+        "stub", description="Call real model endpoints or the in-process stub"
+    )
+    VERIFICATION_PRIMARY_URL: str = "http://localhost:9001/v1"
+    VERIFICATION_PRIMARY_MODEL: str = "primary"
+    VERIFICATION_SECONDARY_URL: str = "http://localhost:9002/v1"
+    VERIFICATION_SECONDARY_MODEL: str = "secondary"
+    VERIFICATION_API_KEY: str = ""
+    VERIFICATION_QUEUE_SIZE: int = Field(
+        10_000, ge=1, description="Transactions waiting for verification"
+    )
+    VERIFICATION_BATCH_SIZE: int = Field(
+        25, ge=1, description="Transactions per model prompt"
+    )
+    VERIFICATION_BATCH_WAIT: float = Field(
+        0.5, ge=0, description="Seconds to wait for a batch to fill"
+    )
+    VERIFICATION_CONCURRENCY: int = Field(
+        8, ge=1, description="Concurrent requests per model"
+    )
+    VERIFICATION_MAX_RETRIES: int = Field(
+        4, ge=0, description="Retries per request on errors and rate limits"
+    )
+    VERIFICATION_TIMEOUT: float = Field(
+        60.0, gt=0, description="Seconds before a model request times out"
+    )
+    VERIFICATION_POLL_INTERVAL: float = Field(
+        5.0, gt=0, description="Seconds between scans for unverified entries"
+    )
+
+    # Verdict cache settings
+    VERDICT_CACHE_ENABLED: bool = True
+    VERDICT_CACHE_MEMORY_SIZE: int = Field(
+        50_000, ge=0, description="Verdicts held in the memory tier"
+    )
+    VERDICT_CACHE_MAX_AGE: float = Field(
+        30 * 86_400.0, gt=0, description="Seconds a cached verdict stays valid"
+    )
+    VERDICT_CACHE_PATH: str = Field(
+        "data/verdict_cache.db",
+        description="SQLite file of the persistent tier (empty for memory only); "
+        "relative paths are resolved against the project root",
+        validate_default=True,
+    )
+    VERDICT_CACHE_MAX_ROWS: int = Field(
+        1_000_000, ge=1, description="Verdicts kept in the persistent tier"
+    )
+
     # Logging settings
     LOG_LEVEL: Literal["DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL"] = "INFO"
 
@@ -65,6 +299,16 @@ class Settings(BaseSettings):
             raise ValueError("Default secret key cannot be used in production")
         return v
 
+    @field_validator(
+        "LEDGER_SIGNING_KEY_PATH", "LEDGER_VERIFY_KEY_PATH", "VERDICT_CACHE_PATH"
+    )
+    @classmethod
+    def resolve_path(cls, v: str) -> str:
+        """Make a relative file path absolute against the project root"""
+        if v and not os.path.isabs(v):
+            return os.path.abspath(os.path.join(BASE_DIR, v))
+        return v
+
     @property
     def is_development(self) -> bool:
         """Check if running in development mode"""
@@ -84,8 +328,3 @@ def get_settings() -> Settings:
 
 # Create global settings instance for simple imports
 settings = get_settings()
-
-# Ensure data directory exists
-if settings.DATABASE_URL.startswith("sqlite:///"):
-    db_path = settings.DATABASE_URL.replace("sqlite:///", "")
-    os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
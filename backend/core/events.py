@@ -0,0 +1,340 @@
+"""
+In-process event bus for the server-sent event stream.
+
+Ledger writes and verification verdicts are published per user and fanned
+out to every connected stream of that user in this worker. Each stream has
+a small bounded queue: a client that does not keep up has its backlog
+dropped and receives a single ``resync`` event telling it to refetch,
+instead of letting the queue grow or slowing the publisher down.
+
+Subscriptions live on the event loop. Publishers may run in other threads
+(sync endpoints, the write path, the verification sink) and hand events to
+the loop with ``call_soon_threadsafe``. Events raised inside a database
+transaction are published only once it commits, so clients never see a
+change that was rolled back. Processes without a running bus (command-line
+tools) publish nothing, and nothing is relayed between the workers of
+serve.py, so a stream misses events published by the other workers.
+"""
+import asyncio
+import logging
+from collections import deque
+from collections.abc import Iterable
+from dataclasses import dataclass
+from typing import Any
+
+import orjson
+from core.config import settings
+from core.exceptions import EventStreamUnavailableError
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+# Configure logger
+logger = logging.getLogger(__name__)
+
+# Session.info key of the events a transaction publishes when it commits
+PENDING_EVENTS_KEY = "event_bus_pending"
+
+# Event types sent on the stream
+READY = "ready"
+RESYNC = "resync"
+POSTING = "posting"
+BALANCE = "balance"
+VERIFICATION = "verification"
+
+
+@dataclass(frozen=True, slots=True)
+class Event:
+    """An event for the streams of one user."""
+
+    type: str
+    data: dict[str, Any]
+
+
+def encode_event(event_id: int, event_type: str, data: dict[str, Any]) -> bytes:
+    """
+    Encode an event in the text/event-stream format.
+
+    Args:
+        event_id: Sequence number of the event on its stream
+        event_type: The event type
+        data: JSON-serializable event data
+
+    Returns:
+        The encoded event, terminated by a blank line
+    """
+    return b"id: %d\nevent: %s\ndata: %s\n\n" % (
+        event_id,
+        event_type.encode(),
+        orjson.dumps(data, option=orjson.OPT_UTC_Z),
+    )
+
+
+class Subscription:
+    """The bounded event queue of one connected stream."""
+
+    __slots__ = (
+        "user_id",
+        "max_size",
+        "closed",
+        "dropped",
+        "_events",
+        "_overflowed",
+        "_wakeup",
+    )
+
+    def __init__(self, user_id: str, max_size: int) -> None:
+        """
+        Create an empty subscription.
+
+        Args:
+            user_id: The ID of the user whose events it receives
+            max_size: Events held before the backlog is dropped
+        """
+        self.user_id = user_id
+        self.max_size = max_size
+        self.closed = False
+        self.dropped = 0
+        self._events: deque[Event] = deque()
+        self._overflowed = False
+        self._wakeup = asyncio.Event()
+
+    def push(self, item: Event) -> bool:
+        """
+        Queue an event, dropping the backlog if the client has fallen behind.
+
+        Must be called on the event loop.
+
+        Args:
+            item: The event
+
+        Returns:
+            False if the backlog had to be dropped
+        """
+        queued = True
+        if len(self._events) >= self.max_size:
+            self.dropped += len(self._events)
+            self._events.clear()
+            self._overflowed = True
+            queued = False
+        self._events.append(item)
+        self._wakeup.set()
+        return queued
+
+    def close(self) -> None:
+        """End the stream after it has sent what is queued."""
+        self.closed = True
+        self._wakeup.set()
+
+    async def get(self, timeout: float) -> tuple[list[Event], bool]:
+        """
+        Wait for queued events.
+
+        Args:
+            timeout: Seconds to wait before returning empty-handed
+
+        Returns:
+            Tuple of (events in order, whether events were dropped before them)
+        """
+        if not self._events and not self._overflowed and not self.closed:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout)
+            except TimeoutError:
+                return [], False
+        self._wakeup.clear()
+
+        events = list(self._events)
+        self._events.clear()
+        overflowed, self._overflowed = self._overflowed, False
+        return events, overflowed
+
+
+class EventBus:
+    """Per-user fan-out of events to the streams of this worker."""
+
+    def __init__(self, queue_size: int, max_subscribers: int) -> None:
+        """
+        Create a bus that is not yet running.
+
+        Args:
+            queue_size: Events queued per stream before its backlog is dropped
+            max_subscribers: Maximum number of concurrent streams
+        """
+        self.queue_size = queue_size
+        self.max_subscribers = max_subscribers
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._subscribers: dict[str, set[Subscription]] = {}
+        self._count = 0
+        self.delivered = 0
+        self.resyncs = 0
+        self.rejected = 0
+
+    @property
+    def running(self) -> bool:
+        """Whether the bus is attached to an event loop."""
+        return self._loop is not None
+
+    def start(self, loop: asyncio.AbstractEventLoop) -> None:
+        """
+        Attach the bus to the event loop that serves the streams.
+
+        Args:
+            loop: The running event loop
+        """
+        self._loop = loop
+
+    def close(self) -> None:
+        """End every stream and detach from the loop. Call on the loop."""
+        for subscriptions in self._subscribers.values():
+            for subscription in subscriptions:
+                subscription.close()
+        self._loop = None
+
+    def subscribe(self, user_id: str) -> Subscription:
+        """
+        Open a stream for a user. Call on the loop.
+
+        Args:
+            user_id: The ID of the user
+
+        Returns:
+            The new subscription
+
+        Raises:
+            EventStreamUnavailableError: If the bus is not running or full
+        """
+        if self._loop is None:
+            raise EventStreamUnavailableError("Event stream is not running")
+        if self._count >= self.max_subscribers:
+            self.rejected += 1
+            raise EventStreamUnavailableError("Too many event streams")
+
+        subscription = Subscription(user_id, self.queue_size)
+        self._subscribers.setdefault(user_id, set()).add(subscription)
+        self._count += 1
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        """
+        Close a stream. Call on the loop.
+
+        Args:
+            subscription: The subscription returned by subscribe
+        """
+        subscriptions = self._subscribers.get(subscription.user_id)
+        if subscriptions is None or subscription not in subscriptions:
+            return
+        subscriptions.discard(subscription)
+        if not subscriptions:
+            del self._subscribers[subscription.user_id]
+        self._count -= 1
+
+    def has_subscribers(self, user_id: str) -> bool:
+        """
+        Check whether a user has a connected stream, from any thread.
+
+        Lets publishers skip building events nobody receives.
+
+        Args:
+            user_id: The ID of the user
+
+        Returns:
+            True if the user has at least one stream in this worker
+        """
+        return self._loop is not None and user_id in self._subscribers
+
+    def publish(self, events: Iterable[tuple[str, Event]]) -> None:
+        """
+        Publish events to the users' streams, from any thread.
+
+        Args:
+            events: Tuples of (user ID, event), delivered in order
+        """
+        loop = self._loop
+        if loop is None:
+            return
+        batch = [(user_id, item) for user_id, item in events]
+        if not batch:
+            return
+        try:
+            loop.call_soon_threadsafe(self._deliver, batch)
+        except RuntimeError:
+            # The loop closed during shutdown
+            pass
+
+    def disconnect_user(self, user_id: str) -> None:
+        """
+        End all streams of a user, from any thread (e.g. after logout).
+
+        Args:
+            user_id: The ID of the user
+        """
+        loop = self._loop
+        if loop is None:
+            return
+        try:
+            loop.call_soon_threadsafe(self._disconnect, user_id)
+        except RuntimeError:
+            pass
+
+    def stats(self) -> dict[str, Any]:
+        """
+        Report stream counts and delivery counters.
+
+        Returns:
+            Dictionary with event bus statistics
+        """
+        return {
+            "running": self.running,
+            "streams": self._count,
+            "users": len(self._subscribers),
+            "max_streams": self.max_subscribers,
+            "queue_size": self.queue_size,
+            "delivered": self.delivered,
+            "resyncs": self.resyncs,
+            "rejected": self.rejected,
+        }
+
+    def _deliver(self, batch: list[tuple[str, Event]]) -> None:
+        """Fan a batch of events out to the streams. Runs on the loop."""
+        for user_id, item in batch:
+            for subscription in self._subscribers.get(user_id, ()):
+                if not subscription.push(item):
+                    self.resyncs += 1
+                self.delivered += 1
+
+    def _disconnect(self, user_id: str) -> None:
+        """End the streams of a user. Runs on the loop."""
+        for subscription in self._subscribers.get(user_id, ()):
+            subscription.close()
+
+
+def publish_on_commit(db: Session, events: Iterable[tuple[str, Event]]) -> None:
+    """
+    Publish events once the session's transaction commits.
+
+    Args:
+        db: The session making the change
+        events: Tuples of (user ID, event)
+    """
+    db.info.setdefault(PENDING_EVENTS_KEY, []).extend(events)
+
+
+@event.listens_for(Session, "after_commit")
+def _publish_committed(session: Session) -> None:
+    """Publish the events of a committed transaction."""
+    events = session.info.pop(PENDING_EVENTS_KEY, None)
+    if events:
+        event_bus.publish(events)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_rolled_back(session: Session) -> None:
+    """Forget the events of a rolled-back transaction."""
+    session.info.pop(PENDING_EVENTS_KEY, None)
+
+
+# Create global event bus instance for simple imports
+event_bus = EventBus(
+    queue_size=settings.EVENTS_QUEUE_SIZE,
+    max_subscribers=settings.EVENTS_MAX_STREAMS,
+)
@@ -0,0 +1,66 @@
+"""
+Custom exceptions for the application.
+
+This module defines the domain errors raised by the service layer. API
+handlers translate them into HTTP responses.
+"""
+
+
+class LedgerError(Exception):
+    """Base class for ledger errors."""
+
+
+class UnbalancedEntryError(LedgerError):
+    """Raised when a journal entry's postings do not sum to zero."""
+
+
+class LedgerReadOnlyError(LedgerError):
+    """Raised when a ledger write is attempted in read-only database mode."""
+
+
+class EntryNotFoundError(LedgerError):
+    """Raised when a journal entry does not exist or is not visible."""
+
+
+class EntryNotSealedError(LedgerError):
+    """Raised when a journal entry is not yet part of a sealed block."""
+
+
+class SigningKeyError(LedgerError):
+    """Raised when the ledger signing or verification key is unavailable."""
+
+
+class InvalidCursorError(ValueError):
+    """Raised when a pagination cursor cannot be decoded."""
+
+
+class InvalidPeriodError(ValueError):
+    """Raised when a report period does not end after it starts."""
+
+
+class ImportFormatError(LedgerError):
+    """Raised when a statement file cannot be parsed."""
+
+
+class AccountNotFoundError(LedgerError):
+    """Raised when an account does not exist or is not the user's."""
+
+
+class ImportJobNotFoundError(LedgerError):
+    """Raised when an import job does not exist or is not the user's."""
+
+
+class ImportConflictError(LedgerError):
+    """Raised when another run of the same import job committed first."""
+
+
+class FxRateNotFoundError(LedgerError):
+    """Raised when no FX rate applies to a currency pair at a point in time."""
+
+
+class ExportUnavailableError(LedgerError):
+    """Raised when an export format needs an optional dependency that is missing."""
+
+
+class EventStreamUnavailableError(Exception):
+    """Raised when the event stream is not running or is at capacity."""
@@ -0,0 +1,307 @@
+"""
+Request and database metrics in the Prometheus text format.
+
+The request middleware records one latency observation per request, keyed
+by method, route template and status, and SQLAlchemy cursor events record
+the duration of every statement. Both are kept as fixed-bucket histograms
+behind a lock, so recording costs a bisect and a few additions whichever
+thread the request or query runs in. The number of queries a request made
+is counted through a context variable the middleware sets, which reaches
+sync endpoints because the threadpool copies the request's context.
+
+Nothing here depends on prometheus_client; ``render`` writes the text
+exposition format directly.
+"""
+import logging
+import threading
+import time
+from bisect import bisect_left
+from collections.abc import Iterable, Sequence
+from contextvars import ContextVar
+from typing import Any
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+# Configure logger
+logger = logging.getLogger(__name__)
+
+# Content type of the text exposition format
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Upper bounds in seconds of the latency buckets
+REQUEST_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1.0)
+
+# Upper bounds of the queries-per-request buckets
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+
+# Statement kinds recorded as a label; anything else counts as "other"
+STATEMENT_KINDS = frozenset(
+    ("SELECT", "INSERT", "UPDATE", "DELETE", "PRAGMA", "BEGIN", "COMMIT", "WITH")
+)
+
+# Connection.info key of the start times of the statements in flight
+QUERY_START_KEY = "metrics_query_start"
+
+
+def format_labels(names: Sequence[str], values: Sequence[Any]) -> str:
+    """Render a label set as {name="value",...}, escaping the values."""
+    if not names:
+        return ""
+    pairs = ",".join(
+        '{}="{}"'.format(
+            name,
+            str(value)
+            .replace("\\", "\\\\")
+            .replace('"', '\\"')
+            .replace("\n", "\\n"),
+        )
+        for name, value in zip(names, values, strict=True)
+    )
+    return "{" + pairs + "}"
+
+
+class Histogram:
+    """Thread-safe histogram with fixed buckets and one series per label set."""
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        buckets: Sequence[float],
+        label_names: Sequence[str] = (),
+    ) -> None:
+        """
+        Create an empty histogram.
+
+        Args:
+            name: Metric name
+            documentation: HELP text
+            buckets: Increasing upper bounds; +Inf is added
+            label_names: Names of the labels each observation carries
+        """
+        self.name = name
+        self.documentation = documentation
+        self.buckets = tuple(buckets)
+        self.label_names = tuple(label_names)
+        # Per label set: counts per bucket (the last one is +Inf) and the sum
+        self._series: dict[tuple[str, ...], tuple[list[int], list[float]]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, *labels: str) -> None:
+        """
+        Record an observation.
+
+        Args:
+            value: The observed value
+            *labels: The label values, in the order of label_names
+        """
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = ([0] * (len(self.buckets) + 1), [0.0])
+                self._series[labels] = series
+            series[0][index] += 1
+            series[1][0] += value
+
+    def clear(self) -> None:
+        """Drop all observations."""
+        with self._lock:
+            self._series.clear()
+
+    def render(self) -> list[str]:
+        """
+        Render the histogram in the text exposition format.
+
+        Returns:
+            The HELP, TYPE and sample lines
+        """
+        with self._lock:
+            series = [
+                (labels, list(counts), total[0])
+                for labels, (counts, total) in sorted(self._series.items())
+            ]
+
+        lines = [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} histogram",
+        ]
+        bucket_names = (*self.label_names, "le")
+        bounds = [repr(float(bound)) for bound in self.buckets] + ["+Inf"]
+        for labels, counts, total in series:
+            cumulative = 0
+            for bound, count in zip(bounds, counts, strict=True):
+                cumulative += count
+                lines.append(
+                    f"{self.name}_bucket"
+                    f"{format_labels(bucket_names, (*labels, bound))} {cumulative}"
+                )
+            label_text = format_labels(self.label_names, labels)
+            lines.append(f"{self.name}_sum{label_text} {total!r}")
+            lines.append(f"{self.name}_count{label_text} {cumulative}")
+        return lines
+
+
+def render_samples(
+    name: str,
+    kind: str,
+    documentation: str,
+    samples: Iterable[tuple[dict[str, Any], float]],
+) -> list[str]:
+    """
+    Render a counter or gauge in the text exposition format.
+
+    Args:
+        name: Metric name
+        kind: "counter" or "gauge"
+        documentation: HELP text
+        samples: Tuples of (labels, value)
+
+    Returns:
+        The HELP, TYPE and sample lines
+    """
+    lines = [f"# HELP {name} {documentation}", f"# TYPE {name} {kind}"]
+    for labels, value in samples:
+        label_text = format_labels(tuple(labels), tuple(labels.values()))
+        lines.append(f"{name}{label_text} {float(value)!r}")
+    return lines
+
+
+class RequestMetrics:
+    """Per-request counters shared with the threads that serve the request."""
+
+    __slots__ = ("queries", "query_seconds")
+
+    def __init__(self) -> None:
+        self.queries = 0
+        self.query_seconds = 0.0
+
+
+# Metrics of the request being served in the current context, if any
+current_request: ContextVar[RequestMetrics | None] = ContextVar(
+    "current_request", default=None
+)
+
+
+class MetricsRegistry:
+    """The request and database histograms of this process."""
+
+    def __init__(self) -> None:
+        """Create the histograms."""
+        self.started = time.time()
+        self.requests = Histogram(
+            "http_request_duration_seconds",
+            "Time to serve a request, by method, route template and status.",
+            REQUEST_BUCKETS,
+            ("method", "route", "status"),
+        )
+        self.request_queries = Histogram(
+            "http_request_db_queries",
+            "Database queries made while serving a request, by route template.",
+            QUERY_COUNT_BUCKETS,
+            ("route",),
+        )
+        self.queries = Histogram(
+            "db_query_duration_seconds",
+            "Time to execute a database statement, by statement kind.",
+            QUERY_BUCKETS,
+            ("statement",),
+        )
+
+    def observe_request(
+        self,
+        method: str,
+        route: str,
+        status_code: int,
+        seconds: float,
+        request: RequestMetrics,
+    ) -> None:
+        """
+        Record a served request.
+
+        Args:
+            method: HTTP method
+            route: Route template (not the raw path, to bound the label set)
+            status_code: Response status code
+            seconds: Time from receiving the request to the end of the response
+            request: The request's counters
+        """
+        self.requests.observe(seconds, method, route, str(status_code))
+        self.request_queries.observe(request.queries, route)
+
+    def observe_query(self, statement: str, seconds: float) -> None:
+        """
+        Record an executed statement.
+
+        Args:
+            statement: The SQL text
+            seconds: Execution time
+        """
+        words = statement.lstrip()[:8].split(None, 1)
+        kind = words[0].upper() if words else ""
+        self.queries.observe(seconds, kind if kind in STATEMENT_KINDS else "other")
+
+        request = current_request.get()
+        if request is not None:
+            request.queries += 1
+            request.query_seconds += seconds
+
+    def clear(self) -> None:
+        """Drop all observations."""
+        self.requests.clear()
+        self.request_queries.clear()
+        self.queries.clear()
+
+    def render(self) -> list[str]:
+        """
+        Render the histograms in the text exposition format.
+
+        Returns:
+            The lines of all histograms
+        """
+        return [
+            *render_samples(
+                "process_start_time_seconds",
+                "gauge",
+                "Start time of the process since the epoch in seconds.",
+                [({}, self.started)],
+            ),
+            *self.requests.render(),
+            *self.request_queries.render(),
+            *self.queries.render(),
+        ]
+
+
+def _before_cursor_execute(
+    conn, cursor, statement, parameters, context, executemany
+) -> None:
+    """Note the start time of a statement."""
+    conn.info.setdefault(QUERY_START_KEY, []).append(time.perf_counter_ns())
+
+
+def _after_cursor_execute(
+    conn, cursor, statement, parameters, context, executemany
+) -> None:
+    """Record the duration of a statement."""
+    starts = conn.info.get(QUERY_START_KEY)
+    if not starts:
+        return
+    elapsed = (time.perf_counter_ns() - starts.pop()) / 1e9
+    metrics.observe_query(statement, elapsed)
+
+
+def instrument_engine(engine: Engine) -> None:
+    """
+    Record the queries an engine executes.
+
+    Args:
+        engine: A sync engine, or the sync_engine of an async engine
+    """
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+
+
+# Create global registry instance for simple imports
+metrics = MetricsRegistry()
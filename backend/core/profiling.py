@@ -0,0 +1,339 @@
+"""
+Per-request SQL query profiler.
+
+When enabled, a sampled fraction of requests is profiled: every statement
+the request executes is counted and timed by SQLAlchemy cursor events and
+grouped by its shape (the SQL with literals and IN-lists collapsed). A
+shape repeated many times within one request is reported as a likely N+1
+query, and statements slower than a threshold are reported with their
+query plan (EXPLAIN QUERY PLAN on SQLite) when plan capture is on.
+
+Unsampled requests cost one context variable lookup per statement, so the
+profiler can run in production with a low sample rate. Reports are logged
+and the most recent flagged profiles are kept for /api/health/profiler.
+"""
+import logging
+import random
+import re
+import threading
+import time
+from collections import deque
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Any
+
+from core.config import settings
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+# Configure logger
+logger = logging.getLogger(__name__)
+
+# Connection.info key of the start times of the profiled statements in flight
+PROFILE_START_KEY = "profiler_query_start"
+
+# Characters of a statement kept in reports
+STATEMENT_PREVIEW = 300
+
+# Literals and expanded IN-lists that vary between executions of one shape
+_PLACEHOLDER = r"(?:\?|%\(\w+\)s|%s|:\w+|\$\d+)"
+_IN_LIST = re.compile(rf"\(\s*{_PLACEHOLDER}(?:\s*,\s*{_PLACEHOLDER})*\s*\)")
+_STRING = re.compile(r"'(?:[^']|'')*'")
+_NUMBER = re.compile(r"\b\d+(?:\.\d+)?\b")
+_SPACE = re.compile(r"\s+")
+
+
+@lru_cache(maxsize=1024)
+def statement_shape(statement: str) -> str:
+    """
+    Reduce a statement to its shape, so repeated executions group together.
+
+    Args:
+        statement: The SQL text
+
+    Returns:
+        The statement with literals and IN-lists replaced and spaces collapsed
+    """
+    shape = _IN_LIST.sub("(?)", statement)
+    shape = _STRING.sub("?", shape)
+    shape = _NUMBER.sub("?", shape)
+    return _SPACE.sub(" ", shape).strip()
+
+
+@dataclass(slots=True)
+class QueryProfile:
+    """The statements executed while serving one request."""
+
+    label: str
+    started: float = field(default_factory=time.time)
+    queries: int = 0
+    seconds: float = 0.0
+    # Per shape: [executions, total seconds]
+    shapes: dict[str, list] = field(default_factory=dict)
+    # Statements over the slow threshold, with their plans
+    slow: list[dict[str, Any]] = field(default_factory=list)
+
+    def add(self, statement: str, seconds: float) -> None:
+        """Count an executed statement."""
+        self.queries += 1
+        self.seconds += seconds
+        totals = self.shapes.get(statement)
+        if totals is None:
+            self.shapes[statement] = [1, seconds]
+        else:
+            totals[0] += 1
+            totals[1] += seconds
+
+    def repeated(self, threshold: int) -> list[dict[str, Any]]:
+        """
+        Find query shapes executed at least threshold times.
+
+        Only reads are considered; repeated writes are usually deliberate
+        chunking (imports, block sealing) rather than a missing join.
+
+        Args:
+            threshold: Executions of one shape that count as an N+1 pattern
+
+        Returns:
+            The repeated shapes, most executed first
+        """
+        grouped: dict[str, list] = {}
+        for statement, (count, seconds) in self.shapes.items():
+            if not statement.lstrip()[:6].upper().startswith(("SELECT", "WITH")):
+                continue
+            totals = grouped.setdefault(statement_shape(statement), [0, 0.0])
+            totals[0] += count
+            totals[1] += seconds
+        return [
+            {
+                "statement": shape[:STATEMENT_PREVIEW],
+                "count": count,
+                "ms": round(seconds * 1000, 2),
+            }
+            for shape, (count, seconds) in sorted(
+                grouped.items(), key=lambda item: -item[1][0]
+            )
+            if count >= threshold
+        ]
+
+    def report(self, threshold: int) -> dict[str, Any]:
+        """
+        Summarize the profile.
+
+        Args:
+            threshold: Executions of one shape that count as an N+1 pattern
+
+        Returns:
+            Dictionary with query count, time, repeated shapes and slow queries
+        """
+        return {
+            "label": self.label,
+            "started": self.started,
+            "queries": self.queries,
+            "ms": round(self.seconds * 1000, 2),
+            "repeated": self.repeated(threshold),
+            "slow": self.slow,
+        }
+
+
+# Profile of the request being served in the current context, if sampled
+current_profile: ContextVar[QueryProfile | None] = ContextVar(
+    "current_profile", default=None
+)
+
+
+class QueryProfiler:
+    """Samples requests, profiles their queries and keeps flagged reports."""
+
+    def __init__(
+        self,
+        sample_rate: float,
+        slow_ms: float,
+        explain: bool,
+        repeat_threshold: int,
+        history: int,
+    ) -> None:
+        """
+        Create a profiler.
+
+        Args:
+            sample_rate: Fraction of requests to profile
+            slow_ms: Milliseconds after which a statement is reported as slow
+            explain: Capture the query plan of slow statements
+            repeat_threshold: Executions of one shape that count as N+1
+            history: Flagged profiles kept for inspection
+        """
+        self.sample_rate = sample_rate
+        self.slow_seconds = slow_ms / 1000
+        self.explain = explain
+        self.repeat_threshold = repeat_threshold
+        self._recent: deque[dict[str, Any]] = deque(maxlen=history)
+        self._lock = threading.Lock()
+        self.profiled = 0
+        self.n_plus_one = 0
+        self.slow_queries = 0
+
+    def sample(self) -> bool:
+        """Decide whether to profile the next request."""
+        return self.sample_rate >= 1 or random.random() < self.sample_rate
+
+    @contextmanager
+    def profile(self, label: str) -> Iterator[QueryProfile]:
+        """
+        Profile the statements executed in this context.
+
+        The profile is recorded when the block exits; its label may be
+        changed inside the block (e.g. once the route is known).
+
+        Args:
+            label: What is being profiled, such as "GET /api/transactions"
+
+        Yields:
+            The profile being filled in
+        """
+        profile = QueryProfile(label)
+        token = current_profile.set(profile)
+        try:
+            yield profile
+        finally:
+            current_profile.reset(token)
+            self.record(profile)
+
+    def record(self, profile: QueryProfile) -> dict[str, Any]:
+        """
+        Count a finished profile and log it if it looks problematic.
+
+        Args:
+            profile: The finished profile
+
+        Returns:
+            The profile's report
+        """
+        report = profile.report(self.repeat_threshold)
+        with self._lock:
+            self.profiled += 1
+            if report["repeated"]:
+                self.n_plus_one += 1
+            self.slow_queries += len(report["slow"])
+            if report["repeated"] or report["slow"]:
+                self._recent.append(report)
+
+        for repeated in report["repeated"]:
+            logger.warning(
+                "Possible N+1 in %s: %d executions (%.1f ms) of %s",
+                profile.label,
+                repeated["count"],
+                repeated["ms"],
+                repeated["statement"],
+            )
+        for slow in report["slow"]:
+            logger.warning(
+                "Slow query in %s (%.1f ms): %s%s",
+                profile.label,
+                slow["ms"],
+                slow["statement"],
+                "".join(f"\n  {line}" for line in slow.get("plan", ())),
+            )
+        return report
+
+    def stats(self) -> dict[str, Any]:
+        """
+        Report profiler settings, counters and recent flagged profiles.
+
+        Returns:
+            Dictionary with profiler statistics
+        """
+        with self._lock:
+            return {
+                "sample_rate": self.sample_rate,
+                "slow_ms": self.slow_seconds * 1000,
+                "explain": self.explain,
+                "repeat_threshold": self.repeat_threshold,
+                "profiled": self.profiled,
+                "n_plus_one": self.n_plus_one,
+                "slow_queries": self.slow_queries,
+                "recent": list(self._recent),
+            }
+
+    def clear(self) -> None:
+        """Forget the recent reports and reset the counters."""
+        with self._lock:
+            self._recent.clear()
+            self.profiled = self.n_plus_one = self.slow_queries = 0
+
+    def _slow_query(
+        self, cursor, statement: str, parameters, seconds: float, explain: bool
+    ) -> dict[str, Any]:
+        """Describe a slow statement, with its plan if requested."""
+        slow: dict[str, Any] = {
+            "statement": statement[:STATEMENT_PREVIEW],
+            "ms": round(seconds * 1000, 2),
+        }
+        if not explain:
+            return slow
+
+        # A second cursor leaves the rows of the profiled statement unread
+        plan_cursor = cursor.connection.cursor()
+        try:
+            plan_cursor.execute(f"EXPLAIN QUERY PLAN {statement}", parameters)
+            slow["plan"] = [str(row[-1]) for row in plan_cursor.fetchall()]
+        except Exception as e:
+            logger.debug(f"Could not explain slow query: {str(e)}")
+        finally:
+            plan_cursor.close()
+        return slow
+
+
+def _before_cursor_execute(
+    conn, cursor, statement, parameters, context, executemany
+) -> None:
+    """Note the start time of a statement in a profiled request."""
+    if current_profile.get() is not None:
+        conn.info.setdefault(PROFILE_START_KEY, []).append(time.perf_counter_ns())
+
+
+def _after_cursor_execute(
+    conn, cursor, statement, parameters, context, executemany
+) -> None:
+    """Add a statement to the profile of the current request."""
+    profile = current_profile.get()
+    starts = conn.info.get(PROFILE_START_KEY)
+    if profile is None or not starts:
+        return
+
+    seconds = (time.perf_counter_ns() - starts.pop()) / 1e9
+    profile.add(statement, seconds)
+    if seconds >= profiler.slow_seconds:
+        explain = (
+            profiler.explain
+            and not executemany
+            and conn.dialect.name == "sqlite"
+            and statement.lstrip()[:6].upper().startswith(("SELECT", "WITH"))
+        )
+        profile.slow.append(
+            profiler._slow_query(cursor, statement, parameters, seconds, explain)
+        )
+
+
+def profile_engine(engine: Engine) -> None:
+    """
+    Feed the statements an engine executes to the profiler.
+
+    Args:
+        engine: A sync engine, or the sync_engine of an async engine
+    """
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+
+
+# Create global profiler instance for simple imports
+profiler = QueryProfiler(
+    sample_rate=settings.PROFILER_SAMPLE_RATE,
+    slow_ms=settings.PROFILER_SLOW_QUERY_MS,
+    explain=settings.PROFILER_EXPLAIN,
+    repeat_threshold=settings.PROFILER_REPEAT_THRESHOLD,
+    history=settings.PROFILER_HISTORY,
+)
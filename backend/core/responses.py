@@ -0,0 +1,153 @@
+"""
+Fast JSON and event stream responses.
+
+List-heavy endpoints build their responses from trusted ledger rows as
+plain dictionaries shaped like their response models. With
+FAST_SERIALIZATION enabled those dictionaries are encoded once with orjson
+and returned as a Response, which skips FastAPI's response_model
+validation and serialization; disabled, they go through the response
+model as usual. Both paths produce the same JSON.
+
+Event streams are mostly idle, so their response keeps as little per
+connection as possible.
+"""
+import asyncio
+from collections.abc import AsyncIterator, Callable
+from typing import Any
+
+import orjson
+from core.config import settings
+from fastapi import Response
+from starlette.types import Receive, Scope, Send
+
+
+class FastJSONResponse(Response):
+    """JSON response encoded with orjson, with UTC datetimes ending in 'Z'."""
+
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        """Encode the content; datetimes match Pydantic's JSON output."""
+        return orjson.dumps(content, option=orjson.OPT_UTC_Z)
+
+
+def trusted_response(
+    content: dict[str, Any],
+    body: bytes | None = None,
+    headers: dict[str, str] | None = None,
+) -> Response | dict[str, Any]:
+    """
+    Return trusted response content through the configured serialization path.
+
+    Args:
+        content: Plain data shaped like the endpoint's response model
+        body: The content already encoded by FastJSONResponse, if cached
+        headers: Headers for the fast path; on the response model path the
+            caller sets them on the injected response
+
+    Returns:
+        An orjson-encoded response when FAST_SERIALIZATION is enabled,
+        otherwise the content for FastAPI to validate against the model
+    """
+    if not settings.FAST_SERIALIZATION:
+        return content
+    if body is not None:
+        return Response(body, headers=headers, media_type="application/json")
+    return FastJSONResponse(content, headers=headers)
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """
+    Check an If-None-Match request header against an entity tag.
+
+    Uses the weak comparison of RFC 9110, as required for If-None-Match.
+
+    Args:
+        if_none_match: The header value, if sent
+        etag: The quoted entity tag of the current representation
+
+    Returns:
+        True if the client's cached copy is current
+    """
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    return any(
+        tag.strip().removeprefix("W/") == etag for tag in if_none_match.split(",")
+    )
+
+
+class EventStreamResponse(Response):
+    """
+    Streaming text/event-stream response for long-lived idle connections.
+
+    Unlike StreamingResponse, which keeps a task group with a disconnect
+    listener per stream, this keeps one small task waiting for the
+    disconnect and tells the body's producer through a callback, so the
+    producer can stop waiting for events.
+    """
+
+    media_type = "text/event-stream"
+
+    def __init__(
+        self,
+        body: AsyncIterator[bytes],
+        on_disconnect: Callable[[], None],
+        on_close: Callable[[], None] | None = None,
+        headers: dict[str, str] | None = None,
+    ) -> None:
+        """
+        Create the response.
+
+        Args:
+            body: Producer of encoded events; it should end soon after
+                on_disconnect is called
+            on_disconnect: Called when the client goes away, and when the
+                response ends for any other reason
+            on_close: Called last when the response ends, however it ends,
+                even if the body was never started (a closed async generator
+                that never started skips its own finally block)
+            headers: Extra response headers
+        """
+        # Like StreamingResponse, skip Response.__init__: no body, no length
+        self.status_code = 200
+        self.background = None
+        self.init_headers(headers)
+        self.body_iterator = body
+        self.on_disconnect = on_disconnect
+        self.on_close = on_close
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """Send the events until the producer ends or the client disconnects."""
+        watcher = None
+        try:
+            # Inside the try: the client may be gone before the first send
+            await send(
+                {
+                    "type": "http.response.start",
+                    "status": self.status_code,
+                    "headers": self.raw_headers,
+                }
+            )
+            watcher = asyncio.ensure_future(self._watch_disconnect(receive))
+            async for chunk in self.body_iterator:
+                await send(
+                    {"type": "http.response.body", "body": chunk, "more_body": True}
+                )
+            await send({"type": "http.response.body", "body": b"", "more_body": False})
+        finally:
+            if watcher is not None:
+                watcher.cancel()
+            self.on_disconnect()
+            try:
+                await self.body_iterator.aclose()
+            finally:
+                if self.on_close is not None:
+                    self.on_close()
+
+    async def _watch_disconnect(self, receive: Receive) -> None:
+        """Wait for the client to disconnect and notify the producer."""
+        while (await receive())["type"] != "http.disconnect":
+            pass
+        self.on_disconnect()
@@ -5,13 +5,19 @@ This module provides functions for user authentication, session management,
 and other security-related operations needed by the application.
 """
 import logging
+import time
 from urllib.parse import unquote
 
 from core.config import settings
-from db.database import get_db
+from core.events import event_bus
+from core.session_cache import session_cache
+from db.database import get_async_db, get_db
 from db.models.user import Session as DbSession
+from db.models.user import User
 from fastapi import Cookie, Depends, HTTPException, Request, status
 from schemas.user import AuthResponse
+from sqlalchemy import Row, Select, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from utils.crypto import sha256_hex
 
@@ -45,24 +51,19 @@ def validate_origin(request: Request) -> None:
             )
 
 
-async def get_current_user(
-    request: Request,
-    auth_session: str | None = Cookie(None, alias="auth-session"),
-    db: Session = Depends(get_db),
-) -> AuthResponse:
+def _session_id_from_cookie(request: Request, auth_session: str | None) -> str:
     """
-    Verify session token and get current user.
+    Run the CSRF check and turn the session cookie into a session ID.
 
     Args:
         request: The FastAPI request
         auth_session: The session cookie
-        db: Database session
 
     Returns:
-        The authenticated user
+        The hashed session ID as stored in the session table
 
     Raises:
-        HTTPException: If the session is invalid or the user doesn't exist
+        HTTPException: If the CSRF check fails or the cookie is missing
     """
     # Validate Origin header for CSRF protection
     validate_origin(request)
@@ -80,29 +81,127 @@ async def get_current_user(
         # Continue with the original token if decoding fails
 
     # Hash the session token to match how @oslojs/crypto/sha2 does it
-    session_id = sha256_hex(auth_session)
+    return sha256_hex(auth_session)
 
-    # Get session from database
-    db_session = db.query(DbSession).filter(DbSession.id == session_id).first()
-    if not db_session:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid session"
-        )
 
-    # Check if session is expired
-    if db_session.is_expired:
+def _session_lookup(session_id: str) -> Select:
+    """
+    Build the query loading a live session and its user in a single round-trip.
+
+    Expired sessions are filtered out by the query itself, so they are
+    rejected like unknown ones without a second check in Python.
+    """
+    return (
+        select(DbSession.expires_at, User.id, User.username)
+        .outerjoin(User, User.id == DbSession.user_id)
+        .where(DbSession.id == session_id, DbSession.expires_at > int(time.time()))
+    )
+
+
+def _authenticate(session_id: str, row: Row | None) -> AuthResponse:
+    """
+    Validate a session lookup result and cache it.
+
+    Args:
+        session_id: The hashed session ID
+        row: The (expires_at, user_id, username) row, if the session exists
+            and has not expired
+
+    Returns:
+        The authenticated user
+
+    Raises:
+        HTTPException: If the session is invalid or expired or the user
+            doesn't exist
+    """
+    if not row:
         raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED, detail="Session expired"
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid or expired session",
         )
 
-    # Get user from database using relationship
-    user = db_session.user
-    if not user:
+    expires_at, user_id, username = row
+
+    if user_id is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED, detail="User not found"
         )
 
-    return AuthResponse(user_id=user.id, username=user.username)
+    session_cache.put(session_id, user_id, username, expires_at)
+
+    return AuthResponse(user_id=user_id, username=username)
+
+
+def get_current_user_sync(
+    request: Request,
+    auth_session: str | None = Cookie(None, alias="auth-session"),
+    db: Session = Depends(get_db),
+) -> AuthResponse:
+    """
+    Verify session token and get current user using the sync engine.
+
+    A plain function, so FastAPI runs the blocking session lookup in its
+    threadpool instead of on the event loop.
+
+    Args:
+        request: The FastAPI request
+        auth_session: The session cookie
+        db: Database session
+
+    Returns:
+        The authenticated user
+
+    Raises:
+        HTTPException: If the session is invalid or the user doesn't exist
+    """
+    session_id = _session_id_from_cookie(request, auth_session)
+
+    # Serve recently validated sessions without touching the database
+    cached = session_cache.get(session_id)
+    if cached is not None:
+        return AuthResponse(user_id=cached.user_id, username=cached.username)
+
+    row = db.execute(_session_lookup(session_id)).first()
+    return _authenticate(session_id, row)
+
+
+async def get_current_user_async(
+    request: Request,
+    auth_session: str | None = Cookie(None, alias="auth-session"),
+    db: AsyncSession = Depends(get_async_db),
+) -> AuthResponse:
+    """
+    Verify session token and get current user using the async engine.
+
+    The session lookup awaits the async driver instead of blocking the
+    event loop on database I/O.
+
+    Args:
+        request: The FastAPI request
+        auth_session: The session cookie
+        db: Async database session
+
+    Returns:
+        The authenticated user
+
+    Raises:
+        HTTPException: If the session is invalid or the user doesn't exist
+    """
+    session_id = _session_id_from_cookie(request, auth_session)
+
+    # Serve recently validated sessions without touching the database
+    cached = session_cache.get(session_id)
+    if cached is not None:
+        return AuthResponse(user_id=cached.user_id, username=cached.username)
+
+    row = (await db.execute(_session_lookup(session_id))).first()
+    return _authenticate(session_id, row)
+
+
+# Dependency used by the routers; the engine mode is chosen in Settings
+get_current_user = (
+    get_current_user_async if settings.DATABASE_ASYNC else get_current_user_sync
+)
 
 
 def invalidate_all_user_sessions(user_id: str, db: Session) -> int:
@@ -110,6 +209,10 @@ def invalidate_all_user_sessions(user_id: str, db: Session) -> int:
     Invalidate all sessions for a user.
     Note: In read-only mode, this is a stub that returns 0.
 
+    Cached sessions for the user are always evicted, so the next request
+    re-validates against the database, and the user's event streams are
+    closed.
+
     Args:
         user_id: The ID of the user
         db: Database session
@@ -117,5 +220,11 @@ def invalidate_all_user_sessions(user_id: str, db: Session) -> int:
     Returns:
         Number of invalidated sessions
     """
+    evicted = session_cache.invalidate_user(user_id)
+    logger.debug(f"Evicted {evicted} cached session(s) for user {user_id}")
+
+    # Open event streams were authorized by the sessions being revoked
+    event_bus.disconnect_user(user_id)
+
     # The frontend handles session management
     return 0
@@ -0,0 +1,189 @@
+"""
+In-process cache for validated sessions.
+
+Every authenticated request validates its session cookie. This module keeps
+recently validated sessions in memory, keyed by the hashed session id, so
+repeated requests from the same browser do not hit the database.
+
+Entries are bounded in number (LRU eviction) and in age (TTL). The TTL bounds
+how long a session deleted by the frontend can still be accepted here; a
+session is never served past its own ``expires_at``.
+"""
+import logging
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any
+
+from core.config import settings
+
+# Configure logger
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True, slots=True)
+class CachedSession:
+    """A validated session as held by the cache."""
+
+    user_id: str
+    username: str
+    # Seconds since epoch, as stored by Drizzle
+    expires_at: int
+    # Monotonic deadline after which the entry must be re-validated
+    cached_until: float
+
+
+class SessionCache:
+    """Thread-safe TTL/LRU cache of validated sessions."""
+
+    def __init__(self, max_size: int, ttl: float) -> None:
+        """
+        Create an empty cache.
+
+        Args:
+            max_size: Maximum number of sessions to hold
+            ttl: Seconds an entry may be served before re-validation
+        """
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries: OrderedDict[str, CachedSession] = OrderedDict()
+        self._by_user: dict[str, set[str]] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, session_id: str) -> CachedSession | None:
+        """
+        Look up a session by its hashed id.
+
+        Args:
+            session_id: The SHA-256 hex digest of the session token
+
+        Returns:
+            The cached session, or None if absent, stale or expired
+        """
+        with self._lock:
+            entry = self._entries.get(session_id)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            if time.monotonic() >= entry.cached_until or (
+                time.time() > entry.expires_at
+            ):
+                self._remove(session_id)
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(session_id)
+            self.hits += 1
+            return entry
+
+    def put(
+        self, session_id: str, user_id: str, username: str, expires_at: int
+    ) -> None:
+        """
+        Store a session that has just been validated against the database.
+
+        Args:
+            session_id: The SHA-256 hex digest of the session token
+            user_id: The ID of the session's user
+            username: The username of the session's user
+            expires_at: Session expiry in seconds since epoch
+        """
+        if self.max_size <= 0:
+            return
+
+        entry = CachedSession(
+            user_id=user_id,
+            username=username,
+            expires_at=expires_at,
+            cached_until=time.monotonic() + self.ttl,
+        )
+        with self._lock:
+            if session_id in self._entries:
+                self._remove(session_id)
+            self._entries[session_id] = entry
+            self._by_user.setdefault(user_id, set()).add(session_id)
+
+            while len(self._entries) > self.max_size:
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+                self.evictions += 1
+
+    def invalidate(self, session_id: str) -> bool:
+        """
+        Drop a single session from the cache.
+
+        Args:
+            session_id: The SHA-256 hex digest of the session token
+
+        Returns:
+            True if an entry was removed
+        """
+        with self._lock:
+            return self._remove(session_id)
+
+    def invalidate_user(self, user_id: str) -> int:
+        """
+        Drop every cached session belonging to a user.
+
+        Args:
+            user_id: The ID of the user
+
+        Returns:
+            Number of cache entries removed
+        """
+        with self._lock:
+            session_ids = list(self._by_user.get(user_id, ()))
+            for session_id in session_ids:
+                self._remove(session_id)
+            return len(session_ids)
+
+    def clear(self) -> None:
+        """Drop all entries and reset the counters."""
+        with self._lock:
+            self._entries.clear()
+            self._by_user.clear()
+            self.hits = self.misses = self.evictions = 0
+
+    def stats(self) -> dict[str, Any]:
+        """
+        Report cache size and hit/miss counters.
+
+        Returns:
+            Dictionary with cache statistics
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "ttl_seconds": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            }
+
+    def _remove(self, session_id: str) -> bool:
+        """Remove an entry and its reverse index. Caller holds the lock."""
+        entry = self._entries.pop(session_id, None)
+        if entry is None:
+            return False
+
+        user_sessions = self._by_user.get(entry.user_id)
+        if user_sessions is not None:
+            user_sessions.discard(session_id)
+            if not user_sessions:
+                del self._by_user[entry.user_id]
+        return True
+
+
+# Create global cache instance for simple imports
+session_cache = SessionCache(
+    max_size=settings.SESSION_CACHE_MAX_SIZE if settings.SESSION_CACHE_ENABLED else 0,
+    ttl=settings.SESSION_CACHE_TTL,
+)
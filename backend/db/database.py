@@ -6,11 +6,21 @@ and provides utilities for working with the database.
 """
 import logging
 import os
-from collections.abc import Generator
+from collections.abc import AsyncGenerator, Generator
+from typing import Any
 
-from core.config import settings
+from core.config import BASE_DIR, settings
+from core.metrics import instrument_engine
+from core.profiling import profile_engine
 from sqlalchemy import create_engine, event
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import (
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
 from sqlalchemy.orm import DeclarativeBase, Session, sessionmaker
+from sqlalchemy.pool import Pool, QueuePool
 
 # Configure logger
 logger = logging.getLogger(__name__)
@@ -28,6 +38,10 @@ def get_database_url() -> str:
 
     Returns:
         The database URL with appropriate options
+
+    Raises:
+        ValueError: If a read-only SQLite database in WAL mode cannot be
+            opened because its directory is not writable
     """
     # Read from environment if provided, use default if not
     db_url = settings.DATABASE_URL
@@ -40,15 +54,25 @@ def get_database_url() -> str:
 
         # Convert relative path to absolute if necessary
         if not os.path.isabs(db_path):
-            parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-            base_dir = os.path.dirname(parent_dir)
-            db_path = os.path.abspath(os.path.join(base_dir, db_path))
+            db_path = os.path.abspath(os.path.join(BASE_DIR, db_path))
 
         # Create directory for database file if it doesn't exist
         os.makedirs(os.path.dirname(db_path), exist_ok=True)
 
         # Create URI format URL with correct mode
         if read_only:
+            # Read-only connections to a WAL database still map the -shm file,
+            # which needs write access to the directory. immutable=1 would
+            # open it but never see the sessions the frontend writes later.
+            if is_sqlite_wal(db_path) and not os.access(
+                os.path.dirname(db_path), os.W_OK
+            ):
+                raise ValueError(
+                    f"WAL database {db_path} is in a read-only directory; make "
+                    f"the directory writable or switch the database out of WAL "
+                    f"mode (PRAGMA journal_mode=DELETE)"
+                )
+
             logger.info(f"Using database in read-only mode: {db_path}")
             return f"sqlite:///file:{db_path}?mode=ro&uri=true"
         else:
@@ -58,6 +82,76 @@ def get_database_url() -> str:
     return db_url
 
 
+def is_sqlite_wal(db_path: str) -> bool:
+    """
+    Check whether a SQLite database file is in WAL journal mode.
+
+    Args:
+        db_path: Path to the database file
+
+    Returns:
+        True if the file header marks the database as WAL
+    """
+    try:
+        with open(db_path, "rb") as db_file:
+            header = db_file.read(20)
+    except OSError:
+        return False
+
+    # Bytes 18 and 19 are the file format write/read versions; 2 means WAL
+    return len(header) == 20 and header[18] == 2 and header[19] == 2
+
+
+def get_pool_options() -> dict[str, Any]:
+    """
+    Get connection pool options for the engines from settings.
+
+    In-memory SQLite databases use a per-thread singleton pool, which does
+    not accept sizing options.
+
+    Returns:
+        Keyword arguments for create_engine/create_async_engine
+    """
+    options: dict[str, Any] = {
+        "pool_pre_ping": settings.DATABASE_POOL_PRE_PING,
+        "pool_recycle": settings.DATABASE_POOL_RECYCLE,
+    }
+    if settings.DATABASE_URL not in ("sqlite://", "sqlite:///:memory:"):
+        options.update(
+            pool_size=settings.DATABASE_POOL_SIZE,
+            max_overflow=settings.DATABASE_MAX_OVERFLOW,
+            pool_timeout=settings.DATABASE_POOL_TIMEOUT,
+        )
+    return options
+
+
+# Async drivers used when DATABASE_ASYNC is enabled, keyed by backend name
+ASYNC_DRIVERS = {
+    "sqlite": "aiosqlite",
+    "postgresql": "asyncpg",
+    "mysql": "aiomysql",
+}
+
+
+def get_async_database_url() -> str:
+    """
+    Get the database URL rewritten for its async driver.
+
+    Returns:
+        The database URL using the async driver for its backend
+
+    Raises:
+        ValueError: If no async driver is known for the backend
+    """
+    url = make_url(get_database_url())
+    backend = url.get_backend_name()
+    if backend not in ASYNC_DRIVERS:
+        raise ValueError(f"No async driver configured for database '{backend}'")
+    return url.set(
+        drivername=f"{backend}+{ASYNC_DRIVERS[backend]}"
+    ).render_as_string(hide_password=False)
+
+
 # Create engine
 engine = create_engine(
     get_database_url(),
@@ -65,18 +159,96 @@ engine = create_engine(
         "check_same_thread": False
     } if settings.DATABASE_URL.startswith("sqlite") else {},
     echo=settings.DATABASE_ECHO,
+    **get_pool_options(),
 )
 
 
 # Set database connection pragmas for SQLite
-@event.listens_for(engine, "connect")
 def set_sqlite_pragma(dbapi_connection, connection_record):
     """Set SQLite pragmas on connection."""
     cursor = dbapi_connection.cursor()
     cursor.execute("PRAGMA foreign_keys = ON;")  # Enable foreign key constraints
+
+    # Read tuning: memory-mapped I/O, a larger page cache and in-memory temp
+    # tables for sorts and groupings
+    cursor.execute(f"PRAGMA mmap_size = {settings.SQLITE_MMAP_SIZE};")
+    cursor.execute(f"PRAGMA cache_size = {settings.SQLITE_CACHE_SIZE};")
+    if settings.SQLITE_TEMP_STORE_MEMORY:
+        cursor.execute("PRAGMA temp_store = MEMORY;")
+
+    # Refuse writes at the connection level as well as through the URI
+    if settings.DATABASE_READ_ONLY:
+        cursor.execute("PRAGMA query_only = ON;")
     cursor.close()
 
 
+if settings.DATABASE_URL.startswith("sqlite"):
+    event.listen(engine, "connect", set_sqlite_pragma)
+
+if settings.METRICS_ENABLED:
+    instrument_engine(engine)
+
+if settings.PROFILER_ENABLED:
+    profile_engine(engine)
+
+
+# Create async engine only when enabled, so the async driver stays optional
+async_engine = (
+    create_async_engine(
+        get_async_database_url(),
+        echo=settings.DATABASE_ECHO,
+        **get_pool_options(),
+    )
+    if settings.DATABASE_ASYNC
+    else None
+)
+
+if async_engine is not None and settings.DATABASE_URL.startswith("sqlite"):
+    event.listen(async_engine.sync_engine, "connect", set_sqlite_pragma)
+
+if async_engine is not None and settings.METRICS_ENABLED:
+    instrument_engine(async_engine.sync_engine)
+
+if async_engine is not None and settings.PROFILER_ENABLED:
+    profile_engine(async_engine.sync_engine)
+
+
+def describe_pool(pool: Pool) -> dict[str, Any]:
+    """
+    Describe the state of a connection pool.
+
+    Args:
+        pool: The engine's connection pool
+
+    Returns:
+        Dictionary with pool class and, for queue pools, usage counters
+    """
+    stats: dict[str, Any] = {"class": type(pool).__name__}
+    if isinstance(pool, QueuePool):
+        stats.update(
+            size=pool.size(),
+            checked_in=pool.checkedin(),
+            checked_out=pool.checkedout(),
+            overflow=pool.overflow(),
+            max_overflow=settings.DATABASE_MAX_OVERFLOW,
+            timeout=pool.timeout(),
+        )
+    return stats
+
+
+def pool_stats() -> dict[str, Any]:
+    """
+    Report usage of the sync and (if enabled) async connection pools.
+
+    Returns:
+        Dictionary of pool descriptions keyed by engine mode
+    """
+    stats = {"sync": describe_pool(engine.pool)}
+    if async_engine is not None:
+        stats["async"] = describe_pool(async_engine.pool)
+    return stats
+
+
 # Create session factory
 SessionLocal = sessionmaker(
     autocommit=False,
@@ -103,3 +275,37 @@ def get_db() -> Generator[Session]:
         yield db
     finally:
         db.close()
+
+
+# Create async session factory
+AsyncSessionLocal = (
+    async_sessionmaker(
+        bind=async_engine,
+        autoflush=False,
+        expire_on_commit=False,
+    )
+    if async_engine is not None
+    else None
+)
+
+
+# Dependency for getting an async DB session
+async def get_async_db() -> AsyncGenerator[AsyncSession]:
+    """
+    Provide an async database session.
+
+    Yields:
+        An async database session
+
+    Raises:
+        RuntimeError: If DATABASE_ASYNC is disabled
+
+    Notes:
+        This function is used as a FastAPI dependency.
+        The session is automatically closed after use.
+    """
+    if AsyncSessionLocal is None:
+        raise RuntimeError("Async database mode is disabled (DATABASE_ASYNC)")
+
+    async with AsyncSessionLocal() as db:
+        yield db
@@ -1 +1,33 @@
 # Import models to make them available from the models package
+from db.models.fx import FxRate
+from db.models.imports import ImportJob
+from db.models.ledger import (
+    Account,
+    AccountType,
+    BalanceCheckpoint,
+    ChainCheckpoint,
+    ChainHead,
+    CheckpointGranularity,
+    JournalEntry,
+    LedgerBlock,
+    Posting,
+)
+from db.models.user import Session, User
+from db.models.verification import EntryVerification
+
+__all__ = [
+    "Account",
+    "AccountType",
+    "BalanceCheckpoint",
+    "ChainCheckpoint",
+    "ChainHead",
+    "CheckpointGranularity",
+    "EntryVerification",
+    "FxRate",
+    "ImportJob",
+    "JournalEntry",
+    "LedgerBlock",
+    "Posting",
+    "Session",
+    "User",
+]
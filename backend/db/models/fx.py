@@ -0,0 +1,26 @@
+"""
+Foreign exchange rate models.
+
+Rates are kept locally so conversions never wait on an external service. A
+rate applies from its effective time until the next rate of the same
+currency pair takes over.
+"""
+from db.database import Base
+from sqlalchemy import Float, Integer, String, UniqueConstraint
+from sqlalchemy.orm import Mapped, mapped_column
+
+
+class FxRate(Base):
+    """Units of the quote currency per unit of the base currency."""
+    __tablename__ = "fx_rate"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    # ISO 4217 codes
+    base: Mapped[str] = mapped_column(String(3), nullable=False)
+    quote: Mapped[str] = mapped_column(String(3), nullable=False)
+    # Seconds since epoch from which the rate applies
+    effective_at: Mapped[int] = mapped_column(Integer, nullable=False)
+    rate: Mapped[float] = mapped_column(Float, nullable=False)
+    created_at: Mapped[int] = mapped_column(Integer, nullable=False)
+
+    __table_args__ = (UniqueConstraint("base", "quote", "effective_at"),)
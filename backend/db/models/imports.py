@@ -0,0 +1,35 @@
+"""
+Statement import models.
+
+Tracks bulk imports of bank statements so an interrupted import can be
+resumed from the last committed chunk and a completed one is not applied
+twice.
+"""
+from db.database import Base
+from sqlalchemy import ForeignKey, Integer, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+
+class ImportJob(Base):
+    """Progress of importing one statement file into one account."""
+    __tablename__ = "ledger_import_job"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    user_id: Mapped[str] = mapped_column(
+        String, ForeignKey("user.id"), nullable=False, index=True
+    )
+    account_id: Mapped[int] = mapped_column(
+        Integer, ForeignKey("ledger_account.id"), nullable=False
+    )
+    filename: Mapped[str] = mapped_column(String, nullable=False)
+    # SHA-256 of the file, which identifies the import when resuming
+    file_sha256: Mapped[str] = mapped_column(String(64), nullable=False, index=True)
+    format: Mapped[str] = mapped_column(String(8), nullable=False)
+    # One of ImportStatus
+    status: Mapped[str] = mapped_column(String(16), nullable=False)
+    # Statement rows consumed by committed chunks; a resume skips these
+    rows_committed: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    entries_created: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    error: Mapped[str | None] = mapped_column(String, nullable=True)
+    created_at: Mapped[int] = mapped_column(Integer, nullable=False)
+    updated_at: Mapped[int] = mapped_column(Integer, nullable=False)
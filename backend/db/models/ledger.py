@@ -0,0 +1,170 @@
+"""
+Double-entry ledger models.
+
+Money is stored as signed integers in minor units (cents) of the account's
+currency: debits are positive and credits negative, so the postings of every
+journal entry sum to zero in each currency. Timestamps are stored as seconds
+since epoch, like the session table, which keeps range scans on the
+composite indexes integer-only.
+"""
+from enum import StrEnum
+
+from db.database import Base
+from sqlalchemy import ForeignKey, Index, Integer, String, UniqueConstraint
+from sqlalchemy.orm import Mapped, mapped_column, relationship
+from utils.money import DEFAULT_CURRENCY
+
+
+class AccountType(StrEnum):
+    """Account classes of the chart of accounts."""
+
+    ASSET = "asset"
+    LIABILITY = "liability"
+    EQUITY = "equity"
+    INCOME = "income"
+    EXPENSE = "expense"
+
+
+class Account(Base):
+    """An account in a user's chart of accounts."""
+    __tablename__ = "ledger_account"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    user_id: Mapped[str] = mapped_column(
+        String, ForeignKey("user.id"), nullable=False, index=True
+    )
+    name: Mapped[str] = mapped_column(String, nullable=False)
+    type: Mapped[str] = mapped_column(String(16), nullable=False)
+    # ISO 4217 code; every posting to the account is in this currency
+    currency: Mapped[str] = mapped_column(
+        String(3), nullable=False, default=DEFAULT_CURRENCY
+    )
+    created_at: Mapped[int] = mapped_column(Integer, nullable=False)
+
+    __table_args__ = (UniqueConstraint("user_id", "name"),)
+
+
+class JournalEntry(Base):
+    """A balanced journal entry grouping two or more postings."""
+    __tablename__ = "ledger_entry"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    posted_at: Mapped[int] = mapped_column(Integer, nullable=False, index=True)
+    category: Mapped[str] = mapped_column(String, nullable=False)
+    description: Mapped[str] = mapped_column(String, nullable=False)
+    created_at: Mapped[int] = mapped_column(Integer, nullable=False)
+    # Hash chain: each entry commits to its content and its predecessor
+    prev_hash: Mapped[str] = mapped_column(String(64), nullable=False)
+    entry_hash: Mapped[str] = mapped_column(String(64), nullable=False)
+    # Ed25519 signature of the entry hash and the ID of the signing key
+    signature: Mapped[str] = mapped_column(String(128), nullable=False)
+    signing_key_id: Mapped[str] = mapped_column(String(16), nullable=False)
+
+    # Relationships
+    postings: Mapped[list["Posting"]] = relationship(back_populates="entry")
+
+
+class Posting(Base):
+    """A single debit or credit of an account within a journal entry."""
+    __tablename__ = "ledger_posting"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    entry_id: Mapped[int] = mapped_column(
+        Integer, ForeignKey("ledger_entry.id"), nullable=False, index=True
+    )
+    account_id: Mapped[int] = mapped_column(
+        Integer, ForeignKey("ledger_account.id"), nullable=False
+    )
+    amount_minor: Mapped[int] = mapped_column(Integer, nullable=False)
+    # Copied from the account, so result sets can be converted without a join
+    currency: Mapped[str] = mapped_column(String(3), nullable=False)
+    # Copied from the entry so per-account range scans never join
+    posted_at: Mapped[int] = mapped_column(Integer, nullable=False)
+
+    # Relationship to entry
+    entry: Mapped[JournalEntry] = relationship(back_populates="postings")
+
+    # Balance and recent-activity reads are range scans on this index. SQLite
+    # appends the integer primary key to every index, so it also orders ties
+    # on (posted_at, id) without a separate sort.
+    __table_args__ = (
+        Index("ix_ledger_posting_account_posted_at", "account_id", "posted_at"),
+    )
+
+
+class CheckpointGranularity(StrEnum):
+    """Period lengths for which balance checkpoints are kept."""
+
+    DAY = "day"
+    MONTH = "month"
+
+
+class BalanceCheckpoint(Base):
+    """
+    Materialized balance of an account for one day or month.
+
+    ``delta_minor`` is the sum of the account's postings within the period
+    and ``closing_minor`` the account balance at the end of it, so a balance
+    read is one checkpoint plus the postings since its period ended.
+    """
+    __tablename__ = "ledger_balance_checkpoint"
+
+    account_id: Mapped[int] = mapped_column(
+        Integer, ForeignKey("ledger_account.id"), primary_key=True
+    )
+    granularity: Mapped[str] = mapped_column(String(8), primary_key=True)
+    # Start of the period in seconds since epoch (UTC)
+    period_start: Mapped[int] = mapped_column(Integer, primary_key=True)
+    delta_minor: Mapped[int] = mapped_column(Integer, nullable=False)
+    closing_minor: Mapped[int] = mapped_column(Integer, nullable=False)
+
+
+class ChainHead(Base):
+    """
+    Single-row pointer to the last entry of the hash chain.
+
+    Writers update this row before reading it, which serializes appends so
+    two transactions can never extend the chain from the same predecessor.
+    """
+    __tablename__ = "ledger_chain_head"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    entry_id: Mapped[int] = mapped_column(Integer, nullable=False)
+    entry_hash: Mapped[str] = mapped_column(String(64), nullable=False)
+    updated_at: Mapped[int] = mapped_column(Integer, nullable=False)
+
+
+class ChainCheckpoint(Base):
+    """
+    Hash of the chain at a segment boundary.
+
+    Recorded every LEDGER_CHAIN_CHECKPOINT_INTERVAL entries so the chain can
+    be verified as independent segments in parallel.
+    """
+    __tablename__ = "ledger_chain_checkpoint"
+
+    entry_id: Mapped[int] = mapped_column(
+        Integer, ForeignKey("ledger_entry.id"), primary_key=True
+    )
+    entry_hash: Mapped[str] = mapped_column(String(64), nullable=False)
+    created_at: Mapped[int] = mapped_column(Integer, nullable=False)
+
+
+class LedgerBlock(Base):
+    """
+    A sealed run of consecutive journal entries with a Merkle root.
+
+    The root commits to the hashes of entries ``first_entry_id`` through
+    ``last_entry_id``, so a single entry can be proven part of the block
+    with a path of O(log n) sibling hashes.
+    """
+    __tablename__ = "ledger_block"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    first_entry_id: Mapped[int] = mapped_column(Integer, nullable=False)
+    last_entry_id: Mapped[int] = mapped_column(
+        Integer, ForeignKey("ledger_entry.id"), nullable=False, unique=True
+    )
+    entry_count: Mapped[int] = mapped_column(Integer, nullable=False)
+    merkle_root: Mapped[str] = mapped_column(String(64), nullable=False)
+    created_at: Mapped[int] = mapped_column(Integer, nullable=False)
@@ -4,10 +4,8 @@ User and session models for authentication.
 These models match the schema used by the frontend Lucia auth system,
 providing a compatible data layer for authentication services.
 """
-from datetime import datetime, timedelta
-
 from db.database import Base
-from sqlalchemy import ForeignKey, Integer, String
+from sqlalchemy import ForeignKey, Index, Integer, String
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 
@@ -29,8 +27,17 @@ class User(Base):
 
 
 class Session(Base):
-    """Session model matching the schema used by Lucia auth."""
+    """
+    Session model matching the schema used by Lucia auth.
+
+    Expiry is checked in SQL (see core.security and services.session_sweeper)
+    against ``expires_at``, which is indexed for the expired-session sweep.
+    """
     __tablename__ = "session"
+    __table_args__ = (
+        # Declared in the Drizzle schema as well
+        Index("session_expires_at_idx", "expires_at"),
+    )
 
     id: Mapped[str] = mapped_column(String, primary_key=True, index=True)
     user_id: Mapped[str] = mapped_column(String, ForeignKey("user.id"), nullable=False)
@@ -39,26 +46,3 @@ class Session(Base):
 
     # Relationship to user
     user: Mapped[User] = relationship("User", back_populates="sessions")
-
-    @property
-    def expires_at_datetime(self) -> datetime:
-        """Convert timestamp to datetime object."""
-        # The SQLite timestamp is stored as seconds since epoch by Drizzle ORM
-        try:
-            return datetime.fromtimestamp(self.expires_at)  # Already in seconds
-        except (ValueError, TypeError) as e:
-            # If the conversion fails, log the error and return a far future date
-            # to prevent sessions from being marked as expired incorrectly
-            print(f"Error converting timestamp {self.expires_at}: {e}")
-            return datetime.now() + timedelta(days=30)
-
-    @property
-    def is_expired(self) -> bool:
-        """Check if session is expired."""
-        try:
-            now = datetime.now()
-            return now > self.expires_at_datetime
-        except Exception as e:
-            # If there's any error in comparison, log it and consider the session valid
-            print(f"Error checking session expiration: {e}")
-            return False
@@ -0,0 +1,28 @@
+"""
+Verification models.
+
+Stores the reconciled outcome of verifying each journal entry with the two
+independent models, together with both models' verdicts.
+"""
+from db.database import Base
+from sqlalchemy import Boolean, ForeignKey, Integer, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+
+class EntryVerification(Base):
+    """Reconciled dual-model verdict for one journal entry."""
+    __tablename__ = "ledger_verification"
+
+    entry_id: Mapped[int] = mapped_column(
+        Integer, ForeignKey("ledger_entry.id"), primary_key=True
+    )
+    # One of VerificationStatus
+    status: Mapped[str] = mapped_column(String(16), nullable=False, index=True)
+    primary_model: Mapped[str] = mapped_column(String, nullable=False)
+    primary_valid: Mapped[bool] = mapped_column(Boolean, nullable=False)
+    primary_reason: Mapped[str] = mapped_column(String, nullable=False)
+    secondary_model: Mapped[str] = mapped_column(String, nullable=False)
+    secondary_valid: Mapped[bool] = mapped_column(Boolean, nullable=False)
+    secondary_reason: Mapped[str] = mapped_column(String, nullable=False)
+    prompt_version: Mapped[str] = mapped_column(String(32), nullable=False)
+    verified_at: Mapped[int] = mapped_column(Integer, nullable=False)
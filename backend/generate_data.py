@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Script to fill a scratch database with synthetic ledger data.
+
+Generates users, sessions and realistic household journal entries for
+scale testing and writes them in bulk to the configured DATABASE_URL
+(SQLite or Postgres), reporting rows per second. The output depends only
+on the arguments: the same seed, user count and date range give the same
+entries and hashes. The database must not hold users or entries yet and
+DATABASE_READ_ONLY must be false; the ledger signing key is generated if
+it does not exist. Check the result with verify_ledger.py.
+"""
+
+import argparse
+import logging
+import os
+import sys
+from datetime import UTC, date, datetime, timedelta
+
+# Add the parent directory to sys.path before imports
+parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, parent_dir)
+
+# Application modules are imported where they are used, so --help and usage
+# errors do not pay for SQLAlchemy and the models
+
+# Setup logging
+logging.basicConfig(
+    level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s"
+)
+logger = logging.getLogger(__name__)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate synthetic ledger data")
+    parser.add_argument("--users", type=int, default=1_000, help="Users to create")
+    parser.add_argument("--days", type=int, default=365, help="Days of history")
+    parser.add_argument(
+        "--end",
+        type=date.fromisoformat,
+        default=datetime.now(UTC).date(),
+        help="Day after the last generated day (YYYY-MM-DD, default today)",
+    )
+    parser.add_argument("--seed", type=int, default=0, help="Random seed")
+    parser.add_argument(
+        "--purchases", type=float, default=1.5, help="Purchases per user per day"
+    )
+    parser.add_argument("--sessions", type=int, default=1, help="Sessions per user")
+    parser.add_argument(
+        "--batch-size", type=int, default=50_000, help="Entries per transaction"
+    )
+    parser.add_argument(
+        "--workers", type=int, default=os.cpu_count() or 1, help="Signing processes"
+    )
+    parser.add_argument(
+        "--tokens", help="Write 'user_id token' lines for the sessions to this file"
+    )
+    args = parser.parse_args()
+
+    from core.config import settings
+    from core.exceptions import LedgerError
+    from db.database import engine
+    from services.synthetic import SyntheticOptions, generate_ledger
+    from utils.crypto import generate_signing_key
+
+    first_day = args.end - timedelta(days=args.days)
+    options = SyntheticOptions(
+        users=args.users,
+        start=int(datetime(*first_day.timetuple()[:3], tzinfo=UTC).timestamp()),
+        days=args.days,
+        seed=args.seed,
+        sessions_per_user=args.sessions,
+        purchases_per_day=args.purchases,
+        batch_size=args.batch_size,
+        workers=args.workers,
+    )
+
+    if not os.path.exists(settings.LEDGER_SIGNING_KEY_PATH):
+        generate_signing_key(settings.LEDGER_SIGNING_KEY_PATH)
+        logger.info(f"Generated ledger signing key {settings.LEDGER_SIGNING_KEY_PATH}")
+
+    tokens = open(args.tokens, "w") if args.tokens else None
+    try:
+        report = generate_ledger(
+            engine,
+            options,
+            on_token=(lambda user_id, token: tokens.write(f"{user_id} {token}\n"))
+            if tokens
+            else None,
+        )
+    except LedgerError as e:
+        logger.error(str(e))
+        sys.exit(1)
+    finally:
+        if tokens:
+            tokens.close()
+
+    logger.info(
+        f"Generated {report.users} users, {report.sessions} sessions, "
+        f"{report.entries} entries, {report.postings} postings, "
+        f"{report.checkpoints} checkpoints and {report.blocks} blocks "
+        f"in {report.elapsed:.1f}s ({report.rows_per_second:.0f} rows/s)"
+    )
+    logger.info(f"Chain head: {report.last_hash}")
@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+"""
+Script to import FX rates into the local rate table.
+
+Reads a CSV file with a date,base,quote,rate header, where rate is units of
+the quote currency per unit of the base currency from that date on, and
+stores the rates in one transaction. A rate already stored for the same
+pair and date is replaced. Running servers pick the rates up within
+FX_RATES_TTL seconds. Requires DATABASE_READ_ONLY=false.
+"""
+
+import argparse
+import logging
+import os
+import sys
+
+# Add the parent directory to sys.path before imports
+parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, parent_dir)
+
+# Application modules are imported where they are used, so --help and usage
+# errors do not pay for SQLAlchemy and NumPy
+
+# Setup logging
+logging.basicConfig(
+    level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s"
+)
+logger = logging.getLogger(__name__)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Import FX rates")
+    parser.add_argument("path", help="CSV file of date,base,quote,rate rows")
+    args = parser.parse_args()
+
+    from core.exceptions import LedgerError
+    from db.database import SessionLocal
+    from services.fx import add_rates, parse_rates_csv
+
+    try:
+        with SessionLocal() as db:
+            written = add_rates(db, parse_rates_csv(args.path))
+            db.commit()
+    except LedgerError as e:
+        logger.error(str(e))
+        sys.exit(1)
+
+    logger.info(f"Imported {written} FX rates from {args.path}")
@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+Script to import bank statements into the ledger.
+
+Streams a CSV or OFX statement into one account of a user in chunked
+transactions and reports rows per second. Running it again on the same
+file resumes an interrupted import; --resume continues a failed job after
+the file was fixed. Requires DATABASE_READ_ONLY=false.
+"""
+
+import argparse
+import logging
+import os
+import sys
+
+# Add the parent directory to sys.path before imports
+parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, parent_dir)
+
+# Application modules are imported where they are used, so --help and usage
+# errors do not pay for SQLAlchemy and the models
+
+# Setup logging
+logging.basicConfig(
+    level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s"
+)
+logger = logging.getLogger(__name__)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Import a bank statement")
+    parser.add_argument("path", help="CSV or OFX statement file")
+    parser.add_argument("--user", required=True, help="ID of the owning user")
+    parser.add_argument("--account", type=int, required=True, help="Account ID")
+    parser.add_argument("--format", choices=["csv", "ofx"], help="Statement format")
+    parser.add_argument("--chunk-size", type=int, help="Rows per transaction")
+    parser.add_argument("--resume", type=int, help="Import job to resume")
+    args = parser.parse_args()
+
+    from core.exceptions import LedgerError
+    from db.database import SessionLocal
+    from services.importer import import_statement
+
+    try:
+        with SessionLocal() as db:
+            job = import_statement(
+                db,
+                args.user,
+                args.account,
+                args.path,
+                statement_format=args.format,
+                chunk_size=args.chunk_size,
+                resume_job_id=args.resume,
+            )
+    except LedgerError as e:
+        logger.error(str(e))
+        sys.exit(1)
+
+    logger.info(
+        f"Job {job.id} {job.status}: {job.rows_committed} rows, "
+        f"{job.entries_created} entries ({job.rows_per_second or 0:.0f} rows/s)"
+    )
+    if job.error:
+        logger.error(job.error)
+    sys.exit(0 if job.status == "completed" else 1)
@@ -2,22 +2,31 @@
 """
 Script to test SQLAlchemy database connection.
 
-This script does NOT create any tables as the frontend (SvelteKit with Drizzle ORM)
-is responsible for managing the database schema.
+This script does NOT create the auth tables as the frontend (SvelteKit with
+Drizzle ORM) is responsible for managing their schema. With --create-ledger it
+creates the ledger tables, which are owned by the backend, adds the indexes the
+backend relies on to the auth tables (Drizzle declares them too; this covers
+databases pushed before it did) and generates the ledger signing key if it
+does not exist yet.
 """
 
+import argparse
 import logging
 import os
 import sys
 
-from sqlalchemy import text
-
 # Add the parent directory to sys.path before imports
 parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 sys.path.insert(0, parent_dir)
 
-# This import must come after modifying sys.path
-from db.database import engine  # noqa: E402
+# Application modules are imported where they are used, so --help and usage
+# errors do not pay for SQLAlchemy and the models
+
+# Tables managed by the frontend through Drizzle
+FRONTEND_TABLES = {"user", "session"}
+
+# Indexes on the frontend tables that backend queries depend on
+FRONTEND_INDEXES = {"session_expires_at_idx"}
 
 # Setup logging
 logging.basicConfig(
@@ -28,6 +37,10 @@ logger = logging.getLogger(__name__)
 
 def test_db_connection():
     """Test the database connection without creating tables"""
+    from core.config import settings
+    from db.database import engine
+    from sqlalchemy import text
+
     try:
         # Check database connection
         with engine.connect() as conn:
@@ -41,10 +54,13 @@ def test_db_connection():
             logger.info(f"Existing tables: {[table[0] for table in tables]}")
 
             # Verify read-only mode
-            logger.warning("IMPORTANT: Backend is using database in READ-ONLY mode.")
-            logger.warning(
-                "DO NOT attempt to modify the database from the Python backend."
-            )
+            if settings.DATABASE_READ_ONLY:
+                logger.warning(
+                    "IMPORTANT: Backend is using database in READ-ONLY mode."
+                )
+                logger.warning(
+                    "DO NOT attempt to modify the database from the Python backend."
+                )
             logger.warning(
                 "All authentication and session management is handled by the "
                 "SvelteKit frontend."
@@ -56,5 +72,55 @@ def test_db_connection():
         return False
 
 
+def create_ledger_tables():
+    """Create the backend-owned ledger tables and indexes if missing"""
+    import db.models  # noqa: F401
+    from core.config import settings
+    from db.database import Base, engine
+    from sqlalchemy import inspect
+    from utils.crypto import generate_signing_key, key_id
+
+    if settings.DATABASE_READ_ONLY:
+        logger.error("Creating ledger tables requires DATABASE_READ_ONLY=false")
+        return False
+
+    tables = [
+        table
+        for table in Base.metadata.sorted_tables
+        if table.name not in FRONTEND_TABLES
+    ]
+    Base.metadata.create_all(engine, tables=tables)
+    logger.info(f"Ledger tables ready: {[table.name for table in tables]}")
+
+    existing = set(inspect(engine).get_table_names())
+    indexes = [
+        index
+        for table in Base.metadata.sorted_tables
+        if table.name in FRONTEND_TABLES & existing
+        for index in table.indexes
+        if index.name in FRONTEND_INDEXES
+    ]
+    for index in indexes:
+        index.create(engine, checkfirst=True)
+    logger.info(f"Auth table indexes ready: {[index.name for index in indexes]}")
+
+    key_path = settings.LEDGER_SIGNING_KEY_PATH
+    if not os.path.exists(key_path):
+        key = generate_signing_key(key_path)
+        logger.info(
+            f"Generated ledger signing key {key_id(key.public_key())} at {key_path}"
+        )
+    return True
+
+
 if __name__ == "__main__":
-    test_db_connection()
+    parser = argparse.ArgumentParser(description="Check the database connection")
+    parser.add_argument(
+        "--create-ledger",
+        action="store_true",
+        help="Create the ledger tables (requires DATABASE_READ_ONLY=false)",
+    )
+    args = parser.parse_args()
+
+    if test_db_connection() and args.create_ledger:
+        sys.exit(0 if create_ledger_tables() else 1)
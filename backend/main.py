@@ -4,22 +4,33 @@ Main application entry point.
 This module initializes the FastAPI application, sets up middleware,
 configures CORS, and registers all API routes.
 """
+import asyncio
 import logging
 import os
-import time
 from contextlib import asynccontextmanager
 
-import uvicorn
-
 # Import routers
-from api import dashboard, health
+from api import (
+    dashboard,
+    events,
+    export,
+    health,
+    imports,
+    ledger,
+    reports,
+    transactions,
+)
 
 # Import configuration
 from core.config import settings
-from fastapi import FastAPI, Request, status
+from core.events import event_bus
+from core.middleware import QueryProfilerMiddleware, RequestMetricsMiddleware
+from db.database import engine
+from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
-from starlette.middleware.base import BaseHTTPMiddleware
+from services.session_sweeper import SessionSweeper
+from services.warmup import warm_up_async
+from utils.process import format_memory, memory_usage, process_age
 
 # Configure logging
 logging.basicConfig(
@@ -41,50 +52,52 @@ async def lifespan(app: FastAPI):
     # Startup: Run before the application starts accepting requests
     logger.info("Starting application...")
 
-    # This line separates startup from shutdown logic
-    yield
-
-    # Shutdown: Run when the application is shutting down
-    logger.info("Shutting down application...")
-
-
-# Custom middleware for request logging and timing
-class LoggingMiddleware(BaseHTTPMiddleware):
-    """Middleware for logging requests and measuring response time."""
-
-    async def dispatch(self, request: Request, call_next):
-        """Process the request and log details."""
-        start_time = time.time()
-        request_id = request.headers.get("X-Request-ID", "unknown")
-
-        # Log the incoming request
-        logger.debug(
-            f"Request: {request_id} - {request.method} {request.url.path}"
+    event_bus.start(asyncio.get_running_loop())
+
+    app.state.verification = None
+    # Under serve.py only one of the forked workers verifies
+    if settings.VERIFICATION_ENABLED and getattr(
+        app.state, "verification_worker", True
+    ):
+        if settings.DATABASE_READ_ONLY:
+            logger.warning("Verification needs DATABASE_READ_ONLY=false; disabled")
+        else:
+            # Imported here so disabled verification does not load httpx
+            from services.verification import build_pipeline
+
+            app.state.verification = build_pipeline()
+            await app.state.verification.start()
+
+    if settings.WARMUP_ENABLED:
+        # Workers forked by serve.py inherit the caches warmed before the fork
+        report = await warm_up_async(
+            queries=not getattr(app.state, "preloaded", False)
         )
+        logger.info(f"Warm-up: {report}")
 
-        try:
-            # Process the request
-            response = await call_next(request)
-
-            # Calculate and add processing time to the response headers
-            process_time = time.time() - start_time
-            response.headers["X-Process-Time"] = f"{process_time:.4f}"
+    # Started after the warm-up, which it would otherwise compete with
+    app.state.session_sweeper = None
+    if settings.SESSION_SWEEP_ENABLED and not settings.DATABASE_READ_ONLY:
+        app.state.session_sweeper = SessionSweeper(
+            engine, settings.SESSION_SWEEP_INTERVAL, settings.SESSION_SWEEP_BATCH_SIZE
+        )
+        await app.state.session_sweeper.start()
 
-            # Log the response
-            logger.debug(
-                f"Response: {request_id} - {response.status_code} - {process_time:.4f}s"
-            )
+    logger.info(
+        f"Process {os.getpid()} ready in {process_age():.2f}s "
+        f"({format_memory(memory_usage())})"
+    )
 
-            return response
-        except Exception as e:
-            # Log exceptions
-            logger.exception(f"Error processing request {request_id}: {str(e)}")
+    # This line separates startup from shutdown logic
+    yield
 
-            # Return a JSON error response
-            return JSONResponse(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                content={"detail": "Internal server error"},
-            )
+    # Shutdown: Run when the application is shutting down
+    logger.info("Shutting down application...")
+    event_bus.close()
+    if app.state.verification is not None:
+        await app.state.verification.stop()
+    if app.state.session_sweeper is not None:
+        await app.state.session_sweeper.stop()
 
 
 # Create FastAPI app
@@ -96,7 +109,9 @@ app = FastAPI(
 )
 
 # Add custom middleware
-app.add_middleware(LoggingMiddleware)
+if settings.PROFILER_ENABLED:
+    app.add_middleware(QueryProfilerMiddleware)
+app.add_middleware(RequestMetricsMiddleware)
 
 # Configure CORS
 app.add_middleware(
@@ -111,6 +126,19 @@ app.add_middleware(
 # Include routers with version prefix
 app.include_router(health.router, prefix=settings.API_V1_PREFIX)
 app.include_router(dashboard.router, prefix=settings.API_V1_PREFIX)
+app.include_router(ledger.router, prefix=settings.API_V1_PREFIX)
+app.include_router(transactions.router, prefix=settings.API_V1_PREFIX)
+app.include_router(imports.router, prefix=settings.API_V1_PREFIX)
+app.include_router(export.router, prefix=settings.API_V1_PREFIX)
+app.include_router(reports.router, prefix=settings.API_V1_PREFIX)
+app.include_router(events.router, prefix=settings.API_V1_PREFIX)
+
+# Serve metrics at the path Prometheus scrapes by default; the module is only
+# imported when enabled
+if settings.METRICS_ENABLED:
+    from api import metrics
+
+    app.include_router(metrics.router)
 
 
 # Root endpoint
@@ -126,6 +154,9 @@ async def root():
 
 # Main entry point for development server
 if __name__ == "__main__":
+    # Only needed to run the development server, not to import the app
+    import uvicorn
+
     # Silence watchfiles noise in development
     watch_logger = logging.getLogger("watchfiles")
     watch_logger.setLevel(logging.ERROR)
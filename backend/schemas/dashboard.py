@@ -11,21 +11,27 @@ from pydantic import BaseModel, ConfigDict, Field
 
 class Transaction(BaseModel):
     """Schema for financial transaction data."""
-    id: str = Field(..., description="Unique transaction identifier")
+    id: str = Field(
+        ...,
+        description="Unique transaction identifier, '<entry_id>-<posting_id>'; "
+        "both legs of a transfer between the user's accounts share the entry ID",
+    )
     date: datetime = Field(..., description="Transaction date and time")
     amount: float = Field(
         ...,
         description="Transaction amount (positive for income, negative for expense)"
     )
+    currency: str = Field(..., description="ISO 4217 code of the amount")
     type: str = Field(..., description="Transaction category or type")
     description: str = Field(..., description="Transaction description or memo")
 
     model_config = ConfigDict(
         json_schema_extra={
             "example": {
-                "id": "txn-123",
+                "id": "42-84",
                 "date": "2023-01-01T12:30:00Z",
                 "amount": -75.50,
+                "currency": "USD",
                 "type": "Grocery",
                 "description": "Grocery payment"
             }
@@ -38,6 +44,9 @@ class DashboardData(BaseModel):
     account_balance: float = Field(..., description="Current account balance")
     upcoming_bills: float = Field(..., description="Sum of upcoming bills")
     monthly_savings: float = Field(..., description="Monthly savings amount")
+    currency: str = Field(
+        ..., description="ISO 4217 code of the balance, bills and savings"
+    )
     recent_transactions: list[Transaction] = Field(
         ...,
         description="List of recent transactions"
@@ -50,11 +59,13 @@ class DashboardData(BaseModel):
                 "account_balance": 1250.75,
                 "upcoming_bills": 450.00,
                 "monthly_savings": 300.00,
+                "currency": "USD",
                 "recent_transactions": [
                     {
-                        "id": "txn-123",
+                        "id": "42-84",
                         "date": "2023-01-01T12:30:00Z",
                         "amount": -75.50,
+                        "currency": "USD",
                         "type": "Grocery",
                         "description": "Grocery payment"
                     }
@@ -0,0 +1,49 @@
+"""
+Pydantic schemas for statement imports.
+
+This module defines the status of a statement import job as returned by
+the import endpoints and the command-line importer.
+"""
+from enum import StrEnum
+
+from pydantic import BaseModel, ConfigDict, Field
+
+
+class ImportStatus(StrEnum):
+    """Lifecycle of a statement import job."""
+
+    RUNNING = "running"
+    COMPLETED = "completed"
+    FAILED = "failed"
+
+
+class ImportJobResponse(BaseModel):
+    """Schema for the status of a statement import job."""
+    id: int = Field(..., description="Import job identifier")
+    account_id: int = Field(..., description="Account the statement belongs to")
+    filename: str = Field(..., description="Name of the imported file")
+    format: str = Field(..., description="Statement format (csv or ofx)")
+    status: ImportStatus = Field(..., description="Job status")
+    rows_committed: int = Field(..., description="Statement rows written so far")
+    entries_created: int = Field(..., description="Journal entries created")
+    error: str | None = Field(None, description="Error of a failed import")
+    rows_per_second: float | None = Field(
+        None, description="Throughput of the last run"
+    )
+
+    model_config = ConfigDict(
+        from_attributes=True,
+        json_schema_extra={
+            "example": {
+                "id": 3,
+                "account_id": 1,
+                "filename": "checking-2019-2024.csv",
+                "format": "csv",
+                "status": "completed",
+                "rows_committed": 48210,
+                "entries_created": 48210,
+                "error": None,
+                "rows_per_second": 9120.5,
+            }
+        },
+    )
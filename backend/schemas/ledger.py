@@ -0,0 +1,73 @@
+"""
+Pydantic schemas for ledger operations.
+
+This module defines the input models for journal entries and their
+postings, used for request validation and by the ledger service, and the
+inclusion proofs returned for sealed transactions.
+"""
+from datetime import datetime
+from typing import Literal
+
+from pydantic import BaseModel, ConfigDict, Field, model_validator
+
+
+class PostingCreate(BaseModel):
+    """Schema for one posting of a new journal entry."""
+    account_id: int = Field(..., description="Ledger account identifier")
+    amount_minor: int = Field(
+        ...,
+        description="Signed amount in minor units (debit positive, credit negative)",
+    )
+
+
+class JournalEntryCreate(BaseModel):
+    """Schema for a new balanced journal entry."""
+    posted_at: datetime = Field(..., description="Posting date and time")
+    category: str = Field(..., description="Transaction category or type")
+    description: str = Field(..., description="Transaction description or memo")
+    postings: list[PostingCreate] = Field(
+        ..., min_length=2, description="Postings that must sum to zero"
+    )
+
+    model_config = ConfigDict(
+        json_schema_extra={
+            "example": {
+                "posted_at": "2023-01-01T12:30:00Z",
+                "category": "Grocery",
+                "description": "Grocery payment",
+                "postings": [
+                    {"account_id": 1, "amount_minor": -7550},
+                    {"account_id": 7, "amount_minor": 7550},
+                ],
+            }
+        }
+    )
+
+    @model_validator(mode="after")
+    def check_balanced(self) -> "JournalEntryCreate":
+        """Ensure the postings sum to zero"""
+        if sum(posting.amount_minor for posting in self.postings) != 0:
+            raise ValueError("Postings must sum to zero")
+        return self
+
+
+class MerkleProofStep(BaseModel):
+    """Schema for one sibling hash on a Merkle inclusion path."""
+    side: Literal["left", "right"] = Field(
+        ..., description="Position of the sibling relative to the running hash"
+    )
+    hash: str = Field(..., description="Lowercase hex sibling hash")
+
+
+class InclusionProof(BaseModel):
+    """Schema for the Merkle inclusion proof of a transaction."""
+    transaction_id: str = Field(..., description="Transaction identifier")
+    prev_hash: str = Field(..., description="Hash of the preceding chain entry")
+    entry_hash: str = Field(..., description="Hash of the transaction's entry")
+    block_id: int = Field(..., description="Sealed block containing the entry")
+    leaf_index: int = Field(..., description="Position of the entry in the block")
+    leaf_count: int = Field(..., description="Number of entries in the block")
+    merkle_root: str = Field(..., description="Lowercase hex Merkle root of the block")
+    path: list[MerkleProofStep] = Field(
+        ..., description="Sibling hashes from the leaf up to the root"
+    )
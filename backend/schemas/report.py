@@ -0,0 +1,88 @@
+"""
+Pydantic schemas for financial reports.
+
+This module defines the trial balance, income statement, balance sheet and
+monthly cash flow returned for a reporting period. Amounts are in major
+units of the reporting currency; credit-normal accounts are shown as
+positive amounts in the statements.
+"""
+from datetime import datetime
+
+from pydantic import BaseModel, Field
+
+
+class TrialBalanceLine(BaseModel):
+    """Schema for one account of the trial balance."""
+    account_id: int = Field(..., description="Ledger account identifier")
+    account_name: str = Field(..., description="Account name")
+    account_type: str = Field(..., description="Account class")
+    account_currency: str = Field(
+        ..., description="ISO 4217 code the account is kept in"
+    )
+    opening: float = Field(..., description="Balance at the start of the period")
+    change: float = Field(..., description="Net change within the period")
+    closing: float = Field(..., description="Balance at the end of the period")
+    debit: float = Field(..., description="Closing balance if a debit, else 0")
+    credit: float = Field(..., description="Closing balance if a credit, else 0")
+
+
+class TrialBalance(BaseModel):
+    """Schema for the trial balance at the end of the period."""
+    lines: list[TrialBalanceLine] = Field(..., description="One line per account")
+    total_debit: float = Field(..., description="Sum of the debit balances")
+    total_credit: float = Field(..., description="Sum of the credit balances")
+
+
+class ReportLine(BaseModel):
+    """Schema for one account of a statement."""
+    account_id: int = Field(..., description="Ledger account identifier")
+    account_name: str = Field(..., description="Account name")
+    amount: float = Field(..., description="Amount shown for the account")
+
+
+class IncomeStatement(BaseModel):
+    """Schema for the income statement of the period."""
+    income: list[ReportLine] = Field(..., description="Income per account")
+    expenses: list[ReportLine] = Field(..., description="Expenses per account")
+    total_income: float = Field(..., description="Total income")
+    total_expenses: float = Field(..., description="Total expenses")
+    net_income: float = Field(..., description="Income minus expenses")
+
+
+class BalanceSheet(BaseModel):
+    """Schema for the balance sheet at the end of the period."""
+    assets: list[ReportLine] = Field(..., description="Asset balances")
+    liabilities: list[ReportLine] = Field(..., description="Liability balances")
+    equity: list[ReportLine] = Field(..., description="Equity balances")
+    retained_earnings: float = Field(
+        ..., description="Income minus expenses of all time up to the end"
+    )
+    total_assets: float = Field(..., description="Total assets")
+    total_liabilities: float = Field(..., description="Total liabilities")
+    total_equity: float = Field(
+        ..., description="Total equity including retained earnings"
+    )
+
+
+class MonthlyCashFlow(BaseModel):
+    """Schema for one month of the cash flow rollup."""
+    month: datetime = Field(..., description="Start of the month within the period")
+    income: float = Field(..., description="Income of the month")
+    expenses: float = Field(..., description="Expenses of the month")
+    net_income: float = Field(..., description="Income minus expenses")
+    net_cash_flow: float = Field(..., description="Net change of asset accounts")
+    closing_cash: float = Field(..., description="Asset balance at month end")
+
+
+class FinancialReport(BaseModel):
+    """Schema for the financial statements of a period."""
+    start: datetime = Field(..., description="Start of the period")
+    end: datetime = Field(..., description="End of the period (exclusive)")
+    currency: str = Field(..., description="ISO 4217 code of every amount")
+    ledger_version: int = Field(
+        ..., description="Last journal entry included in the report"
+    )
+    trial_balance: TrialBalance
+    income_statement: IncomeStatement
+    balance_sheet: BalanceSheet
+    cash_flow: list[MonthlyCashFlow] = Field(..., description="Monthly rollup")
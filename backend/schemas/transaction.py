@@ -0,0 +1,34 @@
+"""
+Pydantic schemas for transaction listings.
+
+This module defines the paginated response of the transaction listing
+endpoint, built on the dashboard's Transaction schema.
+"""
+from pydantic import BaseModel, ConfigDict, Field
+from schemas.dashboard import Transaction
+
+
+class TransactionPage(BaseModel):
+    """Schema for one page of transactions, newest first."""
+    items: list[Transaction] = Field(..., description="Transactions on this page")
+    next_cursor: str | None = Field(
+        None, description="Cursor for the next page, or null on the last page"
+    )
+
+    model_config = ConfigDict(
+        json_schema_extra={
+            "example": {
+                "items": [
+                    {
+                        "id": "42-84",
+                        "date": "2023-01-01T12:30:00Z",
+                        "amount": -75.50,
+                        "currency": "USD",
+                        "type": "Grocery",
+                        "description": "Grocery payment"
+                    }
+                ],
+                "next_cursor": "WzE2NzI1NzYyMDAsNDJd"
+            }
+        }
+    )
@@ -0,0 +1,71 @@
+"""
+Pydantic schemas for dual-model transaction verification.
+
+This module defines the transaction view sent to the verification models,
+the per-transaction verdicts they return, and the reconciled outcome that
+is stored for each journal entry.
+"""
+from datetime import datetime
+from enum import StrEnum
+
+from pydantic import BaseModel, ConfigDict, Field
+
+
+class VerificationStatus(StrEnum):
+    """Reconciled outcome of verifying a transaction with both models."""
+
+    # Both models accepted the transaction
+    VERIFIED = "verified"
+    # Both models rejected the transaction
+    REJECTED = "rejected"
+    # The models disagreed
+    DISPUTED = "disputed"
+
+
+class VerificationPosting(BaseModel):
+    """Schema for one posting as presented to a verification model."""
+    account: str = Field(..., description="Account name")
+    account_type: str = Field(..., description="Account type")
+    amount_minor: int = Field(
+        ..., description="Signed amount in minor units of its currency"
+    )
+    currency: str = Field(..., description="ISO 4217 currency of the amount")
+
+
+class VerificationItem(BaseModel):
+    """Schema for one transaction as presented to a verification model."""
+    entry_id: int = Field(..., description="Journal entry identifier")
+    posted_at: datetime = Field(..., description="Posting date and time")
+    category: str = Field(..., description="Transaction category or type")
+    description: str = Field(..., description="Transaction description or memo")
+    postings: list[VerificationPosting] = Field(
+        ..., description="Postings of the journal entry"
+    )
+
+
+class ModelVerdict(BaseModel):
+    """Schema for one model's verdict on one transaction."""
+    entry_id: int = Field(..., description="Journal entry identifier")
+    valid: bool = Field(..., description="Whether the model accepts the entry")
+    reason: str = Field("", description="Short explanation of the verdict")
+
+    model_config = ConfigDict(
+        json_schema_extra={
+            "example": {
+                "entry_id": 42,
+                "valid": False,
+                "reason": "Grocery category posted to a salary account",
+            }
+        }
+    )
+
+
+class VerificationResult(BaseModel):
+    """Schema for the reconciled verdicts of both models on a transaction."""
+    entry_id: int = Field(..., description="Journal entry identifier")
+    status: VerificationStatus = Field(..., description="Reconciled outcome")
+    primary_model: str = Field(..., description="Primary model identifier")
+    primary: ModelVerdict = Field(..., description="Primary model verdict")
+    secondary_model: str = Field(..., description="Secondary model identifier")
+    secondary: ModelVerdict = Field(..., description="Secondary model verdict")
+    prompt_version: str = Field(..., description="Prompt version used")
@@ -0,0 +1,316 @@
+#!/usr/bin/env python3
+"""
+Production server with pre-forked workers.
+
+Imports the application once, warms the session cache and compiled
+statements, freezes the heap for the garbage collector and then forks the
+workers, which share those pages copy-on-write and serve one listening
+socket with uvicorn. The parent only supervises: it restarts workers that
+die and stops them gracefully on SIGTERM or SIGINT. On SIGHUP it checks
+that the application still imports and re-executes itself, handing over
+the socket and the old workers, so new code is loaded, new workers start
+and the old ones finish their requests before exiting, without refusing a
+connection. The preload time and memory of the parent and the cold-start
+time and memory of every worker are logged as they become ready.
+
+The event bus behind /api/events is per process and events are not relayed
+between workers: a stream only receives the ledger events of writes handled
+by its own worker, and verification events only from the worker that runs
+verification. Run a single worker where clients rely on the event stream.
+"""
+
+import argparse
+import gc
+import logging
+import os
+import signal
+import socket
+import subprocess
+import sys
+import time
+
+# Timed before the application is imported, to report the preload cost
+STARTED = time.monotonic()
+
+import uvicorn  # noqa: E402
+from core.config import settings  # noqa: E402
+from db.database import async_engine, engine  # noqa: E402
+from services.warmup import warm_up  # noqa: E402
+from utils.process import format_memory, memory_usage  # noqa: E402
+
+from main import app  # noqa: E402
+
+# Logging is configured by main
+logger = logging.getLogger("serve")
+
+BACKEND_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Signals the parent handles; kept blocked so they queue for sigtimedwait
+SIGNALS = {signal.SIGCHLD, signal.SIGHUP, signal.SIGINT, signal.SIGTERM}
+
+# Environment variables that hand the socket and old workers over on reload
+LISTEN_FD_ENV = "SERVE_LISTEN_FD"
+RETIRING_ENV = "SERVE_RETIRING_PIDS"
+
+# Workers that exit sooner than this after starting are restarted with a delay
+MIN_WORKER_LIFETIME = 1.0
+
+# Extra seconds past the graceful timeout before workers are killed
+KILL_GRACE = 5.0
+
+
+def bind_socket(host: str, port: int, backlog: int) -> socket.socket:
+    """
+    Open the listening socket, or adopt the one handed over by a reload.
+
+    Args:
+        host: Address to bind
+        port: Port to bind
+        backlog: Pending connections the kernel queues
+
+    Returns:
+        A listening socket the workers inherit
+    """
+    inherited = os.environ.pop(LISTEN_FD_ENV, None)
+    if inherited is not None:
+        sock = socket.socket(fileno=int(inherited))
+    else:
+        family = socket.AF_INET6 if ":" in host else socket.AF_INET
+        sock = socket.socket(family, socket.SOCK_STREAM)
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        sock.bind((host, port))
+        sock.listen(backlog)
+    sock.set_inheritable(True)
+    return sock
+
+
+class Supervisor:
+    """Forks the workers and keeps them running."""
+
+    def __init__(
+        self,
+        sock: socket.socket,
+        workers: int,
+        graceful_timeout: float,
+        log_level: str,
+    ) -> None:
+        """
+        Create a supervisor.
+
+        Args:
+            sock: The listening socket shared by the workers
+            workers: Number of workers to keep running
+            graceful_timeout: Seconds workers get to finish their requests
+            log_level: Uvicorn log level of the workers
+        """
+        self.sock = sock
+        self.workers = workers
+        self.graceful_timeout = graceful_timeout
+        self.log_level = log_level
+        # Running workers and when they started
+        self.pids: dict[int, float] = {}
+        # Workers asked to stop and when they are killed if still running
+        self.retiring: dict[int, float] = {}
+        # The one worker that runs the background verification scan
+        self.verifier: int | None = None
+
+    def spawn(self) -> int:
+        """Fork a worker and return its process ID."""
+        verifier = self.verifier is None
+        pid = os.fork()
+        if pid:
+            self.pids[pid] = time.monotonic()
+            if verifier:
+                self.verifier = pid
+            return pid
+
+        # Every worker would otherwise scan and verify the same entries
+        app.state.verification_worker = verifier
+        status = 1
+        try:
+            self._serve()
+            status = 0
+        except Exception:
+            logger.exception(f"Worker {os.getpid()} failed")
+        finally:
+            logging.shutdown()
+            os._exit(status)
+
+    def _serve(self) -> None:
+        """Run uvicorn on the shared socket in a forked worker."""
+        signal.pthread_sigmask(signal.SIG_UNBLOCK, SIGNALS)
+        # A terminal hangup is for the parent, which reloads the workers
+        signal.signal(signal.SIGHUP, signal.SIG_IGN)
+        # Connections opened before the fork belong to the parent
+        engine.dispose(close=False)
+        if async_engine is not None:
+            async_engine.sync_engine.dispose(close=False)
+
+        config = uvicorn.Config(
+            app,
+            log_level=self.log_level,
+            timeout_graceful_shutdown=self.graceful_timeout,
+        )
+        uvicorn.Server(config).run(sockets=[self.sock])
+
+    def retire(self, pid: int) -> None:
+        """Ask a worker to finish its requests and exit."""
+        self.pids.pop(pid, None)
+        if pid == self.verifier:
+            self.verifier = None
+        self.retiring[pid] = time.monotonic() + self.graceful_timeout + KILL_GRACE
+        try:
+            os.kill(pid, signal.SIGTERM)
+        except ProcessLookupError:
+            self.retiring.pop(pid)
+
+    def reap(self, respawn: bool = True) -> None:
+        """Collect exited workers, restarting the ones that were not retired."""
+        while True:
+            try:
+                pid, status = os.waitpid(-1, os.WNOHANG)
+            except ChildProcessError:
+                return
+            if pid == 0:
+                return
+
+            code = os.waitstatus_to_exitcode(status)
+            if self.retiring.pop(pid, None) is not None:
+                logger.info(f"Worker {pid} stopped")
+                continue
+            started = self.pids.pop(pid, None)
+            if pid == self.verifier:
+                self.verifier = None
+            if started is None or not respawn:
+                continue
+
+            logger.warning(
+                f"Worker {pid} exited unexpectedly "
+                f"({f'signal {-code}' if code < 0 else f'status {code}'}); restarting"
+            )
+            if time.monotonic() - started < MIN_WORKER_LIFETIME:
+                time.sleep(MIN_WORKER_LIFETIME)
+            self.spawn()
+
+    def kill_overdue(self) -> None:
+        """Kill retiring workers that outlived their graceful timeout."""
+        now = time.monotonic()
+        for pid, deadline in list(self.retiring.items()):
+            if now >= deadline:
+                logger.warning(f"Worker {pid} did not stop in time; killing it")
+                try:
+                    os.kill(pid, signal.SIGKILL)
+                except ProcessLookupError:
+                    pass
+                self.retiring[pid] = now + KILL_GRACE
+
+    def reload(self) -> None:
+        """Re-execute the parent with the socket and the workers handed over."""
+        check = subprocess.run(
+            [sys.executable, "-c", "import main"],
+            cwd=BACKEND_DIR,
+            capture_output=True,
+            text=True,
+        )
+        if check.returncode != 0:
+            logger.error(
+                f"Reload aborted, the application fails to import:\n"
+                f"{check.stderr.strip()}"
+            )
+            return
+
+        logger.info("Reloading: starting a new parent process")
+        os.environ[LISTEN_FD_ENV] = str(self.sock.fileno())
+        os.environ[RETIRING_ENV] = ",".join(
+            str(pid) for pid in (*self.pids, *self.retiring)
+        )
+        logging.shutdown()
+        # Same process ID, so the old workers stay children of the new parent
+        os.execv(sys.executable, [sys.executable, *sys.orig_argv[1:]])
+
+    def stop(self) -> None:
+        """Stop all workers gracefully, killing those that do not exit."""
+        for pid in list(self.pids):
+            self.retire(pid)
+        while self.retiring:
+            signal.sigtimedwait({signal.SIGCHLD}, 1.0)
+            self.reap(respawn=False)
+            self.kill_overdue()
+
+    def run(self, retiring: list[int]) -> None:
+        """
+        Start the workers and supervise them until asked to stop.
+
+        Args:
+            retiring: Workers of the previous parent to stop once the new
+                ones are started
+        """
+        for _ in range(self.workers):
+            self.spawn()
+        for pid in retiring:
+            self.retire(pid)
+
+        while True:
+            info = signal.sigtimedwait(SIGNALS, 1.0)
+            self.reap()
+            self.kill_overdue()
+            if info is None:
+                continue
+            if info.si_signo in (signal.SIGINT, signal.SIGTERM):
+                logger.info("Shutting down workers...")
+                self.stop()
+                return
+            if info.si_signo == signal.SIGHUP:
+                self.reload()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run the pre-forked API server")
+    parser.add_argument("--host", default=settings.HOST, help="Address to bind")
+    parser.add_argument("--port", type=int, default=settings.PORT, help="Port")
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=settings.WORKERS or os.cpu_count() or 1,
+        help="Worker processes (default: WORKERS or the CPU count)",
+    )
+    parser.add_argument(
+        "--backlog", type=int, default=2048, help="Pending connection queue"
+    )
+    parser.add_argument(
+        "--graceful-timeout",
+        type=float,
+        default=settings.GRACEFUL_TIMEOUT,
+        help="Seconds workers get to finish their requests when stopping",
+    )
+    args = parser.parse_args()
+
+    # Queue the handled signals from here on; a reload inherits the mask
+    signal.pthread_sigmask(signal.SIG_BLOCK, SIGNALS)
+    retiring = [
+        int(pid) for pid in os.environ.pop(RETIRING_ENV, "").split(",") if pid
+    ]
+    sock = bind_socket(args.host, args.port, args.backlog)
+
+    app.state.preloaded = True
+    if settings.WARMUP_ENABLED:
+        logger.info(f"Warm-up: {warm_up()}")
+    # Connections cannot be shared with the workers
+    engine.dispose()
+    # Keep the collector from touching, and so copying, the preloaded objects
+    gc.collect()
+    gc.freeze()
+
+    logger.info(
+        f"Preloaded in {time.monotonic() - STARTED:.2f}s "
+        f"({format_memory(memory_usage())}); starting {args.workers} worker(s) "
+        f"on {args.host}:{args.port}"
+    )
+    if args.workers > 1:
+        logger.warning(
+            "Events are not relayed between workers; /api/events streams only "
+            "receive events published by their own worker"
+        )
+    Supervisor(
+        sock, args.workers, args.graceful_timeout, settings.LOG_LEVEL.lower()
+    ).run(retiring)
@@ -0,0 +1,198 @@
+"""
+Merkle block service.
+
+This module seals consecutive journal entries into fixed-size blocks with a
+Merkle root over their entry hashes, and builds and checks inclusion proofs
+so a single transaction can be verified without reading the whole chain.
+"""
+import logging
+import time
+
+from core.config import settings
+from core.exceptions import EntryNotFoundError, EntryNotSealedError
+from db.models.ledger import Account, ChainHead, JournalEntry, LedgerBlock, Posting
+from schemas.ledger import InclusionProof, MerkleProofStep
+from sqlalchemy import func, insert, select
+from sqlalchemy.orm import Session
+from utils.crypto import merkle_leaf, merkle_path, merkle_root, verify_merkle_proof
+
+# Configure logger
+logger = logging.getLogger(__name__)
+
+
+def seal_blocks(db: Session, partial: bool = False) -> list[int]:
+    """
+    Seal unsealed entries into blocks of LEDGER_BLOCK_SIZE entries.
+
+    Called on the append path while the chain head is locked, so blocks
+    are sealed exactly once and in order.
+
+    Args:
+        db: Database session (the caller commits)
+        partial: Also seal a trailing run shorter than the block size
+
+    Returns:
+        IDs of the new blocks
+    """
+    block_size = settings.LEDGER_BLOCK_SIZE
+    sealed_until = db.scalar(select(func.max(LedgerBlock.last_entry_id))) or 0
+
+    # Entry IDs only grow, so a head fewer IDs past the last block than a
+    # block holds means no block is full and no rows need reading
+    head = db.scalar(select(ChainHead.entry_id).where(ChainHead.id == 1))
+    if head is not None and head - sealed_until < (1 if partial else block_size):
+        return []
+
+    block_ids = []
+    while True:
+        rows = db.execute(
+            select(JournalEntry.id, JournalEntry.entry_hash)
+            .where(JournalEntry.id > sealed_until)
+            .order_by(JournalEntry.id)
+            .limit(block_size)
+        ).all()
+        if not rows or (len(rows) < block_size and not partial):
+            break
+
+        block_ids.append(
+            db.scalar(
+                insert(LedgerBlock)
+                .values(
+                    first_entry_id=rows[0].id,
+                    last_entry_id=rows[-1].id,
+                    entry_count=len(rows),
+                    merkle_root=merkle_root([merkle_leaf(r.entry_hash) for r in rows]),
+                    created_at=int(time.time()),
+                )
+                .returning(LedgerBlock.id)
+            )
+        )
+        sealed_until = rows[-1].id
+
+    if block_ids:
+        logger.debug(f"Sealed {len(block_ids)} ledger block(s)")
+    return block_ids
+
+
+def get_inclusion_proof(db: Session, entry_id: int, user_id: str) -> InclusionProof:
+    """
+    Build the Merkle inclusion proof of a journal entry.
+
+    Args:
+        db: Database session
+        entry_id: The journal entry (transaction) to prove
+        user_id: The requesting user, who must own one of its accounts
+
+    Returns:
+        The inclusion proof
+
+    Raises:
+        EntryNotFoundError: If the entry does not exist or is not the user's
+        EntryNotSealedError: If the entry is not yet part of a sealed block
+    """
+    entry = db.execute(
+        select(JournalEntry.id, JournalEntry.prev_hash, JournalEntry.entry_hash)
+        .where(
+            JournalEntry.id == entry_id,
+            select(Posting.id)
+            .join(Account, Account.id == Posting.account_id)
+            .where(Posting.entry_id == JournalEntry.id, Account.user_id == user_id)
+            .exists(),
+        )
+    ).first()
+    if entry is None:
+        raise EntryNotFoundError(f"Transaction {entry_id} not found")
+
+    block = db.scalars(
+        select(LedgerBlock).where(
+            LedgerBlock.first_entry_id <= entry_id,
+            LedgerBlock.last_entry_id >= entry_id,
+        )
+    ).first()
+    if block is None:
+        raise EntryNotSealedError(f"Transaction {entry_id} is not sealed yet")
+
+    block_entries = db.execute(
+        select(JournalEntry.id, JournalEntry.entry_hash)
+        .where(
+            JournalEntry.id >= block.first_entry_id,
+            JournalEntry.id <= block.last_entry_id,
+        )
+        .order_by(JournalEntry.id)
+    ).all()
+    leaves = [merkle_leaf(row.entry_hash) for row in block_entries]
+    index = next(i for i, row in enumerate(block_entries) if row.id == entry_id)
+
+    return InclusionProof(
+        transaction_id=str(entry_id),
+        prev_hash=entry.prev_hash,
+        entry_hash=entry.entry_hash,
+        block_id=block.id,
+        leaf_index=index,
+        leaf_count=len(leaves),
+        merkle_root=block.merkle_root,
+        path=[
+            MerkleProofStep(side=side, hash=sibling)
+            for side, sibling in merkle_path(leaves, index)
+        ],
+    )
+
+
+def verify_inclusion_proof(proof: InclusionProof) -> bool:
+    """
+    Check an inclusion proof without access to the ledger.
+
+    Args:
+        proof: The proof as returned by the proof endpoint
+
+    Returns:
+        True if the entry hash is included under the proof's Merkle root
+    """
+    return verify_merkle_proof(
+        proof.entry_hash,
+        [(step.side, step.hash) for step in proof.path],
+        proof.merkle_root,
+    )
+
+
+def verify_blocks(db: Session) -> list[str]:
+    """
+    Recompute every block's Merkle root and check the blocks are contiguous.
+
+    Args:
+        db: Database session
+
+    Returns:
+        Descriptions of the problems found
+    """
+    problems = []
+    sealed_until = 0
+    for block in db.scalars(select(LedgerBlock).order_by(LedgerBlock.first_entry_id)):
+        expected_first = db.scalar(
+            select(func.min(JournalEntry.id)).where(JournalEntry.id > sealed_until)
+        )
+        if block.first_entry_id != expected_first:
+            problems.append(
+                f"Block {block.id}: starts at entry {block.first_entry_id}, "
+                f"expected {expected_first}"
+            )
+
+        hashes = db.scalars(
+            select(JournalEntry.entry_hash)
+            .where(
+                JournalEntry.id >= block.first_entry_id,
+                JournalEntry.id <= block.last_entry_id,
+            )
+            .order_by(JournalEntry.id)
+        ).all()
+        if len(hashes) != block.entry_count:
+            problems.append(
+                f"Block {block.id}: has {len(hashes)} entries, "
+                f"sealed with {block.entry_count}"
+            )
+        elif merkle_root([merkle_leaf(h) for h in hashes]) != block.merkle_root:
+            problems.append(f"Block {block.id}: Merkle root does not match")
+        sealed_until = block.last_entry_id
+
+    logger.info(f"Block verification found {len(problems)} problem(s)")
+    return problems
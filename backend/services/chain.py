@@ -0,0 +1,359 @@
+"""
+Hash-chain service for tamper evidence.
+
+Every journal entry stores the hash of its predecessor and a hash over its
+own content and that predecessor, so changing, removing or reordering any
+entry breaks every link after it. This module extends the chain as entries
+are appended and verifies it in bounded memory, in parallel across segments
+delimited by checkpointed boundary hashes.
+"""
+import json
+import logging
+import os
+import time
+from collections.abc import Iterator, Sequence
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from itertools import groupby
+
+from core.config import settings
+from db.database import SessionLocal, engine
+from db.models.ledger import ChainCheckpoint, ChainHead, JournalEntry, Posting
+from sqlalchemy import func, insert, select, update
+from sqlalchemy.orm import Session
+from utils.crypto import GENESIS_HASH, chain_hash
+
+# Configure logger
+logger = logging.getLogger(__name__)
+
+# Errors reported per segment before the rest are only counted
+MAX_ERRORS_PER_SEGMENT = 100
+
+
+def entry_payload(
+    posted_at: int,
+    category: str,
+    description: str,
+    postings: Sequence[tuple[int, int, str]],
+) -> bytes:
+    """
+    Canonical bytes of a journal entry for hashing.
+
+    Args:
+        posted_at: Posting time in seconds since epoch
+        category: Entry category
+        description: Entry description
+        postings: (account_id, amount_minor, currency) triples in posting
+            order
+
+    Returns:
+        Compact JSON encoding of the entry content
+    """
+    return json.dumps(
+        [posted_at, category, description, [list(p) for p in postings]],
+        separators=(",", ":"),
+        ensure_ascii=False,
+    ).encode()
+
+
+def lock_chain_head(db: Session) -> str:
+    """
+    Take the chain's write lock and return the hash of its last entry.
+
+    The head row is updated before it is read, so the read happens under
+    the write lock (SQLite) or row lock (other databases) held until the
+    caller's transaction ends.
+
+    Args:
+        db: Database session (the caller commits)
+
+    Returns:
+        Hash of the last chained entry, or the genesis hash for an empty chain
+    """
+    now = int(time.time())
+    locked = db.execute(
+        update(ChainHead).where(ChainHead.id == 1).values(updated_at=now)
+    ).rowcount
+    if not locked:
+        db.execute(
+            insert(ChainHead).values(
+                id=1, entry_id=0, entry_hash=GENESIS_HASH, updated_at=now
+            )
+        )
+        return GENESIS_HASH
+
+    return db.scalar(select(ChainHead.entry_hash).where(ChainHead.id == 1))
+
+
+def advance_chain_head(
+    db: Session, entry_ids: Sequence[int], entry_hashes: Sequence[str]
+) -> None:
+    """
+    Move the chain head to the newly appended entries.
+
+    Also records a segment checkpoint for every appended entry whose ID is a
+    multiple of LEDGER_CHAIN_CHECKPOINT_INTERVAL.
+
+    Args:
+        db: Database session (the caller commits)
+        entry_ids: IDs of the appended entries, in chain order
+        entry_hashes: Hashes of the appended entries, in chain order
+    """
+    if not entry_ids:
+        return
+
+    now = int(time.time())
+    interval = settings.LEDGER_CHAIN_CHECKPOINT_INTERVAL
+    boundaries = [
+        {"entry_id": entry_id, "entry_hash": entry_hash, "created_at": now}
+        for entry_id, entry_hash in zip(entry_ids, entry_hashes, strict=True)
+        if entry_id % interval == 0
+    ]
+    if boundaries:
+        db.execute(insert(ChainCheckpoint), boundaries)
+
+    db.execute(
+        update(ChainHead)
+        .where(ChainHead.id == 1)
+        .values(entry_id=entry_ids[-1], entry_hash=entry_hashes[-1], updated_at=now)
+    )
+
+
+@dataclass(frozen=True, slots=True)
+class Segment:
+    """A range of entries verified independently, (after_id, until_id]."""
+
+    after_id: int
+    until_id: int
+    # Hash the first entry of the segment must chain from
+    prev_hash: str
+    # Checkpointed hash of the last entry, if the boundary is checkpointed
+    expected_hash: str | None
+
+
+@dataclass(slots=True)
+class SegmentReport:
+    """Outcome of verifying one segment."""
+
+    segment: Segment
+    entries: int = 0
+    last_hash: str | None = None
+    error_count: int = 0
+    errors: list[str] = field(default_factory=list)
+
+    def fail(self, message: str) -> None:
+        """Record a verification failure."""
+        self.error_count += 1
+        if len(self.errors) < MAX_ERRORS_PER_SEGMENT:
+            self.errors.append(message)
+
+
+@dataclass(slots=True)
+class ChainReport:
+    """Outcome of verifying the whole chain."""
+
+    entries: int = 0
+    segments: int = 0
+    error_count: int = 0
+    errors: list[str] = field(default_factory=list)
+    elapsed: float = 0.0
+
+    @property
+    def ok(self) -> bool:
+        """Whether the chain verified without errors."""
+        return self.error_count == 0
+
+
+def iter_chain(
+    db: Session, after_id: int, until_id: int, batch_size: int
+) -> Iterator[tuple[JournalEntry, list[tuple[int, int, str]]]]:
+    """
+    Stream entries with their postings in chain order.
+
+    Entries are read in keyset batches and each batch's postings with one
+    range query, so memory is bounded by the batch size.
+
+    Args:
+        db: Database session
+        after_id: Stream entries with IDs greater than this
+        until_id: Stream entries with IDs up to and including this
+        batch_size: Entries per batch
+
+    Yields:
+        Tuples of (entry, [(account_id, amount_minor, currency), ...])
+    """
+    last_id = after_id
+    while last_id < until_id:
+        entries = db.execute(
+            select(
+                JournalEntry.id,
+                JournalEntry.posted_at,
+                JournalEntry.category,
+                JournalEntry.description,
+                JournalEntry.prev_hash,
+                JournalEntry.entry_hash,
+            )
+            .where(JournalEntry.id > last_id, JournalEntry.id <= until_id)
+            .order_by(JournalEntry.id)
+            .limit(batch_size)
+        ).all()
+        if not entries:
+            return
+
+        postings = db.execute(
+            select(
+                Posting.entry_id,
+                Posting.account_id,
+                Posting.amount_minor,
+                Posting.currency,
+            )
+            .where(
+                Posting.entry_id >= entries[0].id, Posting.entry_id <= entries[-1].id
+            )
+            .order_by(Posting.entry_id, Posting.id)
+        )
+        by_entry = {
+            entry_id: [
+                (row.account_id, row.amount_minor, row.currency) for row in rows
+            ]
+            for entry_id, rows in groupby(postings, key=lambda row: row.entry_id)
+        }
+
+        for entry in entries:
+            yield entry, by_entry.get(entry.id, [])
+        last_id = entries[-1].id
+
+
+def verify_segment(
+    db: Session, segment: Segment, batch_size: int = 5_000
+) -> SegmentReport:
+    """
+    Recompute and check every link of one segment.
+
+    Args:
+        db: Database session
+        segment: The range of entries to verify
+        batch_size: Entries read per query
+
+    Returns:
+        The segment report
+    """
+    report = SegmentReport(segment=segment)
+    running = segment.prev_hash
+
+    for entry, postings in iter_chain(
+        db, segment.after_id, segment.until_id, batch_size
+    ):
+        report.entries += 1
+        if entry.prev_hash != running:
+            report.fail(f"Entry {entry.id}: previous hash does not match chain")
+
+        payload = entry_payload(
+            entry.posted_at, entry.category, entry.description, postings
+        )
+        computed = chain_hash(entry.prev_hash, payload)
+        if computed != entry.entry_hash:
+            report.fail(f"Entry {entry.id}: content does not match its hash")
+        running = entry.entry_hash
+
+    report.last_hash = running
+    if segment.expected_hash is not None and running != segment.expected_hash:
+        report.fail(
+            f"Entry {segment.until_id}: hash does not match segment checkpoint"
+        )
+    return report
+
+
+def plan_segments(db: Session) -> tuple[list[Segment], str]:
+    """
+    Split the chain into segments at the checkpointed boundaries.
+
+    Args:
+        db: Database session
+
+    Returns:
+        Tuple of (segments in chain order, hash recorded in the chain head)
+    """
+    head = db.execute(
+        select(ChainHead.entry_id, ChainHead.entry_hash).where(ChainHead.id == 1)
+    ).first()
+    head_id, head_hash = head if head else (0, GENESIS_HASH)
+    last_id = db.scalar(select(func.max(JournalEntry.id))) or 0
+
+    boundaries = db.execute(
+        select(ChainCheckpoint.entry_id, ChainCheckpoint.entry_hash).order_by(
+            ChainCheckpoint.entry_id
+        )
+    ).all()
+
+    segments = []
+    after_id, prev_hash = 0, GENESIS_HASH
+    for entry_id, entry_hash in boundaries:
+        segments.append(Segment(after_id, entry_id, prev_hash, entry_hash))
+        after_id, prev_hash = entry_id, entry_hash
+
+    until_id = max(last_id, head_id)
+    if until_id > after_id or not segments:
+        segments.append(Segment(after_id, until_id, prev_hash, head_hash))
+    return segments, head_hash
+
+
+def _init_worker() -> None:
+    """Drop pooled connections inherited from the parent process."""
+    engine.dispose(close=False)
+
+
+def _verify_segment_worker(segment: Segment, batch_size: int) -> SegmentReport:
+    """Verify one segment in a worker process with its own session."""
+    with SessionLocal() as db:
+        return verify_segment(db, segment, batch_size)
+
+
+def verify_chain(workers: int | None = None, batch_size: int = 5_000) -> ChainReport:
+    """
+    Verify the whole hash chain, in parallel across segments.
+
+    Each segment starts from the checkpointed hash of the previous boundary
+    and must end on its own checkpointed hash, so segments are independent
+    and the work spreads over a process pool.
+
+    Args:
+        workers: Worker processes (defaults to the CPU count)
+        batch_size: Entries read per query in each worker
+
+    Returns:
+        The chain report
+    """
+    started = time.perf_counter()
+    with SessionLocal() as db:
+        segments, head_hash = plan_segments(db)
+
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or len(segments) == 1:
+        with SessionLocal() as db:
+            reports = [verify_segment(db, segment, batch_size) for segment in segments]
+    else:
+        with ProcessPoolExecutor(
+            max_workers=min(workers, len(segments)), initializer=_init_worker
+        ) as pool:
+            reports = list(
+                pool.map(
+                    _verify_segment_worker,
+                    segments,
+                    [batch_size] * len(segments),
+                    chunksize=max(1, len(segments) // (workers * 4)),
+                )
+            )
+
+    report = ChainReport(segments=len(segments))
+    for segment_report in reports:
+        report.entries += segment_report.entries
+        report.error_count += segment_report.error_count
+        report.errors.extend(segment_report.errors)
+
+    report.elapsed = time.perf_counter() - started
+    logger.info(
+        f"Verified {report.entries} entries in {report.segments} segment(s) "
+        f"in {report.elapsed:.2f}s: {report.error_count} error(s)"
+    )
+    return report
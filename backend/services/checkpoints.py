@@ -0,0 +1,331 @@
+"""
+Balance checkpoint service.
+
+This module keeps per-account daily and monthly balance checkpoints in step
+with the postings table, answers balance reads from them, and rebuilds or
+verifies them from the postings. Periods are calendar days and months in UTC.
+"""
+import logging
+from collections import defaultdict
+from collections.abc import Iterable, Sequence
+from dataclasses import dataclass
+from datetime import UTC, datetime
+
+from db.models.ledger import (
+    Account,
+    BalanceCheckpoint,
+    CheckpointGranularity,
+    Posting,
+)
+from sqlalchemy import delete, func, insert, select, update
+from sqlalchemy.orm import Session
+
+# Configure logger
+logger = logging.getLogger(__name__)
+
+SECONDS_PER_DAY = 86_400
+
+DAY = CheckpointGranularity.DAY
+MONTH = CheckpointGranularity.MONTH
+
+
+def to_timestamp(moment: datetime) -> int:
+    """Seconds since epoch of a datetime, reading one without a zone as UTC."""
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=UTC)
+    return int(moment.timestamp())
+
+
+def day_start(timestamp: int) -> int:
+    """Start of the UTC day containing a timestamp, in seconds since epoch."""
+    return timestamp - timestamp % SECONDS_PER_DAY
+
+
+def month_start(timestamp: int) -> int:
+    """Start of the UTC month containing a timestamp, in seconds since epoch."""
+    moment = datetime.fromtimestamp(timestamp, UTC)
+    start = moment.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+    return int(start.timestamp())
+
+
+def update_checkpoints(
+    db: Session, postings: Iterable[tuple[int, int, int]]
+) -> None:
+    """
+    Apply newly appended postings to the balance checkpoints.
+
+    Postings are first summed per (account, granularity, period), so a bulk
+    append touches each checkpoint row once. For in-order appends only the
+    current period's row changes; a backdated posting also shifts the
+    closing balance of every later period of its account.
+
+    Args:
+        db: Database session (the caller commits)
+        postings: Tuples of (account_id, posted_at, amount_minor)
+    """
+    deltas: dict[tuple[int, str, int], int] = defaultdict(int)
+    for account_id, posted_at, amount_minor in postings:
+        deltas[(account_id, DAY, day_start(posted_at))] += amount_minor
+        deltas[(account_id, MONTH, month_start(posted_at))] += amount_minor
+
+    # Ascending period order lets a new row read the closing balance of the
+    # previous period after earlier keys of the same batch were applied
+    for (account_id, granularity, start), delta in sorted(deltas.items()):
+        same_series = (
+            BalanceCheckpoint.account_id == account_id,
+            BalanceCheckpoint.granularity == granularity,
+        )
+        db.execute(
+            update(BalanceCheckpoint)
+            .where(*same_series, BalanceCheckpoint.period_start > start)
+            .values(closing_minor=BalanceCheckpoint.closing_minor + delta)
+        )
+        updated = db.execute(
+            update(BalanceCheckpoint)
+            .where(*same_series, BalanceCheckpoint.period_start == start)
+            .values(
+                delta_minor=BalanceCheckpoint.delta_minor + delta,
+                closing_minor=BalanceCheckpoint.closing_minor + delta,
+            )
+        ).rowcount
+        if updated:
+            continue
+
+        previous = db.scalar(
+            select(BalanceCheckpoint.closing_minor)
+            .where(*same_series, BalanceCheckpoint.period_start < start)
+            .order_by(BalanceCheckpoint.period_start.desc())
+            .limit(1)
+        )
+        db.execute(
+            insert(BalanceCheckpoint).values(
+                account_id=account_id,
+                granularity=granularity,
+                period_start=start,
+                delta_minor=delta,
+                closing_minor=(previous or 0) + delta,
+            )
+        )
+
+
+def get_balances_as_of(
+    db: Session, account_ids: Sequence[int], as_of: int
+) -> dict[int, int]:
+    """
+    Get account balances at a point in time from checkpoints.
+
+    Each balance is the closing balance of the last full day before
+    ``as_of`` plus the postings of the day ``as_of`` falls in, so the cost
+    is independent of the length of the account's history.
+
+    Args:
+        db: Database session
+        account_ids: Accounts to compute balances for
+        as_of: Point in time in seconds since epoch (exclusive)
+
+    Returns:
+        Balance in minor units per account ID
+    """
+    balances = dict.fromkeys(account_ids, 0)
+    if not account_ids:
+        return balances
+
+    cutoff = day_start(as_of)
+    for account_id in account_ids:
+        closing = db.scalar(
+            select(BalanceCheckpoint.closing_minor)
+            .where(
+                BalanceCheckpoint.account_id == account_id,
+                BalanceCheckpoint.granularity == DAY,
+                BalanceCheckpoint.period_start < cutoff,
+            )
+            .order_by(BalanceCheckpoint.period_start.desc())
+            .limit(1)
+        )
+        balances[account_id] = closing or 0
+
+    rows = db.execute(
+        select(Posting.account_id, func.sum(Posting.amount_minor))
+        .where(
+            Posting.account_id.in_(account_ids),
+            Posting.posted_at >= cutoff,
+            Posting.posted_at < as_of,
+        )
+        .group_by(Posting.account_id)
+    )
+    for account_id, total in rows:
+        balances[account_id] += total or 0
+    return balances
+
+
+def get_period_deltas(
+    db: Session, account_ids: Sequence[int], granularity: str, start: int
+) -> dict[int, int]:
+    """
+    Get the net change of each of a set of accounts over one checkpoint period.
+
+    Args:
+        db: Database session
+        account_ids: Accounts to include
+        granularity: Checkpoint granularity (day or month)
+        start: Start of the period in seconds since epoch
+
+    Returns:
+        Net change in minor units per account ID (0 for accounts without
+        postings in the period)
+    """
+    deltas = dict.fromkeys(account_ids, 0)
+    if not account_ids:
+        return deltas
+
+    deltas.update(
+        db.execute(
+            select(BalanceCheckpoint.account_id, BalanceCheckpoint.delta_minor).where(
+                BalanceCheckpoint.account_id.in_(account_ids),
+                BalanceCheckpoint.granularity == granularity,
+                BalanceCheckpoint.period_start == start,
+            )
+        ).all()
+    )
+    return deltas
+
+
+@dataclass(frozen=True, slots=True)
+class CheckpointRow:
+    """A checkpoint as computed from postings or read from the table."""
+
+    account_id: int
+    granularity: str
+    period_start: int
+    delta_minor: int
+    closing_minor: int
+
+
+@dataclass(frozen=True, slots=True)
+class CheckpointDiff:
+    """A checkpoint whose stored value differs from the rebuilt one."""
+
+    account_id: int
+    granularity: str
+    period_start: int
+    expected: CheckpointRow | None
+    actual: CheckpointRow | None
+
+
+def compute_checkpoints(db: Session, account_id: int) -> list[CheckpointRow]:
+    """
+    Rebuild the checkpoints of one account from its postings.
+
+    Postings are summed per day in the database with a range scan of the
+    account's index, so memory is bounded by the number of days with
+    activity rather than the number of postings.
+
+    Args:
+        db: Database session
+        account_id: The account to rebuild
+
+    Returns:
+        Checkpoint rows ordered by granularity and period
+    """
+    day = (Posting.posted_at - Posting.posted_at % SECONDS_PER_DAY).label("day")
+    days = db.execute(
+        select(day, func.sum(Posting.amount_minor))
+        .where(Posting.account_id == account_id)
+        .group_by(day)
+        .order_by(day)
+    )
+
+    day_rows: list[CheckpointRow] = []
+    months: dict[int, int] = {}
+    closing = 0
+    for start, total in days:
+        closing += total
+        day_rows.append(CheckpointRow(account_id, DAY, start, total, closing))
+        month = month_start(start)
+        months[month] = months.get(month, 0) + total
+
+    month_rows = []
+    closing = 0
+    for start, total in months.items():
+        closing += total
+        month_rows.append(CheckpointRow(account_id, MONTH, start, total, closing))
+
+    return day_rows + month_rows
+
+
+def verify_checkpoints(
+    db: Session, account_ids: Sequence[int] | None = None, fix: bool = False
+) -> list[CheckpointDiff]:
+    """
+    Rebuild checkpoints from scratch and diff them against the stored ones.
+
+    Args:
+        db: Database session (committed per account when fixing)
+        account_ids: Accounts to verify, or None for all accounts
+        fix: Replace the stored checkpoints of mismatching accounts
+
+    Returns:
+        The differences found, before any fix was applied
+    """
+    if account_ids is None:
+        account_ids = db.scalars(select(Account.id).order_by(Account.id)).all()
+
+    diffs: list[CheckpointDiff] = []
+    for account_id in account_ids:
+        expected_rows = compute_checkpoints(db, account_id)
+        account_diffs = _diff_account(db, account_id, expected_rows)
+        diffs.extend(account_diffs)
+        if fix and account_diffs:
+            _replace_account(db, account_id, expected_rows)
+
+    logger.info(f"Checkpoint verification found {len(diffs)} difference(s)")
+    return diffs
+
+
+def _diff_account(
+    db: Session, account_id: int, expected_rows: list[CheckpointRow]
+) -> list[CheckpointDiff]:
+    """Compare rebuilt checkpoints of one account with the stored rows."""
+    stored = {
+        (row.granularity, row.period_start): CheckpointRow(
+            row.account_id,
+            row.granularity,
+            row.period_start,
+            row.delta_minor,
+            row.closing_minor,
+        )
+        for row in db.scalars(
+            select(BalanceCheckpoint).where(BalanceCheckpoint.account_id == account_id)
+        )
+    }
+    expected = {(row.granularity, row.period_start): row for row in expected_rows}
+
+    return [
+        CheckpointDiff(account_id, key[0], key[1], expected.get(key), stored.get(key))
+        for key in sorted(expected.keys() | stored.keys())
+        if expected.get(key) != stored.get(key)
+    ]
+
+
+def _replace_account(
+    db: Session, account_id: int, rows: list[CheckpointRow]
+) -> None:
+    """Replace the stored checkpoints of one account and commit."""
+    db.execute(
+        delete(BalanceCheckpoint).where(BalanceCheckpoint.account_id == account_id)
+    )
+    if rows:
+        db.execute(
+            insert(BalanceCheckpoint),
+            [
+                {
+                    "account_id": row.account_id,
+                    "granularity": row.granularity,
+                    "period_start": row.period_start,
+                    "delta_minor": row.delta_minor,
+                    "closing_minor": row.closing_minor,
+                }
+                for row in rows
+            ],
+        )
+    db.commit()
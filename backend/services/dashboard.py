@@ -0,0 +1,122 @@
+"""
+Dashboard service.
+
+This module assembles the dashboard overview for a user from their
+ledger accounts, converted into the reporting currency.
+"""
+import logging
+import time
+from typing import Any
+
+from core.config import settings
+from db.models.ledger import AccountType
+from schemas.user import AuthResponse
+from services.checkpoints import MONTH, get_period_deltas, month_start
+from services.dashboard_cache import CachedDashboard, dashboard_cache
+from services.fx import convert_to_reporting
+from services.ledger import (
+    get_account_balances,
+    get_recent_postings,
+    get_user_accounts,
+)
+from services.transactions import to_transaction
+from sqlalchemy.orm import Session
+from utils.money import currency_exponent, from_minor
+
+# Configure logger
+logger = logging.getLogger(__name__)
+
+# Number of transactions shown on the dashboard
+RECENT_TRANSACTIONS_LIMIT = 5
+
+
+def build_dashboard_data(db: Session, user: AuthResponse) -> dict[str, Any]:
+    """
+    Build the dashboard overview for a user.
+
+    The account balance is the total of the user's asset accounts, upcoming
+    bills are the outstanding balance of their liability accounts, and
+    monthly savings are the net change of their asset accounts in the current
+    month. All three are read from balance checkpoints, so their cost does
+    not grow with the length of the history. The per-account figures are
+    converted into the reporting currency at the current rates in one batch;
+    recent transactions are shown in their own currencies.
+
+    Args:
+        db: Database session
+        user: The authenticated user
+
+    Returns:
+        Dashboard data including account information and transactions,
+        shaped like DashboardData
+
+    Raises:
+        FxRateNotFoundError: If an account's currency has no current rate
+    """
+    accounts = get_user_accounts(
+        db, user.user_id, types=[AccountType.ASSET, AccountType.LIABILITY]
+    )
+    assets = [a for a in accounts if a.type == AccountType.ASSET]
+    liabilities = [a for a in accounts if a.type == AccountType.LIABILITY]
+    asset_ids = [a.id for a in assets]
+    liability_ids = [a.id for a in liabilities]
+
+    now = int(time.time())
+    balances = get_account_balances(db, asset_ids + liability_ids, as_of=now)
+    deltas = get_period_deltas(db, asset_ids, MONTH, month_start(now))
+
+    # One batch: asset balances, liability balances, then asset changes
+    converted = convert_to_reporting(
+        db,
+        [balances[account_id] for account_id in asset_ids + liability_ids]
+        + [deltas[account_id] for account_id in asset_ids],
+        [a.currency for a in assets + liabilities + assets],
+        now,
+    )
+    n_assets = len(assets)
+    n_balances = n_assets + len(liabilities)
+    account_balance = round(converted[:n_assets].sum())
+    # Liabilities carry credit (negative) balances
+    upcoming_bills = -round(converted[n_assets:n_balances].sum())
+    monthly_savings = round(converted[n_balances:].sum())
+
+    recent_transactions = [
+        to_transaction(row)
+        for row in get_recent_postings(db, asset_ids, RECENT_TRANSACTIONS_LIMIT)
+    ]
+
+    logger.debug(
+        f"Loaded {len(recent_transactions)} transactions for user {user.user_id}"
+    )
+
+    exponent = currency_exponent(settings.REPORTING_CURRENCY)
+    return {
+        "account_balance": from_minor(account_balance, exponent),
+        "upcoming_bills": from_minor(upcoming_bills, exponent),
+        "monthly_savings": from_minor(monthly_savings, exponent),
+        "currency": settings.REPORTING_CURRENCY,
+        "recent_transactions": recent_transactions,
+        "account_name": f"{user.username}'s Account",
+    }
+
+
+def get_dashboard(db: Session, user: AuthResponse) -> CachedDashboard:
+    """
+    Get a user's dashboard from the aggregate cache, building it on a miss.
+
+    Args:
+        db: Database session
+        user: The authenticated user
+
+    Returns:
+        The dashboard data with its encoded body and ETag
+    """
+    cached = dashboard_cache.get(user.user_id)
+    if cached is not None:
+        return cached
+
+    # Read before building, so a write committed meanwhile is not cached over
+    generation = dashboard_cache.generation()
+    return dashboard_cache.put(
+        user.user_id, generation, build_dashboard_data(db, user)
+    )
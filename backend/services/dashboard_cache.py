@@ -0,0 +1,240 @@
+"""
+In-process cache of per-user dashboard aggregates.
+
+The dashboard is read on every page load but only changes when postings
+land. This module keeps each user's built dashboard in memory together with
+its encoded JSON body and an ETag derived from that body, so a repeat load
+is answered without a query and an unchanged dashboard costs a 304.
+
+The ledger write path registers the users whose accounts it posted to on
+the database session, and their entries are dropped once that session
+commits. Invalidations are stamped from one counter, and a reader that
+started before a user's last stamp does not store the dashboard it built
+from the old data. The stamps of as many users as the cache holds are kept;
+older ones are folded into a single floor that applies to every user. Writes
+made by other processes (other workers, the import command) are not seen
+here, so entries are also bounded in age (TTL) and are rebuilt when the
+month of the monthly savings figure rolls over.
+"""
+import hashlib
+import logging
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Iterable
+from dataclasses import dataclass
+from typing import Any
+
+import orjson
+from core.config import settings
+from services.checkpoints import month_start
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+# Configure logger
+logger = logging.getLogger(__name__)
+
+# Session.info key of the users whose dashboards a transaction changes
+DIRTY_USERS_KEY = "dashboard_cache_dirty_users"
+
+
+@dataclass(frozen=True, slots=True)
+class CachedDashboard:
+    """A built dashboard as held by the cache."""
+
+    # Plain data shaped like DashboardData
+    data: dict[str, Any]
+    # The data encoded as JSON, and the quoted ETag of that body
+    body: bytes
+    etag: str
+    # Start of the month the monthly savings figure covers
+    month: int
+    # Monotonic deadline after which the entry must be rebuilt
+    cached_until: float
+
+
+class DashboardCache:
+    """Thread-safe TTL/LRU cache of per-user dashboards."""
+
+    def __init__(self, max_size: int, ttl: float) -> None:
+        """
+        Create an empty cache.
+
+        Args:
+            max_size: Maximum number of dashboards to hold
+            ttl: Seconds a dashboard may be served before it is rebuilt
+        """
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries: OrderedDict[str, CachedDashboard] = OrderedDict()
+        # Counter of invalidations, each user's last stamp from it, oldest
+        # first, and the latest stamp dropped to keep the stamps bounded
+        self._clock = 0
+        self._invalidated: OrderedDict[str, int] = OrderedDict()
+        self._floor = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def generation(self) -> int:
+        """
+        Return the generation, to be read before building a dashboard.
+
+        Returns:
+            A counter that changes whenever a dashboard is invalidated
+        """
+        with self._lock:
+            return self._clock
+
+    def get(self, user_id: str) -> CachedDashboard | None:
+        """
+        Look up a user's dashboard.
+
+        Args:
+            user_id: The ID of the user
+
+        Returns:
+            The cached dashboard, or None if absent, stale or from last month
+        """
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            if time.monotonic() >= entry.cached_until or (
+                entry.month != month_start(int(time.time()))
+            ):
+                del self._entries[user_id]
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(user_id)
+            self.hits += 1
+            return entry
+
+    def put(
+        self, user_id: str, generation: int, data: dict[str, Any]
+    ) -> CachedDashboard:
+        """
+        Encode a freshly built dashboard and store it if still current.
+
+        Args:
+            user_id: The ID of the user
+            generation: The generation read before building
+            data: The dashboard data
+
+        Returns:
+            The encoded dashboard, whether or not it was stored
+        """
+        body = orjson.dumps(data, option=orjson.OPT_UTC_Z)
+        entry = CachedDashboard(
+            data=data,
+            body=body,
+            etag=f'"{hashlib.sha256(body).hexdigest()[:32]}"',
+            month=month_start(int(time.time())),
+            cached_until=time.monotonic() + self.ttl,
+        )
+        if self.max_size <= 0:
+            return entry
+
+        with self._lock:
+            # Invalidated while it was being built: the data may predate a write
+            if self._invalidated.get(user_id, self._floor) > generation:
+                return entry
+
+            self._entries[user_id] = entry
+            self._entries.move_to_end(user_id)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+        return entry
+
+    def invalidate_users(self, user_ids: Iterable[str]) -> int:
+        """
+        Drop the dashboards of users whose ledger data changed.
+
+        Args:
+            user_ids: The IDs of the users
+
+        Returns:
+            Number of cache entries removed
+        """
+        removed = 0
+        with self._lock:
+            for user_id in user_ids:
+                self._clock += 1
+                self._invalidated[user_id] = self._clock
+                self._invalidated.move_to_end(user_id)
+                if self._entries.pop(user_id, None) is not None:
+                    removed += 1
+            while len(self._invalidated) > max(self.max_size, 1):
+                _, self._floor = self._invalidated.popitem(last=False)
+            self.invalidations += removed
+        return removed
+
+    def clear(self) -> None:
+        """Drop all entries and reset the counters."""
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = self.evictions = self.invalidations = 0
+
+    def stats(self) -> dict[str, Any]:
+        """
+        Report cache size and hit/miss counters.
+
+        Returns:
+            Dictionary with cache statistics
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "ttl_seconds": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            }
+
+
+def invalidate_on_commit(db: Session, user_ids: Iterable[str]) -> None:
+    """
+    Drop the users' cached dashboards once the session's transaction commits.
+
+    Invalidating only after the commit means no reader can rebuild and
+    cache a dashboard from data the transaction is about to change.
+
+    Args:
+        db: The session making the write
+        user_ids: The IDs of the users whose postings the write changes
+    """
+    db.info.setdefault(DIRTY_USERS_KEY, set()).update(user_ids)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_committed(session: Session) -> None:
+    """Drop the dashboards of the users a committed transaction changed."""
+    user_ids = session.info.pop(DIRTY_USERS_KEY, None)
+    if user_ids:
+        dashboard_cache.invalidate_users(user_ids)
+        logger.debug(f"Invalidated cached dashboards of {len(user_ids)} user(s)")
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_rolled_back(session: Session) -> None:
+    """Forget the users of a rolled-back transaction."""
+    session.info.pop(DIRTY_USERS_KEY, None)
+
+
+# Create global cache instance for simple imports
+dashboard_cache = DashboardCache(
+    max_size=(
+        settings.DASHBOARD_CACHE_MAX_SIZE if settings.DASHBOARD_CACHE_ENABLED else 0
+    ),
+    ttl=settings.DASHBOARD_CACHE_TTL,
+)
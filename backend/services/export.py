@@ -0,0 +1,318 @@
+"""
+Ledger export service.
+
+This module streams a user's full ledger (postings) or its audit trail
+(journal entries with their chain hashes and signatures) as NDJSON, CSV or
+Parquet. Rows come from a server-side cursor in fixed-size partitions and
+are encoded straight from the database tuples, without building ORM
+objects or Pydantic models, so memory stays constant however large the
+ledger is. Amounts are exported exactly, in minor units, as they are stored.
+
+Parquet output needs the optional ``pyarrow`` package (the ``export``
+extra).
+"""
+import csv
+import importlib.util
+import io
+import json
+import logging
+import time
+from collections.abc import Callable, Iterator, Sequence
+from datetime import datetime
+
+from core.config import settings
+from core.exceptions import ExportUnavailableError
+from db.database import SessionLocal
+from db.models.ledger import Account, JournalEntry, Posting
+from services.checkpoints import to_timestamp
+from sqlalchemy import Row, Select, exists, select
+
+# Configure logger
+logger = logging.getLogger(__name__)
+
+# Media type of each export format
+EXPORT_MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv; charset=utf-8",
+    "parquet": "application/vnd.apache.parquet",
+}
+
+# Columns of each dataset as (name, kind); "time" columns hold seconds since
+# epoch and are rendered as ISO 8601 in the text formats
+EXPORT_COLUMNS: dict[str, tuple[tuple[str, str], ...]] = {
+    "postings": (
+        ("posting_id", "int"),
+        ("entry_id", "int"),
+        ("posted_at", "time"),
+        ("account_id", "int"),
+        ("account", "str"),
+        ("account_type", "str"),
+        ("amount_minor", "int"),
+        ("currency", "str"),
+        ("category", "str"),
+        ("description", "str"),
+    ),
+    "entries": (
+        ("entry_id", "int"),
+        ("posted_at", "time"),
+        ("created_at", "time"),
+        ("category", "str"),
+        ("description", "str"),
+        ("prev_hash", "str"),
+        ("entry_hash", "str"),
+        ("signature", "str"),
+        ("signing_key_id", "str"),
+    ),
+}
+
+
+def parquet_available() -> bool:
+    """Whether the optional pyarrow dependency for Parquet output is installed."""
+    return importlib.util.find_spec("pyarrow") is not None
+
+
+def _export_query(
+    dataset: str, user_id: str, posted_from: int | None, posted_until: int | None
+) -> Select:
+    """Build the query of a dataset, in ID order and restricted to the user."""
+    if dataset == "postings":
+        query = (
+            select(
+                Posting.id,
+                Posting.entry_id,
+                Posting.posted_at,
+                Posting.account_id,
+                Account.name,
+                Account.type,
+                Posting.amount_minor,
+                Posting.currency,
+                JournalEntry.category,
+                JournalEntry.description,
+            )
+            .join(Account, Account.id == Posting.account_id)
+            .join(JournalEntry, JournalEntry.id == Posting.entry_id)
+            .where(Account.user_id == user_id)
+            .order_by(Posting.id)
+        )
+        posted_at = Posting.posted_at
+    else:
+        owned = (
+            select(Posting.id)
+            .join(Account, Account.id == Posting.account_id)
+            .where(Posting.entry_id == JournalEntry.id, Account.user_id == user_id)
+        )
+        query = (
+            select(
+                JournalEntry.id,
+                JournalEntry.posted_at,
+                JournalEntry.created_at,
+                JournalEntry.category,
+                JournalEntry.description,
+                JournalEntry.prev_hash,
+                JournalEntry.entry_hash,
+                JournalEntry.signature,
+                JournalEntry.signing_key_id,
+            )
+            .where(exists(owned))
+            .order_by(JournalEntry.id)
+        )
+        posted_at = JournalEntry.posted_at
+
+    if posted_from is not None:
+        query = query.where(posted_at >= posted_from)
+    if posted_until is not None:
+        query = query.where(posted_at < posted_until)
+    return query
+
+
+def iter_partitions(
+    dataset: str,
+    user_id: str,
+    posted_from: int | None = None,
+    posted_until: int | None = None,
+    batch_size: int | None = None,
+) -> Iterator[Sequence[Row]]:
+    """
+    Stream the rows of a dataset from a server-side cursor.
+
+    The generator opens its own session, because the request's session is
+    closed before a streaming response body is produced. The session is
+    closed when the generator is exhausted or closed early (for example
+    when the client disconnects).
+
+    Args:
+        dataset: "postings" or "entries"
+        user_id: The ID of the user
+        posted_from: Only rows posted at or after this time (epoch seconds)
+        posted_until: Only rows posted before this time (epoch seconds)
+        batch_size: Rows fetched per partition (defaults to EXPORT_BATCH_SIZE)
+
+    Yields:
+        Lists of at most batch_size rows, in ID order
+    """
+    batch_size = batch_size or settings.EXPORT_BATCH_SIZE
+    query = _export_query(dataset, user_id, posted_from, posted_until)
+    with SessionLocal() as db:
+        result = db.execute(query.execution_options(yield_per=batch_size))
+        yield from result.partitions()
+
+
+def _iso_time(seconds: int) -> str:
+    """Render seconds since epoch as an ISO 8601 UTC timestamp."""
+    return time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(seconds))
+
+
+def _text_rows(
+    dataset: str, partitions: Iterator[Sequence[Row]]
+) -> Iterator[list[list]]:
+    """Convert partitions to lists of plain values for the text formats."""
+    time_columns = [
+        index
+        for index, (_, kind) in enumerate(EXPORT_COLUMNS[dataset])
+        if kind == "time"
+    ]
+    for rows in partitions:
+        values = [list(row) for row in rows]
+        for row in values:
+            for index in time_columns:
+                row[index] = _iso_time(row[index])
+        yield values
+
+
+def _encode_ndjson(
+    dataset: str, partitions: Iterator[Sequence[Row]]
+) -> Iterator[bytes]:
+    """Encode partitions as newline-delimited JSON objects."""
+    names = [name for name, _ in EXPORT_COLUMNS[dataset]]
+    dumps = json.JSONEncoder(ensure_ascii=False, separators=(",", ":")).encode
+    for rows in _text_rows(dataset, partitions):
+        yield "".join(
+            dumps(dict(zip(names, row, strict=True))) + "\n" for row in rows
+        ).encode()
+
+
+def _encode_csv(dataset: str, partitions: Iterator[Sequence[Row]]) -> Iterator[bytes]:
+    """Encode partitions as CSV with a header row."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator="\n")
+    writer.writerow([name for name, _ in EXPORT_COLUMNS[dataset]])
+    for rows in _text_rows(dataset, partitions):
+        writer.writerows(rows)
+        yield buffer.getvalue().encode()
+        buffer.seek(0)
+        buffer.truncate()
+
+    # Header only, for an empty export
+    if buffer.tell():
+        yield buffer.getvalue().encode()
+
+
+class _ChunkSink(io.RawIOBase):
+    """Write-only file object that hands written bytes back in chunks."""
+
+    def __init__(self) -> None:
+        self._chunks: list[bytes] = []
+        self._written = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data: bytes) -> int:
+        self._chunks.append(bytes(data))
+        self._written += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._written
+
+    def drain(self) -> bytes:
+        """Return and forget the bytes written since the last drain."""
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def _encode_parquet(
+    dataset: str, partitions: Iterator[Sequence[Row]]
+) -> Iterator[bytes]:
+    """Encode partitions as a Parquet file, one row group per partition."""
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    types = {
+        "int": pa.int64(),
+        "str": pa.string(),
+        "time": pa.timestamp("s", tz="UTC"),
+    }
+    columns = EXPORT_COLUMNS[dataset]
+    schema = pa.schema([(name, types[kind]) for name, kind in columns])
+
+    sink = _ChunkSink()
+    with pq.ParquetWriter(sink, schema, compression="zstd") as writer:
+        for rows in partitions:
+            arrays = [
+                # Timestamps are cast from the stored integers, not parsed
+                pa.array(values, type=pa.int64()).cast(types[kind])
+                if kind == "time"
+                else pa.array(values, type=types[kind])
+                for (_, kind), values in zip(columns, zip(*rows), strict=True)
+            ]
+            writer.write_batch(pa.record_batch(arrays, schema=schema))
+            yield sink.drain()
+    yield sink.drain()
+
+
+ENCODERS: dict[str, Callable[[str, Iterator[Sequence[Row]]], Iterator[bytes]]] = {
+    "ndjson": _encode_ndjson,
+    "csv": _encode_csv,
+    "parquet": _encode_parquet,
+}
+
+
+def stream_export(
+    user_id: str,
+    dataset: str,
+    export_format: str,
+    start: datetime | None = None,
+    end: datetime | None = None,
+    batch_size: int | None = None,
+) -> Iterator[bytes]:
+    """
+    Stream one of a user's datasets in the requested format.
+
+    The format is checked before streaming starts, so errors can still be
+    reported with a status code; the returned iterator does the reading.
+
+    Args:
+        user_id: The ID of the user
+        dataset: "postings" (the ledger) or "entries" (the audit trail)
+        export_format: "ndjson", "csv" or "parquet"
+        start: Only rows posted at or after this time
+        end: Only rows posted before this time
+        batch_size: Rows fetched and encoded per chunk
+
+    Returns:
+        Iterator over the encoded file in chunks of one partition each
+
+    Raises:
+        ExportUnavailableError: If Parquet is requested without pyarrow
+        ValueError: If the dataset or format is unknown
+    """
+    if dataset not in EXPORT_COLUMNS:
+        raise ValueError(f"Unknown export dataset '{dataset}'")
+    if export_format not in ENCODERS:
+        raise ValueError(f"Unknown export format '{export_format}'")
+    if export_format == "parquet" and not parquet_available():
+        raise ExportUnavailableError(
+            "Parquet export requires pyarrow (install the 'export' extra)"
+        )
+
+    partitions = iter_partitions(
+        dataset,
+        user_id,
+        posted_from=to_timestamp(start) if start else None,
+        posted_until=to_timestamp(end) if end else None,
+        batch_size=batch_size,
+    )
+    logger.info(f"Exporting {dataset} of user {user_id} as {export_format}")
+    return ENCODERS[export_format](dataset, partitions)
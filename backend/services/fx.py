@@ -0,0 +1,297 @@
+"""
+Foreign exchange service.
+
+Postings are stored in the currency of their account and converted when
+they are aggregated. This module keeps the local rate table in memory as an
+interval index: for each currency pair, the times from which each rate
+applies, in ascending order, and the rates. Converting a result set groups
+its rows by currency and finds the rates of a whole group with one binary
+search over the index (np.searchsorted), so a conversion costs one
+vectorized lookup per currency rather than one per row. The index is
+reloaded after FX_RATES_TTL seconds, which bounds how long rates added by
+another process go unseen.
+"""
+import csv
+import logging
+import re
+import threading
+import time
+from collections.abc import Iterable, Iterator
+from datetime import UTC, datetime
+from itertools import batched, groupby
+
+import numpy as np
+from core.config import settings
+from core.exceptions import (
+    FxRateNotFoundError,
+    ImportFormatError,
+    LedgerReadOnlyError,
+)
+from db.models.fx import FxRate
+from sqlalchemy import delete, insert, select, tuple_
+from sqlalchemy.orm import Session
+from utils.money import currency_exponent
+
+# Configure logger
+logger = logging.getLogger(__name__)
+
+# Shape of an ISO 4217 currency code
+CURRENCY_PATTERN = re.compile(r"[A-Z]{3}")
+
+# Rates written per statement by add_rates
+RATE_BATCH_SIZE = 500
+
+# Times and rates of one currency pair, in ascending time order
+RateSeries = tuple[np.ndarray, np.ndarray]
+
+
+class FxRateIndex:
+    """In-memory as-of index of the FX rate table."""
+
+    def __init__(self, ttl: float) -> None:
+        """
+        Create an empty index; it is loaded on first use.
+
+        Args:
+            ttl: Seconds the loaded rates are used before they are reloaded
+        """
+        self.ttl = ttl
+        self._series: dict[tuple[str, str], RateSeries] = {}
+        self._loaded_until = 0.0
+        self._lock = threading.Lock()
+        # Changes whenever a reload finds different rates
+        self.version = 0
+        self.loads = 0
+
+    def refresh(self, db: Session) -> None:
+        """
+        Reload the rates from the table if the loaded ones have expired.
+
+        Args:
+            db: Database session
+        """
+        if time.monotonic() < self._loaded_until:
+            return
+
+        rows = db.execute(
+            select(FxRate.base, FxRate.quote, FxRate.effective_at, FxRate.rate)
+            .order_by(FxRate.base, FxRate.quote, FxRate.effective_at)
+        ).all()
+        series = {}
+        for pair, group in groupby(rows, key=lambda row: (row.base, row.quote)):
+            group = list(group)
+            series[pair] = (
+                np.array([row.effective_at for row in group], dtype=np.int64),
+                np.array([row.rate for row in group], dtype=np.float64),
+            )
+
+        with self._lock:
+            if not _same_series(series, self._series):
+                self._series = series
+                self.version += 1
+            self._loaded_until = time.monotonic() + self.ttl
+            self.loads += 1
+        logger.debug(f"Loaded {len(rows)} FX rates for {len(series)} pair(s)")
+
+    def rates(self, base: str, quote: str, times: np.ndarray) -> np.ndarray:
+        """
+        Look up the rates of a currency pair at many points in time.
+
+        Pairs are used as stored or inverted; there is no triangulation
+        through a third currency.
+
+        Args:
+            base: Currency converted from
+            quote: Currency converted into
+            times: Seconds since epoch
+
+        Returns:
+            Units of ``quote`` per unit of ``base`` at each time
+
+        Raises:
+            FxRateNotFoundError: If the pair has no rate at one of the times
+        """
+        if base == quote:
+            return np.ones(len(times))
+
+        series = self._series
+        if (base, quote) in series:
+            return _as_of(series[base, quote], base, quote, times)
+        if (quote, base) in series:
+            return 1.0 / _as_of(series[quote, base], quote, base, times)
+        raise FxRateNotFoundError(f"No {base}/{quote} FX rate")
+
+    def convert(
+        self,
+        amounts: Iterable[int] | np.ndarray,
+        currencies: Iterable[str] | np.ndarray,
+        times: int | Iterable[int] | np.ndarray,
+        target: str,
+    ) -> np.ndarray:
+        """
+        Convert amounts in minor units into minor units of another currency.
+
+        Args:
+            amounts: Amounts in minor units of their own currency
+            currencies: ISO 4217 code of each amount
+            times: Seconds since epoch at which each amount is converted, or
+                one time for all of them
+            target: Currency to convert into
+
+        Returns:
+            The converted amounts in minor units of ``target``, unrounded;
+            amounts already in ``target`` are returned exactly
+
+        Raises:
+            FxRateNotFoundError: If a rate is missing
+        """
+        amounts = np.asarray(amounts, dtype=np.float64)
+        times = np.broadcast_to(np.asarray(times, dtype=np.int64), amounts.shape)
+        codes, groups = np.unique(
+            np.asarray(currencies, dtype="U3"), return_inverse=True
+        )
+
+        converted = np.empty_like(amounts)
+        target_exponent = currency_exponent(target)
+        for k, code in enumerate(codes.tolist()):
+            rows = groups == k
+            scale = 10.0 ** (target_exponent - currency_exponent(code))
+            converted[rows] = (
+                amounts[rows] * self.rates(code, target, times[rows]) * scale
+            )
+        return converted
+
+
+def _as_of(
+    series: RateSeries, base: str, quote: str, times: np.ndarray
+) -> np.ndarray:
+    """Pick the rate in effect at each time from one pair's series."""
+    effective, rates = series
+    index = np.searchsorted(effective, times, side="right") - 1
+    if index.size and index.min() < 0:
+        earliest = datetime.fromtimestamp(int(times.min()), UTC)
+        raise FxRateNotFoundError(
+            f"No {base}/{quote} FX rate on or before {earliest:%Y-%m-%d %H:%M} UTC"
+        )
+    return rates[index]
+
+
+def _same_series(
+    left: dict[tuple[str, str], RateSeries], right: dict[tuple[str, str], RateSeries]
+) -> bool:
+    """Whether two loaded indexes hold the same rates."""
+    return left.keys() == right.keys() and all(
+        np.array_equal(left[pair][0], right[pair][0])
+        and np.array_equal(left[pair][1], right[pair][1])
+        for pair in left
+    )
+
+
+def convert_to_reporting(
+    db: Session,
+    amounts: Iterable[int] | np.ndarray,
+    currencies: Iterable[str] | np.ndarray,
+    times: int | Iterable[int] | np.ndarray,
+) -> np.ndarray:
+    """
+    Convert amounts into minor units of REPORTING_CURRENCY.
+
+    Args:
+        db: Database session, used if the rate index needs reloading
+        amounts: Amounts in minor units of their own currency
+        currencies: ISO 4217 code of each amount
+        times: Seconds since epoch at which each amount is converted, or
+            one time for all of them
+
+    Returns:
+        The converted amounts, unrounded
+
+    Raises:
+        FxRateNotFoundError: If a rate is missing
+    """
+    fx_rates.refresh(db)
+    return fx_rates.convert(amounts, currencies, times, settings.REPORTING_CURRENCY)
+
+
+def parse_rates_csv(path: str) -> Iterator[tuple[str, str, int, float]]:
+    """
+    Read FX rates from a CSV file with a date,base,quote,rate header.
+
+    Dates are ISO 8601 dates or date-times, in UTC unless they carry an
+    offset; a rate applies from its date until the next rate of the pair.
+
+    Args:
+        path: Path of the file
+
+    Yields:
+        Tuples of (base, quote, effective_at, rate)
+
+    Raises:
+        ImportFormatError: If a row is malformed
+    """
+    with open(path, newline="", encoding="utf-8-sig") as f:
+        for line, row in enumerate(csv.DictReader(f), start=2):
+            try:
+                effective = datetime.fromisoformat(row["date"].strip())
+                base = row["base"].strip().upper()
+                quote = row["quote"].strip().upper()
+                rate = float(row["rate"])
+            except (KeyError, AttributeError, ValueError) as e:
+                raise ImportFormatError(f"Row {line}: {e}") from e
+            if not all(CURRENCY_PATTERN.fullmatch(code) for code in (base, quote)):
+                raise ImportFormatError(f"Row {line}: invalid currency code")
+            if not rate > 0:
+                raise ImportFormatError(f"Row {line}: rate must be positive")
+            if effective.tzinfo is None:
+                effective = effective.replace(tzinfo=UTC)
+            yield base, quote, int(effective.timestamp()), rate
+
+
+def add_rates(db: Session, rates: Iterable[tuple[str, str, int, float]]) -> int:
+    """
+    Store FX rates, replacing rates of the same pair and effective time.
+
+    Args:
+        db: Database session (the caller commits)
+        rates: Tuples of (base, quote, effective_at, rate)
+
+    Returns:
+        Number of rates written
+
+    Raises:
+        LedgerReadOnlyError: If the database is in read-only mode
+    """
+    if settings.DATABASE_READ_ONLY:
+        raise LedgerReadOnlyError("Rate writes require DATABASE_READ_ONLY=false")
+
+    now = int(time.time())
+    written = 0
+    for batch in batched(rates, RATE_BATCH_SIZE):
+        # Last one wins within a batch, as across batches
+        rows = {(base, quote, at): value for base, quote, at, value in batch}
+        db.execute(
+            delete(FxRate).where(
+                tuple_(FxRate.base, FxRate.quote, FxRate.effective_at).in_(
+                    list(rows)
+                )
+            )
+        )
+        db.execute(
+            insert(FxRate),
+            [
+                {
+                    "base": base,
+                    "quote": quote,
+                    "effective_at": at,
+                    "rate": value,
+                    "created_at": now,
+                }
+                for (base, quote, at), value in rows.items()
+            ],
+        )
+        written += len(rows)
+    return written
+
+
+# Create global FX rate index instance for simple imports
+fx_rates = FxRateIndex(settings.FX_RATES_TTL)
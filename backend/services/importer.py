@@ -0,0 +1,551 @@
+"""
+Bank statement import service.
+
+This module streams CSV and OFX statements into the ledger. Files are
+parsed lazily, validated against the Transaction schema one chunk at a
+time and written through the bulk ledger path in one transaction per
+chunk, so memory stays flat whatever the file size. Every imported line
+becomes a journal entry between the statement's account and the user's
+suspense account in the same currency, from which it can be recategorized
+later.
+
+Each chunk commits together with the job's progress counter, so an
+interrupted import resumes after the last committed chunk without
+duplicating or losing lines, and a completed file is not imported twice.
+"""
+import csv
+import hashlib
+import logging
+import re
+import time
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass
+from datetime import UTC, datetime
+from itertools import islice
+from pathlib import Path
+
+from core.config import settings
+from core.exceptions import (
+    AccountNotFoundError,
+    ImportConflictError,
+    ImportFormatError,
+    ImportJobNotFoundError,
+    LedgerReadOnlyError,
+)
+from db.models.imports import ImportJob
+from db.models.ledger import Account, AccountType
+from pydantic import TypeAdapter, ValidationError
+from schemas.dashboard import Transaction
+from schemas.imports import ImportJobResponse, ImportStatus
+from schemas.ledger import JournalEntryCreate, PostingCreate
+from services.ledger import post_entries
+from sqlalchemy import insert, select, update
+from sqlalchemy.orm import Session
+from utils.money import DEFAULT_CURRENCY, currency_exponent, to_minor
+
+# Configure logger
+logger = logging.getLogger(__name__)
+
+# Accepted CSV header names per Transaction field, compared case-insensitively
+CSV_COLUMNS = {
+    "id": ("id", "fitid", "reference", "transaction id"),
+    "date": ("date", "posted", "posted_at", "transaction date", "booking date"),
+    "amount": ("amount", "value"),
+    "type": ("type", "category"),
+    "description": ("description", "memo", "payee", "name", "details"),
+    "currency": ("currency", "ccy"),
+}
+
+# OFX elements of a statement transaction mapped to Transaction fields
+OFX_FIELDS = {
+    "FITID": "id",
+    "DTPOSTED": "date",
+    "TRNAMT": "amount",
+    "TRNTYPE": "type",
+    "NAME": "description",
+    "MEMO": "memo",
+}
+
+_OFX_TOKEN = re.compile(r"<(/?)([A-Za-z0-9.]+)>([^<]*)")
+_OFX_DATE = re.compile(r"(\d{8})(\d{6})?")
+
+# Bytes read per step when streaming OFX and hashing files
+READ_SIZE = 64 * 1024
+
+_transactions = TypeAdapter(list[Transaction])
+
+
+def detect_format(filename: str) -> str:
+    """
+    Infer the statement format from a file name.
+
+    Args:
+        filename: Name of the statement file
+
+    Returns:
+        "csv" or "ofx"
+
+    Raises:
+        ImportFormatError: If the extension is not recognized
+    """
+    suffix = Path(filename).suffix.lower()
+    if suffix in (".csv", ".txt"):
+        return "csv"
+    if suffix in (".ofx", ".qfx"):
+        return "ofx"
+    raise ImportFormatError(f"Unsupported statement format: {filename}")
+
+
+def parse_csv(path: str) -> Iterator[dict]:
+    """
+    Stream the rows of a CSV statement as Transaction fields.
+
+    The header row is matched against CSV_COLUMNS. Rows without an ID get
+    their line number.
+
+    Args:
+        path: Path of the CSV file
+
+    Yields:
+        One dictionary per statement line
+    """
+    with open(path, newline="", encoding="utf-8-sig") as f:
+        reader = csv.reader(f)
+        header = [name.strip().lower() for name in next(reader, [])]
+        columns = {}
+        for field, names in CSV_COLUMNS.items():
+            for index, name in enumerate(header):
+                if name in names:
+                    columns[field] = index
+                    break
+
+        missing = {"date", "amount"} - columns.keys()
+        if missing:
+            raise ImportFormatError(f"CSV header lacks columns: {sorted(missing)}")
+
+        for line, row in enumerate(reader, start=2):
+            if not any(row):
+                continue
+            values = {
+                field: row[index].strip() if index < len(row) else ""
+                for field, index in columns.items()
+            }
+            values.setdefault("id", "")
+            values["id"] = values["id"] or str(line)
+            values.setdefault("type", "Imported")
+            values.setdefault("description", "")
+            yield values
+
+
+def _ofx_tokens(path: str) -> Iterator[tuple[bool, str, str]]:
+    """Stream (closing, tag, text) tokens of an SGML or XML OFX file."""
+    with open(path, encoding="utf-8", errors="replace") as f:
+        buffer = ""
+        while block := f.read(READ_SIZE):
+            buffer += block
+            # Keep a possibly incomplete trailing token for the next block
+            cut = buffer.rfind("<")
+            if cut < 0:
+                continue
+            for match in _OFX_TOKEN.finditer(buffer, 0, cut):
+                yield match.group(1) == "/", match.group(2).upper(), match.group(3)
+            buffer = buffer[cut:]
+        for match in _OFX_TOKEN.finditer(buffer):
+            yield match.group(1) == "/", match.group(2).upper(), match.group(3)
+
+
+def _ofx_datetime(value: str) -> str:
+    """Convert an OFX date (YYYYMMDD[HHMMSS[.XXX]][TZ]) to ISO 8601 in UTC."""
+    match = _OFX_DATE.match(value)
+    if not match:
+        return value
+    moment = datetime.strptime(
+        match.group(1) + (match.group(2) or "000000"), "%Y%m%d%H%M%S"
+    )
+    return moment.replace(tzinfo=UTC).isoformat()
+
+
+def parse_ofx(path: str) -> Iterator[dict]:
+    """
+    Stream the STMTTRN records of an OFX statement as Transaction fields.
+
+    Handles both SGML (OFX 1.x, unclosed elements) and XML (OFX 2.x).
+
+    Args:
+        path: Path of the OFX file
+
+    Yields:
+        One dictionary per statement transaction
+    """
+    current = None
+    count = 0
+    for closing, tag, text in _ofx_tokens(path):
+        if tag == "STMTTRN":
+            if closing and current is not None:
+                count += 1
+                memo = current.pop("memo", "")
+                current.setdefault("id", str(count))
+                current.setdefault("type", "Imported")
+                current["description"] = current.get("description") or memo
+                if "date" in current:
+                    current["date"] = _ofx_datetime(current["date"])
+                yield current
+                current = None
+            elif not closing:
+                current = {}
+        elif current is not None and not closing and tag in OFX_FIELDS:
+            current[OFX_FIELDS[tag]] = text.strip()
+
+
+PARSERS = {"csv": parse_csv, "ofx": parse_ofx}
+
+
+def file_sha256(path: str) -> str:
+    """SHA-256 of a file, read in blocks."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        while block := f.read(READ_SIZE):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def validate_chunk(
+    rows: list[dict], first_row: int, currency: str
+) -> list[Transaction]:
+    """
+    Validate one chunk of parsed rows against the Transaction schema.
+
+    Rows without a currency are in the account's currency; rows in another
+    currency are rejected rather than converted.
+
+    Args:
+        rows: Parsed statement rows
+        first_row: Index of the first row in the statement, for errors
+        currency: ISO 4217 code of the statement's account
+
+    Returns:
+        The validated transactions
+
+    Raises:
+        ImportFormatError: If a row is invalid or in another currency
+    """
+    for row in rows:
+        row["currency"] = (row.get("currency") or currency).upper()
+    try:
+        transactions = _transactions.validate_python(rows)
+    except ValidationError as e:
+        error = e.errors()[0]
+        row = first_row + error["loc"][0] + 1
+        field = ".".join(str(part) for part in error["loc"][1:])
+        raise ImportFormatError(f"Row {row}: {field}: {error['msg']}") from e
+
+    for index, transaction in enumerate(transactions):
+        if transaction.currency != currency:
+            raise ImportFormatError(
+                f"Row {first_row + index + 1}: currency: {transaction.currency} "
+                f"is not the account's currency {currency}"
+            )
+    return transactions
+
+
+def get_suspense_account(
+    db: Session, user_id: str, currency: str = DEFAULT_CURRENCY
+) -> int:
+    """
+    Get the user's suspense account in a currency, creating it if needed.
+
+    Args:
+        db: Database session (the caller commits)
+        user_id: The ID of the user
+        currency: ISO 4217 code of the statement's account
+
+    Returns:
+        ID of the suspense account
+    """
+    name = settings.IMPORT_SUSPENSE_ACCOUNT
+    if currency != DEFAULT_CURRENCY:
+        name = f"{name} ({currency})"
+    account_id = db.scalar(
+        select(Account.id).where(Account.user_id == user_id, Account.name == name)
+    )
+    if account_id is None:
+        account_id = db.scalar(
+            insert(Account)
+            .values(
+                user_id=user_id,
+                name=name,
+                type=AccountType.EQUITY,
+                currency=currency,
+                created_at=int(time.time()),
+            )
+            .returning(Account.id)
+        )
+    return account_id
+
+
+def to_entries(
+    transactions: Iterable[Transaction],
+    account_id: int,
+    suspense_id: int,
+    exponent: int,
+) -> list[JournalEntryCreate]:
+    """Turn statement lines into entries against the suspense account."""
+    entries = []
+    for transaction in transactions:
+        amount_minor = to_minor(transaction.amount, exponent)
+        posted_at = transaction.date
+        if posted_at.tzinfo is None:
+            posted_at = posted_at.replace(tzinfo=UTC)
+        entries.append(
+            JournalEntryCreate.model_construct(
+                posted_at=posted_at,
+                category=transaction.type,
+                description=transaction.description,
+                postings=[
+                    PostingCreate.model_construct(
+                        account_id=account_id, amount_minor=amount_minor
+                    ),
+                    PostingCreate.model_construct(
+                        account_id=suspense_id, amount_minor=-amount_minor
+                    ),
+                ],
+            )
+        )
+    return entries
+
+
+def chunked(rows: Iterator[dict], size: int) -> Iterator[list[dict]]:
+    """Split an iterator into lists of at most ``size`` items."""
+    while chunk := list(islice(rows, size)):
+        yield chunk
+
+
+@dataclass(slots=True)
+class ImportRun:
+    """Throughput of one run of an import job."""
+
+    rows: int = 0
+    elapsed: float = 0.0
+
+    @property
+    def rows_per_second(self) -> float:
+        """Rows written per second during this run."""
+        return self.rows / self.elapsed if self.elapsed else 0.0
+
+
+def _job_response(job: ImportJob, run: ImportRun | None) -> ImportJobResponse:
+    """Build the API view of a job."""
+    response = ImportJobResponse.model_validate(job)
+    if run is not None:
+        response.rows_per_second = round(run.rows_per_second, 1)
+    return response
+
+
+def get_import_job(db: Session, job_id: int, user_id: str) -> ImportJobResponse:
+    """
+    Get the status of one of the user's import jobs.
+
+    Args:
+        db: Database session
+        job_id: The import job
+        user_id: The ID of the user
+
+    Returns:
+        The job status
+
+    Raises:
+        ImportJobNotFoundError: If the job does not exist or is not the user's
+    """
+    job = db.scalars(
+        select(ImportJob).where(ImportJob.id == job_id, ImportJob.user_id == user_id)
+    ).first()
+    if job is None:
+        raise ImportJobNotFoundError(f"Import job {job_id} not found")
+    return _job_response(job, None)
+
+
+def import_statement(
+    db: Session,
+    user_id: str,
+    account_id: int,
+    path: str,
+    filename: str | None = None,
+    statement_format: str | None = None,
+    chunk_size: int | None = None,
+    resume_job_id: int | None = None,
+) -> ImportJobResponse:
+    """
+    Import a statement file into one of the user's accounts.
+
+    A job for the same user, account and file content is resumed after its
+    last committed row, or returned unchanged if it already completed.
+    With ``resume_job_id`` that job is resumed even if the file changed,
+    e.g. after fixing the row that made it fail.
+
+    Args:
+        db: Database session (committed once per chunk)
+        user_id: The ID of the user
+        account_id: The account the statement belongs to
+        path: Path of the statement file
+        filename: Name to record for the file (defaults to the path's name)
+        statement_format: "csv" or "ofx" (inferred from the file name if omitted)
+        chunk_size: Rows per transaction (defaults to IMPORT_CHUNK_SIZE)
+        resume_job_id: Resume this job instead of matching by content
+
+    Returns:
+        The job status, with the throughput of this run
+
+    Raises:
+        AccountNotFoundError: If the account is not the user's
+        ImportConflictError: If another run of the job committed first
+        ImportJobNotFoundError: If the job to resume is not the user's
+        ImportFormatError: If the format is unsupported
+        LedgerReadOnlyError: If the database is in read-only mode
+    """
+    filename = filename or Path(path).name
+    statement_format = statement_format or detect_format(filename)
+    if statement_format not in PARSERS:
+        raise ImportFormatError(f"Unsupported statement format: {statement_format}")
+    chunk_size = chunk_size or settings.IMPORT_CHUNK_SIZE
+    if settings.DATABASE_READ_ONLY:
+        raise LedgerReadOnlyError("Imports require DATABASE_READ_ONLY=false")
+
+    currency = db.scalar(
+        select(Account.currency).where(
+            Account.id == account_id, Account.user_id == user_id
+        )
+    )
+    if currency is None:
+        raise AccountNotFoundError(f"Account {account_id} not found")
+
+    digest = file_sha256(path)
+    job_filter = (
+        ImportJob.id == resume_job_id
+        if resume_job_id is not None
+        else ImportJob.file_sha256 == digest
+    )
+    job = db.scalars(
+        select(ImportJob)
+        .where(
+            ImportJob.user_id == user_id,
+            ImportJob.account_id == account_id,
+            job_filter,
+        )
+        .order_by(ImportJob.id.desc())
+    ).first()
+
+    now = int(time.time())
+    if job is None:
+        if resume_job_id is not None:
+            raise ImportJobNotFoundError(f"Import job {resume_job_id} not found")
+        job = ImportJob(
+            user_id=user_id,
+            account_id=account_id,
+            filename=filename,
+            file_sha256=digest,
+            format=statement_format,
+            status=ImportStatus.RUNNING,
+            rows_committed=0,
+            entries_created=0,
+            created_at=now,
+            updated_at=now,
+        )
+        db.add(job)
+    elif job.status == ImportStatus.COMPLETED and resume_job_id is None:
+        logger.info(f"Statement {filename} was already imported by job {job.id}")
+        return _job_response(job, None)
+    else:
+        job.status = ImportStatus.RUNNING
+        job.file_sha256 = digest
+        job.error = None
+        job.updated_at = now
+    suspense_id = get_suspense_account(db, user_id, currency)
+    db.commit()
+
+    run = _run_job(db, job, path, suspense_id, currency, chunk_size)
+    return _job_response(job, run)
+
+
+def _run_job(
+    db: Session,
+    job: ImportJob,
+    path: str,
+    suspense_id: int,
+    currency: str,
+    chunk_size: int,
+) -> ImportRun:
+    """
+    Stream the file into the ledger from the job's committed position.
+
+    A malformed file marks the job failed; any other error propagates with
+    the job row untouched.
+    """
+    run = ImportRun()
+    exponent = currency_exponent(currency)
+    started = time.perf_counter()
+    rows = PARSERS[job.format](path)
+    position = job.rows_committed
+
+    try:
+        # Rows committed by an earlier run are parsed but not written again
+        for _ in islice(rows, position):
+            pass
+
+        for chunk in chunked(rows, chunk_size):
+            transactions = validate_chunk(chunk, position, currency)
+            entry_ids = post_entries(
+                db, to_entries(transactions, job.account_id, suspense_id, exponent)
+            )
+            # Guarded on the old position so two runs of one job cannot both
+            # commit the same chunk
+            advanced = db.execute(
+                update(ImportJob)
+                .where(ImportJob.id == job.id, ImportJob.rows_committed == position)
+                .values(
+                    rows_committed=position + len(chunk),
+                    entries_created=ImportJob.entries_created + len(entry_ids),
+                    updated_at=int(time.time()),
+                )
+            ).rowcount
+            if not advanced:
+                db.rollback()
+                raise ImportConflictError(f"Import job {job.id} is running elsewhere")
+            db.commit()
+
+            position += len(chunk)
+            run.rows += len(chunk)
+            run.elapsed = time.perf_counter() - started
+            logger.info(
+                f"Import job {job.id}: {position} rows committed "
+                f"({run.rows_per_second:.0f} rows/s)"
+            )
+    except (ImportFormatError, csv.Error, ValueError) as e:
+        # Only a bad file fails the job; a conflicting run or a database
+        # error leaves the job row to the run that holds it
+        db.rollback()
+        db.execute(
+            update(ImportJob)
+            .where(ImportJob.id == job.id)
+            .values(
+                status=ImportStatus.FAILED, error=str(e), updated_at=int(time.time())
+            )
+        )
+        db.commit()
+        db.refresh(job)
+        run.elapsed = time.perf_counter() - started
+        logger.error(f"Import job {job.id} failed after row {position}: {e}")
+        return run
+
+    db.execute(
+        update(ImportJob)
+        .where(ImportJob.id == job.id)
+        .values(status=ImportStatus.COMPLETED, updated_at=int(time.time()))
+    )
+    db.commit()
+    db.refresh(job)
+    run.elapsed = time.perf_counter() - started
+    logger.info(
+        f"Import job {job.id} completed: {run.rows} rows in {run.elapsed:.2f}s "
+        f"({run.rows_per_second:.0f} rows/s)"
+    )
+    return run
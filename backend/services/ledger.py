@@ -0,0 +1,412 @@
+"""
+Ledger service.
+
+This module appends balanced journal entries, keeping the balance
+checkpoints in step, and answers the balance and recent-activity queries
+that the dashboard is built on. All amounts are integers in minor units
+of their account's currency.
+"""
+import heapq
+import logging
+import time
+from collections.abc import Mapping, Sequence
+from itertools import islice
+
+from core.config import settings
+from core.events import BALANCE, POSTING, Event, event_bus, publish_on_commit
+from core.exceptions import (
+    AccountNotFoundError,
+    LedgerReadOnlyError,
+    UnbalancedEntryError,
+)
+from db.models.ledger import Account, JournalEntry, Posting
+from schemas.ledger import JournalEntryCreate
+from services.blocks import seal_blocks
+from services.chain import advance_chain_head, entry_payload, lock_chain_head
+from services.checkpoints import (
+    get_balances_as_of,
+    to_timestamp,
+    update_checkpoints,
+)
+from services.dashboard_cache import invalidate_on_commit
+from services.signing import sign_entry_hashes
+from sqlalchemy import Row, insert, select, tuple_
+from sqlalchemy.orm import Session
+from utils.crypto import chain_hash
+
+# Configure logger
+logger = logging.getLogger(__name__)
+
+
+def post_entries(db: Session, entries: Sequence[JournalEntryCreate]) -> list[int]:
+    """
+    Append balanced journal entries in bulk.
+
+    Entries and postings are each written with a single multi-row INSERT.
+    Each posting takes the currency of its account, and an entry must
+    balance in every currency it touches.
+    Each entry is linked into the hash chain, whose head row is locked for
+    the rest of the transaction so concurrent appends are serialized, and
+    its hash is signed with the ledger key in the same pass. Every full run
+    of LEDGER_BLOCK_SIZE entries is sealed into a Merkle block. When the
+    transaction commits, the cached dashboards of the accounts' owners are
+    dropped and the new postings and balance changes are pushed to their
+    event streams. The caller owns the transaction and is responsible for
+    committing.
+
+    Args:
+        db: Database session
+        entries: The journal entries to append
+
+    Returns:
+        IDs of the new journal entries, in input order
+
+    Raises:
+        AccountNotFoundError: If a posting's account does not exist
+        LedgerReadOnlyError: If the database is in read-only mode
+        SigningKeyError: If the ledger signing key is unavailable
+        UnbalancedEntryError: If any entry's postings do not sum to zero in
+            each currency
+    """
+    if settings.DATABASE_READ_ONLY:
+        raise LedgerReadOnlyError("Ledger writes require DATABASE_READ_ONLY=false")
+
+    if not entries:
+        return []
+
+    owners = {}
+    currencies = {}
+    account_ids = {
+        posting.account_id for entry in entries for posting in entry.postings
+    }
+    for account_id, user_id, currency in db.execute(
+        select(Account.id, Account.user_id, Account.currency).where(
+            Account.id.in_(account_ids)
+        )
+    ):
+        owners[account_id] = user_id
+        currencies[account_id] = currency
+    missing = account_ids - owners.keys()
+    if missing:
+        raise AccountNotFoundError(f"Account {min(missing)} not found")
+
+    for entry in entries:
+        totals: dict[str, int] = {}
+        for posting in entry.postings:
+            currency = currencies[posting.account_id]
+            totals[currency] = totals.get(currency, 0) + posting.amount_minor
+        unbalanced = {currency: total for currency, total in totals.items() if total}
+        if unbalanced or len(entry.postings) < 2:
+            by = ", ".join(f"{total} {cur}" for cur, total in unbalanced.items())
+            raise UnbalancedEntryError(
+                f"Entry '{entry.description}' is unbalanced by {by or 0}"
+            )
+
+    now = int(time.time())
+    posted_at = [to_timestamp(entry.posted_at) for entry in entries]
+
+    prev_hashes = []
+    entry_hashes = []
+    running = lock_chain_head(db)
+    for i, entry in enumerate(entries):
+        payload = entry_payload(
+            posted_at[i],
+            entry.category,
+            entry.description,
+            [
+                (
+                    posting.account_id,
+                    posting.amount_minor,
+                    currencies[posting.account_id],
+                )
+                for posting in entry.postings
+            ],
+        )
+        prev_hashes.append(running)
+        running = chain_hash(running, payload)
+        entry_hashes.append(running)
+    signing_key_id, signatures = sign_entry_hashes(entry_hashes)
+
+    entry_ids = db.scalars(
+        insert(JournalEntry).returning(
+            JournalEntry.id, sort_by_parameter_order=True
+        ),
+        [
+            {
+                "posted_at": posted_at[i],
+                "category": entry.category,
+                "description": entry.description,
+                "prev_hash": prev_hashes[i],
+                "entry_hash": entry_hashes[i],
+                "signature": signatures[i],
+                "signing_key_id": signing_key_id,
+                "created_at": now,
+            }
+            for i, entry in enumerate(entries)
+        ],
+    ).all()
+
+    posting_rows = [
+        {
+            "entry_id": entry_id,
+            "account_id": posting.account_id,
+            "amount_minor": posting.amount_minor,
+            "currency": currencies[posting.account_id],
+            "posted_at": posted_at[i],
+        }
+        for i, (entry_id, entry) in enumerate(zip(entry_ids, entries, strict=True))
+        for posting in entry.postings
+    ]
+    db.execute(insert(Posting), posting_rows)
+    advance_chain_head(db, entry_ids, entry_hashes)
+    seal_blocks(db)
+
+    update_checkpoints(
+        db,
+        (
+            (row["account_id"], row["posted_at"], row["amount_minor"])
+            for row in posting_rows
+        ),
+    )
+
+    invalidate_on_commit(db, set(owners.values()))
+    publish_on_commit(db, _ledger_events(entries, entry_ids, posting_rows, owners))
+
+    logger.debug(f"Posted {len(entry_ids)} journal entries")
+    return list(entry_ids)
+
+
+def _ledger_events(
+    entries: Sequence[JournalEntryCreate],
+    entry_ids: Sequence[int],
+    posting_rows: list[dict],
+    owners: dict[int, str],
+) -> list[tuple[str, Event]]:
+    """
+    Build the stream events of appended entries for their connected owners.
+
+    Each owner gets a posting event per entry, with only the postings on
+    their own accounts, and one balance event with the net change of each
+    of their accounts.
+
+    Args:
+        entries: The appended entries
+        entry_ids: Their new IDs, in the same order
+        posting_rows: The inserted posting rows
+        owners: Owning user ID by account ID
+
+    Returns:
+        Tuples of (user ID, event)
+    """
+    listening = {
+        user_id
+        for user_id in set(owners.values())
+        if event_bus.has_subscribers(user_id)
+    }
+    if not listening:
+        return []
+
+    postings_by_entry: dict[int, list[dict]] = {}
+    balance_changes: dict[str, dict[int, int]] = {}
+    for row in posting_rows:
+        user_id = owners[row["account_id"]]
+        if user_id not in listening:
+            continue
+        postings_by_entry.setdefault(row["entry_id"], []).append(row)
+        changes = balance_changes.setdefault(user_id, {})
+        changes[row["account_id"]] = (
+            changes.get(row["account_id"], 0) + row["amount_minor"]
+        )
+
+    events = []
+    for entry_id, entry in zip(entry_ids, entries, strict=True):
+        rows = postings_by_entry.get(entry_id, ())
+        for user_id in {owners[row["account_id"]] for row in rows}:
+            events.append(
+                (
+                    user_id,
+                    Event(
+                        POSTING,
+                        {
+                            "entry_id": entry_id,
+                            "posted_at": entry.posted_at,
+                            "category": entry.category,
+                            "description": entry.description,
+                            "postings": [
+                                {
+                                    "account_id": row["account_id"],
+                                    "amount_minor": row["amount_minor"],
+                                    "currency": row["currency"],
+                                }
+                                for row in rows
+                                if owners[row["account_id"]] == user_id
+                            ],
+                        },
+                    ),
+                )
+            )
+    for user_id, changes in balance_changes.items():
+        events.append(
+            (
+                user_id,
+                Event(
+                    BALANCE,
+                    {
+                        "changes": [
+                            {"account_id": account_id, "delta_minor": delta}
+                            for account_id, delta in changes.items()
+                        ]
+                    },
+                ),
+            )
+        )
+    return events
+
+
+def post_entry(db: Session, entry: JournalEntryCreate) -> int:
+    """
+    Append a single balanced journal entry.
+
+    Args:
+        db: Database session
+        entry: The journal entry to append
+
+    Returns:
+        ID of the new journal entry
+    """
+    return post_entries(db, [entry])[0]
+
+
+def get_user_accounts(
+    db: Session, user_id: str, types: Sequence[str] | None = None
+) -> list[Account]:
+    """
+    Get a user's accounts, optionally restricted to some account types.
+
+    Args:
+        db: Database session
+        user_id: The ID of the user
+        types: Account types to include, or None for all
+
+    Returns:
+        The matching accounts ordered by ID
+    """
+    stmt = select(Account).where(Account.user_id == user_id).order_by(Account.id)
+    if types is not None:
+        stmt = stmt.where(Account.type.in_(types))
+    return list(db.scalars(stmt))
+
+
+def get_account_balances(
+    db: Session, account_ids: Sequence[int], as_of: int | None = None
+) -> dict[int, int]:
+    """
+    Get account balances from the balance checkpoints.
+
+    Args:
+        db: Database session
+        account_ids: Accounts to compute balances for
+        as_of: Point in time in seconds since epoch, or None for now
+
+    Returns:
+        Balance in minor units per account ID (0 for accounts without postings)
+    """
+    if as_of is None:
+        as_of = int(time.time())
+    return get_balances_as_of(db, account_ids, as_of)
+
+
+def get_recent_postings(
+    db: Session, account_ids: Sequence[int], limit: int
+) -> list[Row]:
+    """
+    Get the most recent postings across a set of accounts.
+
+    Args:
+        db: Database session
+        account_ids: Accounts to include
+        limit: Maximum number of postings to return
+
+    Returns:
+        Rows of (id, entry_id, posted_at, amount_minor, currency, category,
+        description), newest first
+    """
+    return get_postings_page(db, account_ids, limit)
+
+
+def get_postings_page(
+    db: Session,
+    account_ids: Sequence[int],
+    limit: int,
+    before: tuple[int, int] | None = None,
+    posted_from: int | None = None,
+    posted_until: int | None = None,
+    category: str | None = None,
+    amount_bounds: Mapping[int, tuple[int | None, int | None]] | None = None,
+) -> list[Row]:
+    """
+    Get one page of postings across a set of accounts, newest first.
+
+    Each account is read with its own scan of the (account_id, posted_at)
+    index, starting at the ``before`` key and stopping after ``limit``
+    matching rows, and the results are merged. A page therefore costs the
+    same however deep into the history it starts. A single ``IN`` query
+    would have to sort every matching posting.
+
+    Args:
+        db: Database session
+        account_ids: Accounts to include
+        limit: Maximum number of postings to return
+        before: Only postings strictly older than this (posted_at, id) key
+        posted_from: Only postings at or after this time (seconds since epoch)
+        posted_until: Only postings before this time (seconds since epoch)
+        category: Only postings of entries with this category
+        amount_bounds: Per account ID, the (minimum, maximum) amount in minor
+            units of the account's currency; None leaves a side open
+
+    Returns:
+        Rows of (id, entry_id, posted_at, amount_minor, currency, category,
+        description), newest first
+    """
+    filters = []
+    if before is not None:
+        filters.append(tuple_(Posting.posted_at, Posting.id) < before)
+    if posted_from is not None:
+        filters.append(Posting.posted_at >= posted_from)
+    if posted_until is not None:
+        filters.append(Posting.posted_at < posted_until)
+    if category is not None:
+        filters.append(JournalEntry.category == category)
+
+    per_account = []
+    for account_id in account_ids:
+        # Amounts are bounded per account, since accounts differ in currency
+        amount_filters = []
+        low, high = (amount_bounds or {}).get(account_id, (None, None))
+        if low is not None:
+            amount_filters.append(Posting.amount_minor >= low)
+        if high is not None:
+            amount_filters.append(Posting.amount_minor <= high)
+
+        per_account.append(
+            db.execute(
+                select(
+                    Posting.id,
+                    Posting.entry_id,
+                    Posting.posted_at,
+                    Posting.amount_minor,
+                    Posting.currency,
+                    JournalEntry.category,
+                    JournalEntry.description,
+                )
+                .join(JournalEntry, JournalEntry.id == Posting.entry_id)
+                .where(Posting.account_id == account_id, *filters, *amount_filters)
+                .order_by(Posting.posted_at.desc(), Posting.id.desc())
+                .limit(limit)
+            ).all()
+        )
+
+    merged = heapq.merge(
+        *per_account, key=lambda row: (row.posted_at, row.id), reverse=True
+    )
+    return list(islice(merged, limit))
@@ -0,0 +1,444 @@
+"""
+Financial reporting service.
+
+This module builds the trial balance, income statement, balance sheet and
+monthly cash flow of a user's ledger for a period. The period's movements
+are loaded into NumPy columns of account, time and amount: full days come
+from the daily balance checkpoints and only a partial first or last day
+from the postings, so the rows loaded are bounded by accounts times days
+however many postings an account has. One grouped reduction turns the
+columns into an account-by-month matrix of net changes, from which every
+statement is derived together with the opening balances.
+
+Statements are in the reporting currency. Movements are converted in one
+batch at the rate in effect when they were posted (full days at the rate of
+the day's start) and opening balances at the rate at the start of the
+period. Every entry balances in each currency at one point in time, so the
+converted statements still balance.
+
+Reports are cached per user and period together with the ledger version,
+the ID of the last journal entry, and the version of the FX rates. The
+ledger is append-only, so a report is current for as long as no entry was
+added and no rate changed.
+"""
+import itertools
+import logging
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Sequence
+from datetime import UTC, datetime
+from typing import Any
+
+import numpy as np
+from core.config import settings
+from core.exceptions import InvalidPeriodError
+from db.models.ledger import (
+    Account,
+    AccountType,
+    BalanceCheckpoint,
+    JournalEntry,
+    Posting,
+)
+from services.checkpoints import (
+    DAY,
+    SECONDS_PER_DAY,
+    day_start,
+    get_balances_as_of,
+    month_start,
+    to_timestamp,
+)
+from services.fx import fx_rates
+from services.ledger import get_user_accounts
+from sqlalchemy import Select, func, select
+from sqlalchemy.orm import Session
+from utils.money import currency_exponent, from_minor
+
+# Configure logger
+logger = logging.getLogger(__name__)
+
+# Key of a cached report: user ID, period start and end, ledger and FX versions
+ReportKey = tuple[str, int, int, int, int]
+
+
+def month_starts(start: int, end: int) -> list[int]:
+    """
+    List the starts of the UTC months overlapping a period.
+
+    Args:
+        start: Start of the period in seconds since epoch
+        end: End of the period in seconds since epoch (exclusive)
+
+    Returns:
+        Month starts in ascending order; the first may precede ``start``
+    """
+    months = []
+    month = month_start(start)
+    while month < end:
+        months.append(month)
+        # Any day of the following month
+        month = month_start(month + 32 * SECONDS_PER_DAY)
+    return months
+
+
+def _movement_queries(
+    account_ids: Sequence[int], start: int, end: int
+) -> list[Select]:
+    """Build the queries returning (account_id, time, amount) for a period."""
+    first_full_day = day_start(start + SECONDS_PER_DAY - 1)
+    last_full_day = day_start(end)
+    if first_full_day >= last_full_day:
+        # No full day in the period
+        edges = [(start, end)]
+        queries = []
+    else:
+        edges = [(start, first_full_day), (last_full_day, end)]
+        queries = [
+            select(
+                BalanceCheckpoint.account_id,
+                BalanceCheckpoint.period_start,
+                BalanceCheckpoint.delta_minor,
+            ).where(
+                BalanceCheckpoint.account_id.in_(account_ids),
+                BalanceCheckpoint.granularity == DAY,
+                BalanceCheckpoint.period_start >= first_full_day,
+                BalanceCheckpoint.period_start < last_full_day,
+            )
+        ]
+
+    for low, high in edges:
+        if low < high:
+            queries.append(
+                select(
+                    Posting.account_id, Posting.posted_at, Posting.amount_minor
+                ).where(
+                    Posting.account_id.in_(account_ids),
+                    Posting.posted_at >= low,
+                    Posting.posted_at < high,
+                )
+            )
+    return queries
+
+
+def load_movements(
+    db: Session, account_ids: Sequence[int], start: int, end: int
+) -> np.ndarray:
+    """
+    Load the movements of accounts within a period as columns.
+
+    Args:
+        db: Database session
+        account_ids: Accounts to load
+        start: Start of the period in seconds since epoch
+        end: End of the period in seconds since epoch (exclusive)
+
+    Returns:
+        An int64 array of shape (3, n) holding the account IDs, the times
+        (posting times, or day starts for checkpoint rows) and the amounts
+        in minor units
+    """
+    if not account_ids:
+        return np.zeros((3, 0), dtype=np.int64)
+
+    values = itertools.chain.from_iterable(
+        itertools.chain.from_iterable(
+            db.execute(query) for query in _movement_queries(account_ids, start, end)
+        )
+    )
+    return np.fromiter(values, dtype=np.int64).reshape(-1, 3).T
+
+
+def monthly_movements(
+    account_ids: Sequence[int],
+    currencies: np.ndarray,
+    months: Sequence[int],
+    movements: np.ndarray,
+    target: str,
+) -> np.ndarray:
+    """
+    Sum movements per account and month in one currency.
+
+    Args:
+        account_ids: Accounts in ascending order, the rows of the result
+        currencies: ISO 4217 code of each account, in the same order
+        months: Month starts in ascending order, the columns of the result
+        movements: Columns as returned by load_movements
+        target: Currency to convert the movements into
+
+    Returns:
+        A float64 matrix of net changes in minor units of ``target``
+
+    Raises:
+        FxRateNotFoundError: If a movement's currency has no rate at its time
+    """
+    account_col, time_col, amount_col = movements
+    rows = np.searchsorted(np.asarray(account_ids, dtype=np.int64), account_col)
+    columns = np.searchsorted(np.asarray(months, dtype=np.int64), time_col, "right") - 1
+    amounts = fx_rates.convert(amount_col, currencies[rows], time_col, target)
+    # Grouped sum over the flattened (account, month) cells
+    cells = np.bincount(
+        rows * len(months) + columns,
+        weights=amounts,
+        minlength=len(account_ids) * len(months),
+    )
+    return cells.reshape(len(account_ids), len(months))
+
+
+def _amount(amount_minor: float, exponent: int) -> float:
+    """Round a converted amount in minor units to a presented amount."""
+    return from_minor(round(amount_minor), exponent)
+
+
+def _line(account: Account, amount_minor: float, exponent: int) -> dict[str, Any]:
+    """Build a statement line for an account."""
+    return {
+        "account_id": account.id,
+        "account_name": account.name,
+        "amount": _amount(amount_minor, exponent),
+    }
+
+
+def build_financial_report(
+    db: Session, user_id: str, start: int, end: int, version: int
+) -> dict[str, Any]:
+    """
+    Build a user's financial statements for a period.
+
+    Balances carry the ledger's signs (debits positive, credits negative);
+    the statements present credit-normal accounts (liabilities, equity and
+    income) as positive amounts. Retained earnings are the income minus
+    expenses of all time up to the end of the period, which balances the
+    balance sheet without closing entries. Amounts are converted into
+    REPORTING_CURRENCY and rounded only when presented.
+
+    Args:
+        db: Database session
+        user_id: The ID of the user
+        start: Start of the period in seconds since epoch
+        end: End of the period in seconds since epoch (exclusive)
+        version: The ledger version the data is read at
+
+    Returns:
+        The report, shaped like FinancialReport
+
+    Raises:
+        FxRateNotFoundError: If an account's currency has no rate when needed
+    """
+    currency = settings.REPORTING_CURRENCY
+    exponent = currency_exponent(currency)
+    accounts = get_user_accounts(db, user_id)
+    account_ids = [account.id for account in accounts]
+    currencies = np.array([account.currency for account in accounts], dtype="U3")
+    months = month_starts(start, end)
+
+    opening_balances = get_balances_as_of(db, account_ids, start)
+    opening = fx_rates.convert(
+        [opening_balances[account_id] for account_id in account_ids],
+        currencies,
+        start,
+        currency,
+    )
+    movements = load_movements(db, account_ids, start, end)
+    matrix = monthly_movements(account_ids, currencies, months, movements, currency)
+    change = matrix.sum(axis=1)
+    closing = opening + change
+
+    types = np.array([account.type for account in accounts], dtype=object)
+    asset = types == AccountType.ASSET
+    liability = types == AccountType.LIABILITY
+    equity = types == AccountType.EQUITY
+    income = types == AccountType.INCOME
+    expense = types == AccountType.EXPENSE
+
+    def lines(mask: np.ndarray, amounts: np.ndarray) -> list[dict[str, Any]]:
+        return [
+            _line(accounts[i], amounts[i], exponent) for i in np.flatnonzero(mask)
+        ]
+
+    def amount(amount_minor: float) -> float:
+        return _amount(amount_minor, exponent)
+
+    debit = np.maximum(closing, 0)
+    credit = np.maximum(-closing, 0)
+    trial_balance = {
+        "lines": [
+            {
+                "account_id": account.id,
+                "account_name": account.name,
+                "account_type": account.type,
+                "account_currency": account.currency,
+                "opening": amount(opening[i]),
+                "change": amount(change[i]),
+                "closing": amount(closing[i]),
+                "debit": amount(debit[i]),
+                "credit": amount(credit[i]),
+            }
+            for i, account in enumerate(accounts)
+        ],
+        "total_debit": amount(debit.sum()),
+        "total_credit": amount(credit.sum()),
+    }
+
+    total_income = -change[income].sum()
+    total_expenses = change[expense].sum()
+    income_statement = {
+        "income": lines(income, -change),
+        "expenses": lines(expense, change),
+        "total_income": amount(total_income),
+        "total_expenses": amount(total_expenses),
+        "net_income": amount(total_income - total_expenses),
+    }
+
+    retained_earnings = -closing[income | expense].sum()
+    total_equity = -closing[equity].sum() + retained_earnings
+    balance_sheet = {
+        "assets": lines(asset, closing),
+        "liabilities": lines(liability, -closing),
+        "equity": lines(equity, -closing),
+        "retained_earnings": amount(retained_earnings),
+        "total_assets": amount(closing[asset].sum()),
+        "total_liabilities": amount(-closing[liability].sum()),
+        "total_equity": amount(total_equity),
+    }
+
+    monthly_income = -matrix[income].sum(axis=0)
+    monthly_expenses = matrix[expense].sum(axis=0)
+    monthly_cash = matrix[asset].sum(axis=0)
+    closing_cash = opening[asset].sum() + np.cumsum(monthly_cash)
+    cash_flow = [
+        {
+            "month": datetime.fromtimestamp(max(month, start), UTC),
+            "income": amount(monthly_income[j]),
+            "expenses": amount(monthly_expenses[j]),
+            "net_income": amount(monthly_income[j] - monthly_expenses[j]),
+            "net_cash_flow": amount(monthly_cash[j]),
+            "closing_cash": amount(closing_cash[j]),
+        }
+        for j, month in enumerate(months)
+    ]
+
+    logger.debug(
+        f"Built report for user {user_id} from {movements.shape[1]} movement rows"
+    )
+    return {
+        "start": datetime.fromtimestamp(start, UTC),
+        "end": datetime.fromtimestamp(end, UTC),
+        "currency": currency,
+        "ledger_version": version,
+        "trial_balance": trial_balance,
+        "income_statement": income_statement,
+        "balance_sheet": balance_sheet,
+        "cash_flow": cash_flow,
+    }
+
+
+class ReportCache:
+    """Thread-safe LRU cache of built reports keyed by ledger version."""
+
+    def __init__(self, max_size: int) -> None:
+        """
+        Create an empty cache.
+
+        Args:
+            max_size: Maximum number of reports to hold
+        """
+        self.max_size = max_size
+        self._entries: OrderedDict[ReportKey, dict[str, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: ReportKey) -> dict[str, Any] | None:
+        """Look up a report, marking it as recently used."""
+        with self._lock:
+            report = self._entries.get(key)
+            if report is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return report
+
+    def put(self, key: ReportKey, report: dict[str, Any]) -> None:
+        """Store a report, evicting the least recently used beyond max_size."""
+        if self.max_size <= 0:
+            return
+        with self._lock:
+            self._entries[key] = report
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Drop all entries and reset the counters."""
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = 0
+
+    def stats(self) -> dict[str, Any]:
+        """
+        Report cache size and hit/miss counters.
+
+        Returns:
+            Dictionary with cache statistics
+        """
+        with self._lock:
+            return {
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+
+
+def get_ledger_version(db: Session) -> int:
+    """Return the ID of the last journal entry, 0 for an empty ledger."""
+    return db.scalar(select(func.max(JournalEntry.id))) or 0
+
+
+def get_financial_report(
+    db: Session,
+    user_id: str,
+    start: datetime | None = None,
+    end: datetime | None = None,
+) -> dict[str, Any]:
+    """
+    Get a user's financial statements for a period, from the cache if current.
+
+    Args:
+        db: Database session
+        user_id: The ID of the user
+        start: Start of the period (UTC if naive), or None for the start of
+            the current year
+        end: End of the period (exclusive, UTC if naive), or None for the end
+            of today
+
+    Returns:
+        The report, shaped like FinancialReport
+
+    Raises:
+        FxRateNotFoundError: If an account's currency has no rate when needed
+        InvalidPeriodError: If the period does not end after it starts
+    """
+    now = int(time.time())
+    start_ts = to_timestamp(
+        start or datetime(datetime.now(UTC).year, 1, 1, tzinfo=UTC)
+    )
+    # The end of today rather than now, so repeated requests share a cache key
+    end_ts = to_timestamp(end) if end else day_start(now) + SECONDS_PER_DAY
+    if end_ts <= start_ts:
+        raise InvalidPeriodError("The period must end after it starts")
+
+    # Read in the same transaction as the report, so both see one snapshot
+    version = get_ledger_version(db)
+    fx_rates.refresh(db)
+    key = (user_id, start_ts, end_ts, version, fx_rates.version)
+    report = report_cache.get(key)
+    if report is None:
+        report = build_financial_report(db, user_id, start_ts, end_ts, version)
+        report_cache.put(key, report)
+    return report
+
+
+# Create global report cache instance for simple imports
+report_cache = ReportCache(settings.REPORT_CACHE_MAX_SIZE)
@@ -0,0 +1,120 @@
+"""
+Expired session sweeper.
+
+Sessions are created by the frontend and never deleted once they expire, so
+without a sweep the session table only grows. The sweeper runs as a task on
+the API's event loop and periodically deletes expired sessions from a
+worker thread, in bounded batches that each commit on their own: a sweep of
+a large backlog never holds the SQLite write lock for long, and the
+frontend's logins get to write between batches. Every worker of serve.py
+runs its own sweeper; concurrent sweeps simply find less to delete.
+"""
+import asyncio
+import logging
+import time
+
+from db.models.user import Session as DbSession
+from sqlalchemy import delete, select
+from sqlalchemy.engine import Engine
+
+# Configure logger
+logger = logging.getLogger(__name__)
+
+# Seconds to pause between batches, so other writers can take the lock
+BATCH_PAUSE = 0.01
+
+
+def sweep_expired_sessions(
+    sync_engine: Engine, batch_size: int, now: int | None = None
+) -> int:
+    """
+    Delete all sessions that expired, one bounded batch per transaction.
+
+    Args:
+        sync_engine: Engine of the database holding the session table
+        batch_size: Maximum sessions deleted per transaction
+        now: Seconds since epoch at which sessions count as expired
+            (default: the current time)
+
+    Returns:
+        Number of sessions deleted
+    """
+    now = int(time.time()) if now is None else now
+    # Uses the expires_at index to find a batch, then the primary key to
+    # delete it; LIMIT on DELETE itself is not portable
+    statement = delete(DbSession).where(
+        DbSession.id.in_(
+            select(DbSession.id)
+            .where(DbSession.expires_at <= now)
+            .limit(batch_size)
+            .scalar_subquery()
+        )
+    )
+
+    deleted = 0
+    while True:
+        with sync_engine.begin() as conn:
+            count = conn.execute(statement).rowcount
+        deleted += count
+        if count < batch_size:
+            return deleted
+        time.sleep(BATCH_PAUSE)
+
+
+class SessionSweeper:
+    """Deletes expired sessions in the background."""
+
+    def __init__(self, sync_engine: Engine, interval: float, batch_size: int) -> None:
+        """
+        Create a sweeper.
+
+        Args:
+            sync_engine: Engine of the database holding the session table
+            interval: Seconds between sweeps
+            batch_size: Maximum sessions deleted per transaction
+        """
+        self.engine = sync_engine
+        self.interval = interval
+        self.batch_size = batch_size
+        self._task: asyncio.Task | None = None
+
+        # Counters reported by stats()
+        self.sweeps = 0
+        self.deleted = 0
+
+    async def start(self) -> None:
+        """Start sweeping, beginning with one sweep right away."""
+        self._task = asyncio.create_task(self._sweep_loop())
+        logger.info(f"Session sweeper started (every {self.interval:g}s)")
+
+    async def stop(self) -> None:
+        """Stop sweeping; a batch in progress still commits in its thread."""
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        logger.info("Session sweeper stopped")
+
+    async def sweep(self) -> int:
+        """Run one sweep without blocking the event loop."""
+        deleted = await asyncio.to_thread(
+            sweep_expired_sessions, self.engine, self.batch_size
+        )
+        self.sweeps += 1
+        self.deleted += deleted
+        if deleted:
+            logger.info(f"Deleted {deleted} expired session(s)")
+        return deleted
+
+    async def _sweep_loop(self) -> None:
+        """Sweep every interval, logging failures rather than stopping."""
+        while True:
+            try:
+                await self.sweep()
+            except Exception as e:
+                logger.error(f"Sweeping expired sessions failed: {e}")
+            await asyncio.sleep(self.interval)
+
+    def stats(self) -> dict:
+        """Sweeps run and sessions deleted by this process."""
+        return {"sweeps": self.sweeps, "deleted": self.deleted}
@@ -0,0 +1,207 @@
+"""
+Journal entry signing service.
+
+Every journal entry's chain hash is signed with the ledger's Ed25519 key
+when it is appended, so entries can be attributed to this ledger and not
+only checked for internal consistency. Signing happens in bulk on the
+append path. Auditing verifies signatures in batches spread over a process
+pool, because Ed25519 verification is CPU-bound.
+"""
+import logging
+import os
+import time
+from collections.abc import Sequence
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import dataclass, field
+from functools import lru_cache
+
+from core.config import settings
+from core.exceptions import SigningKeyError
+from cryptography.hazmat.primitives.asymmetric.ed25519 import (
+    Ed25519PrivateKey,
+    Ed25519PublicKey,
+)
+from db.database import SessionLocal
+from db.models.ledger import JournalEntry
+from sqlalchemy import select
+from utils.crypto import (
+    key_id,
+    load_signing_key,
+    load_verify_key,
+    public_key_bytes,
+    sign_hashes,
+    verify_signatures,
+)
+
+# Configure logger
+logger = logging.getLogger(__name__)
+
+# Invalid signatures reported before the rest are only counted
+MAX_REPORTED_FAILURES = 100
+
+
+@lru_cache
+def get_signing_key() -> Ed25519PrivateKey:
+    """
+    Load the ledger signing key configured in the settings once.
+
+    Returns:
+        The private key
+
+    Raises:
+        SigningKeyError: If the key file is missing or invalid
+    """
+    path = settings.LEDGER_SIGNING_KEY_PATH
+    try:
+        return load_signing_key(path)
+    except (OSError, ValueError) as e:
+        raise SigningKeyError(
+            f"Cannot load ledger signing key from {path}: {e}. "
+            f"Run 'init_db.py --create-ledger' to generate one."
+        ) from e
+
+
+def get_verify_key() -> Ed25519PublicKey:
+    """
+    Load the public key used to audit signatures.
+
+    Uses LEDGER_VERIFY_KEY_PATH when set, so auditors do not need the
+    private key, and otherwise derives it from the signing key.
+
+    Returns:
+        The public key
+
+    Raises:
+        SigningKeyError: If the key file is missing or invalid
+    """
+    path = settings.LEDGER_VERIFY_KEY_PATH
+    if not path:
+        return get_signing_key().public_key()
+    try:
+        return load_verify_key(path)
+    except (OSError, ValueError) as e:
+        raise SigningKeyError(f"Cannot load ledger verify key from {path}: {e}") from e
+
+
+def sign_entry_hashes(entry_hashes: Sequence[str]) -> tuple[str, list[str]]:
+    """
+    Sign the hashes of entries being appended.
+
+    Args:
+        entry_hashes: Entry hashes in append order
+
+    Returns:
+        Tuple of (signing key ID, signatures in input order)
+
+    Raises:
+        SigningKeyError: If the signing key is unavailable
+    """
+    key = get_signing_key()
+    return key_id(key.public_key()), sign_hashes(key, entry_hashes)
+
+
+@dataclass(slots=True)
+class SignatureReport:
+    """Outcome of verifying the signatures of all entries."""
+
+    entries: int = 0
+    invalid: int = 0
+    unknown_key: int = 0
+    failures: list[int] = field(default_factory=list)
+    elapsed: float = 0.0
+
+    @property
+    def ok(self) -> bool:
+        """Whether every signature verified with the expected key."""
+        return self.invalid == 0 and self.unknown_key == 0
+
+
+def _verify_batch(
+    raw_public_key: bytes, ids: list[int], pairs: list[tuple[str, str]]
+) -> list[int]:
+    """Verify one batch in a worker process and return the failing entry IDs."""
+    return [
+        entry_id
+        for entry_id, valid in zip(
+            ids, verify_signatures(raw_public_key, pairs), strict=True
+        )
+        if not valid
+    ]
+
+
+def verify_all_signatures(
+    workers: int | None = None, batch_size: int = 10_000
+) -> SignatureReport:
+    """
+    Verify the signature of every journal entry across a process pool.
+
+    The parent streams (hash, signature) batches from the database with a
+    keyset scan and keeps at most two batches per worker in flight, so
+    memory stays bounded while every core verifies.
+
+    Args:
+        workers: Worker processes (defaults to the CPU count)
+        batch_size: Entries per batch sent to a worker
+
+    Returns:
+        The signature report
+
+    Raises:
+        SigningKeyError: If the verification key is unavailable
+    """
+    started = time.perf_counter()
+    public_key = get_verify_key()
+    expected_key_id = key_id(public_key)
+    raw_public_key = public_key_bytes(public_key)
+    workers = workers or os.cpu_count() or 1
+
+    report = SignatureReport()
+    pending: list[Future] = []
+
+    def collect(future: Future) -> None:
+        for entry_id in future.result():
+            report.invalid += 1
+            if len(report.failures) < MAX_REPORTED_FAILURES:
+                report.failures.append(entry_id)
+
+    with ProcessPoolExecutor(max_workers=workers) as pool, SessionLocal() as db:
+        last_id = 0
+        while True:
+            rows = db.execute(
+                select(
+                    JournalEntry.id,
+                    JournalEntry.entry_hash,
+                    JournalEntry.signature,
+                    JournalEntry.signing_key_id,
+                )
+                .where(JournalEntry.id > last_id)
+                .order_by(JournalEntry.id)
+                .limit(batch_size)
+            ).all()
+            if not rows:
+                break
+            last_id = rows[-1].id
+            report.entries += len(rows)
+
+            ids, pairs = [], []
+            for row in rows:
+                if row.signing_key_id != expected_key_id:
+                    report.unknown_key += 1
+                    continue
+                ids.append(row.id)
+                pairs.append((row.entry_hash, row.signature))
+
+            if ids:
+                pending.append(pool.submit(_verify_batch, raw_public_key, ids, pairs))
+            while len(pending) >= workers * 2:
+                collect(pending.pop(0))
+
+        for future in pending:
+            collect(future)
+
+    report.elapsed = time.perf_counter() - started
+    logger.info(
+        f"Verified {report.entries} signatures in {report.elapsed:.2f}s: "
+        f"{report.invalid} invalid, {report.unknown_key} from other keys"
+    )
+    return report
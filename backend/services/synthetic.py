@@ -0,0 +1,726 @@
+"""
+Synthetic ledger data generator.
+
+This module fills an empty database with users, sessions and a year or more
+of balanced journal entries that look like household finances: a monthly
+salary, rent and utility bills, card subscriptions paid off every month,
+savings transfers and daily purchases whose amounts are log-normal and whose
+frequency per user follows a Pareto distribution, so a few users hold most
+of the postings. Every account is in the reporting currency. Everything is
+drawn from one seeded generator and the date range, so the same arguments
+always produce the same hashes.
+
+Rows are written in chronological order with explicit IDs through bulk
+INSERTs, one transaction per batch. The hash chain, signatures, Merkle
+blocks, chain checkpoints and balance checkpoints are computed in memory
+as the entries are generated, so the result passes verify_ledger.py like
+data appended through the ledger service, without its per-period checkpoint
+updates that dominate the cost of bulk appends.
+"""
+import hashlib
+import logging
+import random
+import time
+from array import array
+from collections.abc import Callable, Iterator, Sequence
+from concurrent.futures import Executor, ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any
+
+import db.models  # noqa: F401
+from core.config import settings
+from core.exceptions import LedgerError, LedgerReadOnlyError
+from db.database import Base
+from db.models.ledger import (
+    Account,
+    AccountType,
+    BalanceCheckpoint,
+    ChainCheckpoint,
+    ChainHead,
+    JournalEntry,
+    LedgerBlock,
+    Posting,
+)
+from db.models.user import Session as UserSession
+from db.models.user import User
+from services.chain import entry_payload
+from services.checkpoints import DAY, MONTH, SECONDS_PER_DAY, month_start
+from services.signing import get_signing_key
+from sqlalchemy import func, insert, select, text
+from sqlalchemy.engine import Connection, Engine
+from utils.crypto import (
+    GENESIS_HASH,
+    chain_hash,
+    key_id,
+    merkle_leaf,
+    merkle_root,
+    sign_hashes,
+)
+
+# Configure logger
+logger = logging.getLogger(__name__)
+
+# Chart of accounts every synthetic user gets, in account ID order
+CHART = (
+    ("Checking", AccountType.ASSET),
+    ("Savings", AccountType.ASSET),
+    ("Credit card", AccountType.LIABILITY),
+    ("Opening balance", AccountType.EQUITY),
+    ("Salary", AccountType.INCOME),
+    ("Housing", AccountType.EXPENSE),
+    ("Utilities", AccountType.EXPENSE),
+    ("Subscriptions", AccountType.EXPENSE),
+    ("Groceries", AccountType.EXPENSE),
+    ("Dining", AccountType.EXPENSE),
+    ("Transport", AccountType.EXPENSE),
+    ("Shopping", AccountType.EXPENSE),
+)
+(
+    CHECKING,
+    SAVINGS,
+    CARD,
+    OPENING,
+    SALARY,
+    HOUSING,
+    UTILITIES,
+    SUBSCRIPTIONS,
+    GROCERIES,
+    DINING,
+    TRANSPORT,
+    SHOPPING,
+) = range(len(CHART))
+
+# Everyday purchases: (category, expense account, share of purchases,
+# median amount in minor units, log-normal sigma, merchants)
+PURCHASES = (
+    (
+        "Grocery",
+        GROCERIES,
+        0.40,
+        4_500,
+        0.6,
+        ("FreshMart", "Corner Market", "Green Grocer", "Daily Foods"),
+    ),
+    (
+        "Dining",
+        DINING,
+        0.25,
+        1_800,
+        0.7,
+        ("Cafe Aroma", "Noodle Bar", "Pizza Place", "Burger Shack"),
+    ),
+    ("Transport", TRANSPORT, 0.20, 1_200, 0.8, ("City Metro", "Quick Taxi", "Fuel")),
+    (
+        "Shopping",
+        SHOPPING,
+        0.15,
+        6_000,
+        1.0,
+        ("Online Store", "Bookshop", "Electronics Hub", "Clothing Co"),
+    ),
+)
+
+# Monthly subscription prices in minor units, by service
+SUBSCRIPTION_PLANS = (
+    ("StreamFlix", 1_299),
+    ("Music Plus", 999),
+    ("Cloud Drive", 299),
+    ("News Daily", 1_499),
+    ("Gym Club", 3_900),
+)
+
+# Seconds into the day of scheduled entries and the window of purchases
+SCHEDULED_SECOND = 6 * 3600
+PURCHASE_WINDOW = (7 * 3600, 22 * 3600)
+
+# Placeholder password hash that no password verifies against
+DISABLED_PASSWORD_HASH = "!synthetic"
+
+
+@dataclass(frozen=True, slots=True)
+class SyntheticOptions:
+    """What to generate."""
+
+    users: int
+    # First day (UTC midnight, seconds since epoch) and number of days
+    start: int
+    days: int
+    seed: int = 0
+    sessions_per_user: int = 1
+    # Average everyday purchases per user per day
+    purchases_per_day: float = 1.5
+    # Entries written per transaction
+    batch_size: int = 50_000
+    # Processes signing entry hashes
+    workers: int = 1
+
+
+@dataclass(slots=True)
+class SyntheticReport:
+    """Rows written by a generator run."""
+
+    users: int = 0
+    sessions: int = 0
+    accounts: int = 0
+    entries: int = 0
+    postings: int = 0
+    checkpoints: int = 0
+    blocks: int = 0
+    last_hash: str = GENESIS_HASH
+    elapsed: float = 0.0
+
+    @property
+    def rows(self) -> int:
+        """Rows written across all tables."""
+        return (
+            self.users
+            + self.sessions
+            + self.accounts
+            + self.entries
+            + self.postings
+            + self.checkpoints
+            + self.blocks
+        )
+
+    @property
+    def rows_per_second(self) -> float:
+        """Write throughput of the run."""
+        return self.rows / self.elapsed if self.elapsed else 0.0
+
+
+@dataclass(slots=True)
+class _Profile:
+    """The recurring finances of one synthetic user."""
+
+    salary: int
+    payday: int
+    rent: int
+    rent_day: int
+    utilities: int
+    utilities_day: int
+    card_day: int
+    savings: int
+    subscriptions: list[tuple[str, int, int]] = field(default_factory=list)
+
+
+# A generated entry: (posted_at, category, description, postings)
+_Entry = tuple[int, str, str, tuple[tuple[int, int, str], ...]]
+
+
+def session_token(seed: int, user: int, n: int) -> str:
+    """
+    Derive the raw session token of a synthetic session.
+
+    Args:
+        seed: Generator seed
+        user: User number
+        n: Session number of the user
+
+    Returns:
+        The token a browser would send in the auth-session cookie
+    """
+    return hashlib.sha256(f"synthetic:{seed}:{user}:{n}".encode()).hexdigest()[:32]
+
+
+def _account_id(user: int, account: int) -> int:
+    """ID of one of a user's accounts."""
+    return user * len(CHART) + account + 1
+
+
+def _round(amount: float, unit: int = 100) -> int:
+    """Round an amount in minor units to a whole unit, at least one unit."""
+    return max(unit, round(amount / unit) * unit)
+
+
+def _profiles(rng: random.Random, users: int) -> list[_Profile]:
+    """Draw the recurring finances of every user."""
+    profiles = []
+    for _ in range(users):
+        salary = _round(350_000 * rng.lognormvariate(0, 0.4), 1_000)
+        profile = _Profile(
+            salary=salary,
+            payday=rng.choice((1, 15, 25, 28)),
+            rent=_round(salary * rng.uniform(0.2, 0.4)),
+            rent_day=1,
+            utilities=_round(salary * rng.uniform(0.02, 0.05)),
+            utilities_day=rng.randint(5, 25),
+            card_day=rng.randint(10, 28),
+            savings=_round(salary * rng.uniform(0.0, 0.15)),
+        )
+        for name, price in rng.sample(SUBSCRIPTION_PLANS, rng.randint(0, 4)):
+            profile.subscriptions.append((name, price, rng.randint(1, 28)))
+        profiles.append(profile)
+    return profiles
+
+
+def _transfer(
+    user: int, debit: int, credit: int, amount: int
+) -> tuple[tuple[int, int, str], ...]:
+    """Postings moving an amount from one of a user's accounts to another."""
+    currency = settings.REPORTING_CURRENCY
+    return (
+        (_account_id(user, debit), amount, currency),
+        (_account_id(user, credit), -amount, currency),
+    )
+
+
+class _Generator:
+    """Produces the entries of each day in posting order."""
+
+    def __init__(self, options: SyntheticOptions) -> None:
+        self.options = options
+        self.rng = random.Random(options.seed)
+        self.profiles = _profiles(self.rng, options.users)
+        # Skewed activity: cumulative Pareto weights pick who buys something
+        weights = [min(self.rng.paretovariate(1.16), 50.0) for _ in self.profiles]
+        total = 0.0
+        self.cum_weights = []
+        for weight in weights:
+            total += weight
+            self.cum_weights.append(total)
+        # Scheduled entries by day of month, so a day only visits its users
+        self.schedule: dict[int, list[tuple[str, int]]] = {}
+        for user, profile in enumerate(self.profiles):
+            self._plan(profile.payday, "salary", user)
+            self._plan(min(profile.payday + 1, 28), "savings", user)
+            self._plan(profile.rent_day, "rent", user)
+            self._plan(profile.utilities_day, "utilities", user)
+            self._plan(profile.card_day, "card", user)
+            for index, (_, _, day) in enumerate(profile.subscriptions):
+                self._plan(day, f"subscription:{index}", user)
+
+    def _plan(self, day: int, kind: str, user: int) -> None:
+        """Schedule a monthly entry of a user."""
+        self.schedule.setdefault(day, []).append((kind, user))
+
+    def opening(self, posted_at: int) -> Iterator[_Entry]:
+        """Opening balances of the checking accounts."""
+        for user, profile in enumerate(self.profiles):
+            amount = _round(profile.salary * self.rng.uniform(0.5, 2.0))
+            yield (
+                posted_at,
+                "Opening balance",
+                "Opening balance",
+                _transfer(user, CHECKING, OPENING, amount),
+            )
+
+    def day(self, start: int, card_balances: Callable[[int], int]) -> list[_Entry]:
+        """
+        Generate the entries of one day.
+
+        Args:
+            start: Midnight of the day
+            card_balances: Closing balance of an account at the previous
+                day's end, used to pay off credit cards
+
+        Returns:
+            The day's entries ordered by time
+        """
+        rng = self.rng
+        day_of_month = time.gmtime(start).tm_mday
+        month = time.strftime("%B %Y", time.gmtime(start))
+        scheduled = start + SCHEDULED_SECOND
+        entries: list[_Entry] = []
+
+        for kind, user in self.schedule.get(day_of_month, ()):
+            profile = self.profiles[user]
+            if kind == "salary":
+                category, description = "Salary", f"Salary {month}"
+                postings = _transfer(user, CHECKING, SALARY, profile.salary)
+            elif kind == "savings":
+                category, description = "Transfer", "Monthly savings"
+                postings = _transfer(user, SAVINGS, CHECKING, profile.savings)
+            elif kind == "rent":
+                category, description = "Housing", f"Rent {month}"
+                postings = _transfer(user, HOUSING, CHECKING, profile.rent)
+            elif kind == "utilities":
+                amount = _round(profile.utilities * rng.uniform(0.7, 1.4), 1)
+                category, description = "Utilities", "Power & Water Co"
+                postings = _transfer(user, UTILITIES, CHECKING, amount)
+            elif kind == "card":
+                owed = -card_balances(_account_id(user, CARD))
+                if owed <= 0:
+                    continue
+                category, description = "Transfer", "Credit card payment"
+                postings = _transfer(user, CARD, CHECKING, owed)
+            else:
+                name, price, _ = profile.subscriptions[int(kind.split(":")[1])]
+                category, description = "Subscriptions", name
+                postings = _transfer(user, SUBSCRIPTIONS, CARD, price)
+            entries.append((scheduled, category, description, postings))
+
+        # Normal approximation of the day's total number of purchases
+        mean = self.options.purchases_per_day * self.options.users
+        count = max(0, round(rng.gauss(mean, mean**0.5)))
+        buyers = rng.choices(
+            range(self.options.users), cum_weights=self.cum_weights, k=count
+        )
+        kinds = rng.choices(PURCHASES, weights=[p[2] for p in PURCHASES], k=count)
+        for user, (category, account, _, median, sigma, merchants) in zip(
+            buyers, kinds, strict=True
+        ):
+            amount = _round(median * rng.lognormvariate(0, sigma), 1)
+            funding = CARD if rng.random() < 0.6 else CHECKING
+            entries.append(
+                (
+                    start + rng.randrange(*PURCHASE_WINDOW),
+                    category,
+                    rng.choice(merchants),
+                    _transfer(user, account, funding, amount),
+                )
+            )
+
+        entries.sort(key=lambda entry: entry[0])
+        return entries
+
+
+def _sign_batch(entry_hashes: Sequence[str]) -> list[str]:
+    """Sign entry hashes in a worker process."""
+    return sign_hashes(get_signing_key(), entry_hashes)
+
+
+class _Writer:
+    """Chains, signs and writes entries and their derived rows in batches."""
+
+    def __init__(
+        self,
+        conn: Connection,
+        options: SyntheticOptions,
+        report: SyntheticReport,
+        started: float,
+        pool: Executor | None,
+    ) -> None:
+        self.conn = conn
+        self.pool = pool
+        self.started = started
+        self.options = options
+        self.report = report
+        self.key = get_signing_key()
+        self.key_id = key_id(self.key.public_key())
+        self.block_size = settings.LEDGER_BLOCK_SIZE
+        self.interval = settings.LEDGER_CHAIN_CHECKPOINT_INTERVAL
+        accounts = options.users * len(CHART) + 1
+        # Running balances and period deltas, indexed by account ID
+        self.closing = array("q", bytes(8 * accounts))
+        self.day_delta = array("q", bytes(8 * accounts))
+        self.month_delta = array("q", bytes(8 * accounts))
+        self.day_touched: set[int] = set()
+        self.month_touched: set[int] = set()
+        self.last_hash = GENESIS_HASH
+        self.last_id = 0
+        self.last_posted_at = options.start
+        self.unsealed: list[tuple[int, str]] = []
+        self._reset()
+
+    def _reset(self) -> None:
+        """Start a new batch."""
+        self.entries: list[dict[str, Any]] = []
+        self.postings: list[dict[str, Any]] = []
+        self.checkpoints: list[dict[str, Any]] = []
+        self.chain_checkpoints: list[dict[str, Any]] = []
+        self.blocks: list[dict[str, Any]] = []
+
+    def add(self, entries: list[_Entry]) -> None:
+        """Chain and queue a day's entries."""
+        closing = self.closing
+        day_delta = self.day_delta
+        month_delta = self.month_delta
+        for posted_at, category, description, postings in entries:
+            self.last_id += 1
+            entry_id = self.last_id
+            prev_hash = self.last_hash
+            self.last_hash = chain_hash(
+                prev_hash, entry_payload(posted_at, category, description, postings)
+            )
+            self.entries.append(
+                {
+                    "id": entry_id,
+                    "posted_at": posted_at,
+                    "category": category,
+                    "description": description,
+                    "created_at": posted_at,
+                    "prev_hash": prev_hash,
+                    "entry_hash": self.last_hash,
+                    "signing_key_id": self.key_id,
+                }
+            )
+            for account_id, amount_minor, currency in postings:
+                self.postings.append(
+                    {
+                        "entry_id": entry_id,
+                        "account_id": account_id,
+                        "amount_minor": amount_minor,
+                        "currency": currency,
+                        "posted_at": posted_at,
+                    }
+                )
+                closing[account_id] += amount_minor
+                day_delta[account_id] += amount_minor
+                month_delta[account_id] += amount_minor
+                self.day_touched.add(account_id)
+
+            if entry_id % self.interval == 0:
+                self.chain_checkpoints.append(
+                    {
+                        "entry_id": entry_id,
+                        "entry_hash": self.last_hash,
+                        "created_at": posted_at,
+                    }
+                )
+            self.unsealed.append((entry_id, self.last_hash))
+            if len(self.unsealed) == self.block_size:
+                self.blocks.append(
+                    {
+                        "first_entry_id": self.unsealed[0][0],
+                        "last_entry_id": entry_id,
+                        "entry_count": len(self.unsealed),
+                        "merkle_root": merkle_root(
+                            [merkle_leaf(entry_hash) for _, entry_hash in self.unsealed]
+                        ),
+                        "created_at": posted_at,
+                    }
+                )
+                self.unsealed = []
+            self.last_posted_at = posted_at
+
+    def _sign(self) -> None:
+        """Sign the queued entries, spread over the pool if there is one."""
+        entry_hashes = [row["entry_hash"] for row in self.entries]
+        if self.pool is None:
+            signatures = sign_hashes(self.key, entry_hashes)
+        else:
+            size = -(-len(entry_hashes) // self.options.workers) or 1
+            signatures = [
+                signature
+                for batch in self.pool.map(
+                    _sign_batch,
+                    [
+                        entry_hashes[first : first + size]
+                        for first in range(0, len(entry_hashes), size)
+                    ],
+                )
+                for signature in batch
+            ]
+        for row, signature in zip(self.entries, signatures, strict=True):
+            row["signature"] = signature
+
+    def close_day(self, start: int) -> None:
+        """Queue the daily checkpoints of the accounts posted to on a day."""
+        for account_id in sorted(self.day_touched):
+            self.checkpoints.append(
+                {
+                    "account_id": account_id,
+                    "granularity": DAY,
+                    "period_start": start,
+                    "delta_minor": self.day_delta[account_id],
+                    "closing_minor": self.closing[account_id],
+                }
+            )
+            self.day_delta[account_id] = 0
+        self.month_touched |= self.day_touched
+        self.day_touched = set()
+
+    def close_month(self, start: int) -> None:
+        """Queue the monthly checkpoints of the accounts posted to in a month."""
+        for account_id in sorted(self.month_touched):
+            self.checkpoints.append(
+                {
+                    "account_id": account_id,
+                    "granularity": MONTH,
+                    "period_start": start,
+                    "delta_minor": self.month_delta[account_id],
+                    "closing_minor": self.closing[account_id],
+                }
+            )
+            self.month_delta[account_id] = 0
+        self.month_touched = set()
+
+    def flush(self) -> None:
+        """Sign, write and commit the queued rows."""
+        self._sign()
+        conn = self.conn
+        for table, rows in (
+            (JournalEntry, self.entries),
+            (Posting, self.postings),
+            (BalanceCheckpoint, self.checkpoints),
+            (ChainCheckpoint, self.chain_checkpoints),
+            (LedgerBlock, self.blocks),
+        ):
+            if rows:
+                conn.execute(insert(table), rows)
+        conn.commit()
+
+        report = self.report
+        report.entries += len(self.entries)
+        report.postings += len(self.postings)
+        report.checkpoints += len(self.checkpoints)
+        report.blocks += len(self.blocks)
+        logger.info(
+            f"Wrote {report.entries} entries, {report.postings} postings "
+            f"({report.rows / (time.monotonic() - self.started):.0f} rows/s)"
+        )
+        self._reset()
+
+    @property
+    def pending(self) -> int:
+        """Entries queued in the current batch."""
+        return len(self.entries)
+
+
+def _write_users(
+    conn: Connection,
+    options: SyntheticOptions,
+    report: SyntheticReport,
+    on_token: Callable[[str, str], None] | None,
+) -> None:
+    """Write the users, their sessions and their accounts."""
+    expires_at = options.start + (options.days + 30) * SECONDS_PER_DAY
+    chunk = max(1, options.batch_size // len(CHART))
+    for first in range(0, options.users, chunk):
+        users = range(first, min(first + chunk, options.users))
+        users_rows = []
+        sessions = []
+        accounts = []
+        for user in users:
+            user_id = f"user-{user}"
+            users_rows.append(
+                {
+                    "id": user_id,
+                    "username": f"user{user}",
+                    "password_hash": DISABLED_PASSWORD_HASH,
+                }
+            )
+            for n in range(options.sessions_per_user):
+                token = session_token(options.seed, user, n)
+                if on_token is not None:
+                    on_token(user_id, token)
+                sessions.append(
+                    {
+                        "id": hashlib.sha256(token.encode()).hexdigest(),
+                        "user_id": user_id,
+                        "expires_at": expires_at,
+                    }
+                )
+            for index, (name, kind) in enumerate(CHART):
+                accounts.append(
+                    {
+                        "id": _account_id(user, index),
+                        "user_id": user_id,
+                        "name": name,
+                        "type": kind,
+                        "currency": settings.REPORTING_CURRENCY,
+                        "created_at": options.start,
+                    }
+                )
+        conn.execute(insert(User), users_rows)
+        if sessions:
+            conn.execute(insert(UserSession), sessions)
+        conn.execute(insert(Account), accounts)
+        conn.commit()
+        report.users += len(users_rows)
+        report.sessions += len(sessions)
+        report.accounts += len(accounts)
+
+
+def _sync_sequences(conn: Connection) -> None:
+    """Move Postgres ID sequences past the explicitly inserted IDs."""
+    for table in (Account, JournalEntry, Posting, LedgerBlock):
+        name = table.__tablename__
+        conn.execute(
+            text(
+                f"SELECT setval(pg_get_serial_sequence('{name}', 'id'), "
+                f"(SELECT max(id) FROM {name}))"
+            )
+        )
+    conn.commit()
+
+
+def _write_entries(
+    conn: Connection,
+    options: SyntheticOptions,
+    report: SyntheticReport,
+    started: float,
+    pool: Executor | None,
+) -> str:
+    """Generate and write the entries day by day and return the chain head."""
+    generator = _Generator(options)
+    writer = _Writer(conn, options, report, started, pool)
+    writer.add(list(generator.opening(options.start)))
+    month = month_start(options.start)
+    for day in range(options.days):
+        start = options.start + day * SECONDS_PER_DAY
+        if month_start(start) != month:
+            writer.close_month(month)
+            month = month_start(start)
+        writer.add(generator.day(start, writer.closing.__getitem__))
+        writer.close_day(start)
+        if writer.pending >= options.batch_size:
+            writer.flush()
+    writer.close_month(month)
+
+    conn.execute(
+        insert(ChainHead).values(
+            id=1,
+            entry_id=writer.last_id,
+            entry_hash=writer.last_hash,
+            updated_at=writer.last_posted_at,
+        )
+    )
+    writer.flush()
+    return writer.last_hash
+
+
+def generate_ledger(
+    engine: Engine,
+    options: SyntheticOptions,
+    on_token: Callable[[str, str], None] | None = None,
+) -> SyntheticReport:
+    """
+    Fill an empty database with synthetic users, sessions and entries.
+
+    Missing tables are created, including the user and session tables the
+    frontend normally owns, so point this at a scratch database.
+
+    Args:
+        engine: Engine of the database to fill
+        options: What to generate
+        on_token: Called with (user ID, raw session token) for each session
+
+    Returns:
+        Counts of the rows written and the elapsed time
+
+    Raises:
+        LedgerReadOnlyError: If the database is in read-only mode
+        LedgerError: If the database already holds users or entries
+        SigningKeyError: If the ledger signing key is unavailable
+    """
+    if settings.DATABASE_READ_ONLY:
+        raise LedgerReadOnlyError("Ledger writes require DATABASE_READ_ONLY=false")
+
+    Base.metadata.create_all(engine)
+    report = SyntheticReport()
+    started = time.monotonic()
+    with engine.connect() as conn:
+        for table in (User, JournalEntry):
+            if conn.scalar(select(func.count()).select_from(table)):
+                raise LedgerError(
+                    f"Table {table.__tablename__} is not empty; "
+                    f"synthetic data needs an empty database"
+                )
+        if conn.dialect.name == "sqlite":
+            # A scratch database can be regenerated, so skip the fsyncs
+            conn.exec_driver_sql("PRAGMA synchronous = OFF")
+
+        _write_users(conn, options, report, on_token)
+
+        pool = ProcessPoolExecutor(options.workers) if options.workers > 1 else None
+        try:
+            report.last_hash = _write_entries(conn, options, report, started, pool)
+        finally:
+            if pool is not None:
+                pool.shutdown()
+        if conn.dialect.name == "postgresql":
+            _sync_sequences(conn)
+
+    report.elapsed = time.monotonic() - started
+    return report
@@ -0,0 +1,174 @@
+"""
+Transaction listing service.
+
+This module pages through a user's transaction history with opaque keyset
+cursors over (posted_at, posting id), so every page is read with index
+range scans no matter how deep into the history it starts.
+"""
+import base64
+import binascii
+import json
+import logging
+from datetime import UTC, datetime
+from decimal import Decimal
+from typing import Any
+
+from core.exceptions import InvalidCursorError
+from db.models.ledger import Account, AccountType
+from services.checkpoints import to_timestamp
+from services.ledger import get_postings_page, get_user_accounts
+from sqlalchemy import Row
+from sqlalchemy.orm import Session
+from utils.money import currency_exponent, from_minor, to_minor
+
+# Configure logger
+logger = logging.getLogger(__name__)
+
+
+def encode_cursor(posted_at: int, posting_id: int) -> str:
+    """
+    Encode the key of the last row of a page as an opaque cursor.
+
+    Args:
+        posted_at: Posting time in seconds since epoch
+        posting_id: Posting identifier
+
+    Returns:
+        URL-safe cursor string
+    """
+    raw = json.dumps([posted_at, posting_id], separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode()
+
+
+def decode_cursor(cursor: str) -> tuple[int, int]:
+    """
+    Decode a cursor produced by encode_cursor.
+
+    Args:
+        cursor: The cursor string
+
+    Returns:
+        Tuple of (posted_at, posting_id)
+
+    Raises:
+        InvalidCursorError: If the cursor is malformed
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        posted_at, posting_id = json.loads(raw)
+    except (binascii.Error, UnicodeDecodeError, ValueError, TypeError) as e:
+        raise InvalidCursorError("Invalid cursor") from e
+
+    if not isinstance(posted_at, int) or not isinstance(posting_id, int):
+        raise InvalidCursorError("Invalid cursor")
+    return posted_at, posting_id
+
+
+def to_transaction(row: Row) -> dict[str, Any]:
+    """
+    Convert a posting row into the API's transaction view.
+
+    The row comes from the ledger and is trusted, so it is returned as a
+    plain dictionary shaped like the Transaction schema instead of a
+    validated model; see core.responses.
+
+    Args:
+        row: A row as returned by get_postings_page
+
+    Returns:
+        The transaction, identified by its journal entry and posting, in its
+        account's currency
+    """
+    return {
+        "id": f"{row.entry_id}-{row.id}",
+        "date": datetime.fromtimestamp(row.posted_at, UTC),
+        "amount": from_minor(row.amount_minor, currency_exponent(row.currency)),
+        "currency": row.currency,
+        "type": row.category,
+        "description": row.description,
+    }
+
+
+def _amount_bounds(
+    accounts: list[Account], low: Decimal | None, high: Decimal | None
+) -> dict[int, tuple[int | None, int | None]] | None:
+    """Scale amount bounds into minor units of each account's currency."""
+    if low is None and high is None:
+        return None
+    bounds = {}
+    for account in accounts:
+        exponent = currency_exponent(account.currency)
+        bounds[account.id] = (
+            to_minor(low, exponent) if low is not None else None,
+            to_minor(high, exponent) if high is not None else None,
+        )
+    return bounds
+
+
+def list_transactions(
+    db: Session,
+    user_id: str,
+    limit: int,
+    cursor: str | None = None,
+    account_id: int | None = None,
+    start: datetime | None = None,
+    end: datetime | None = None,
+    category: str | None = None,
+    min_amount: Decimal | None = None,
+    max_amount: Decimal | None = None,
+) -> dict[str, Any]:
+    """
+    Get one page of a user's transactions, newest first.
+
+    Transactions are the postings on the user's asset accounts, as on the
+    dashboard, or on one of their accounts when ``account_id`` is given.
+
+    Args:
+        db: Database session
+        user_id: The ID of the user
+        limit: Maximum number of transactions on the page
+        cursor: Cursor returned with the previous page, or None for the first
+        account_id: Restrict to this account of the user
+        start: Only transactions at or after this time (UTC if naive)
+        end: Only transactions before this time (UTC if naive)
+        category: Only transactions of this type
+        min_amount: Only transactions of at least this amount, in the
+            currency of their account
+        max_amount: Only transactions of at most this amount, in the
+            currency of their account
+
+    Returns:
+        The page and the cursor of the next page, shaped like TransactionPage
+
+    Raises:
+        InvalidCursorError: If the cursor is malformed
+    """
+    before = decode_cursor(cursor) if cursor else None
+
+    if account_id is None:
+        accounts = get_user_accounts(db, user_id, types=[AccountType.ASSET])
+    else:
+        accounts = [a for a in get_user_accounts(db, user_id) if a.id == account_id]
+
+    # One extra row tells whether another page follows
+    rows = get_postings_page(
+        db,
+        [account.id for account in accounts],
+        limit + 1,
+        before=before,
+        posted_from=to_timestamp(start) if start else None,
+        posted_until=to_timestamp(end) if end else None,
+        category=category,
+        amount_bounds=_amount_bounds(accounts, min_amount, max_amount),
+    )
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor(rows[-1].posted_at, rows[-1].id)
+
+    logger.debug(f"Listed {len(rows)} transactions for user {user_id}")
+    return {
+        "items": [to_transaction(row) for row in rows],
+        "next_cursor": next_cursor,
+    }
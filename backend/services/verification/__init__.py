@@ -0,0 +1,15 @@
+# Dual-model transaction verification
+from services.verification.client import PROMPT_VERSION, ModelClient
+from services.verification.pipeline import (
+    VerificationPipeline,
+    build_pipeline,
+    reconcile,
+)
+
+__all__ = [
+    "PROMPT_VERSION",
+    "ModelClient",
+    "VerificationPipeline",
+    "build_pipeline",
+    "reconcile",
+]
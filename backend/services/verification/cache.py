@@ -0,0 +1,315 @@
+"""
+Content-addressed cache of model verdicts.
+
+Recurring transactions (the monthly rent, the same subscription) look the
+same to a verification model every time. This module keys each model's
+verdict by a normalized fingerprint of the transaction together with the
+model identity and prompt version, so a repeat is answered without a model
+request. Changing the prompt version or the model naturally misses.
+
+Verdicts are held in a memory LRU tier in front of an optional persistent
+SQLite tier that survives restarts. Both tiers are bounded in size and
+entries expire after a maximum age.
+"""
+import hashlib
+import json
+import logging
+import os
+import re
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Iterable
+from dataclasses import dataclass
+from typing import Any
+
+from schemas.verification import VerificationItem
+
+# Configure logger
+logger = logging.getLogger(__name__)
+
+# Prune the persistent tier after this many stores
+PRUNE_EVERY = 1_000
+
+_WHITESPACE = re.compile(r"\s+")
+_DIGITS = re.compile(r"\d+")
+
+DISK_SCHEMA = """
+CREATE TABLE IF NOT EXISTS verdict (
+    key TEXT PRIMARY KEY NOT NULL,
+    valid INTEGER NOT NULL,
+    reason TEXT NOT NULL,
+    created_at INTEGER NOT NULL,
+    used_at INTEGER NOT NULL
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS ix_verdict_used_at ON verdict (used_at);
+"""
+
+
+def _normalize(text: str) -> str:
+    """Case-fold, collapse whitespace and mask numbers (dates, invoice IDs)."""
+    return _DIGITS.sub("#", _WHITESPACE.sub(" ", text.strip().casefold()))
+
+
+def fingerprint(item: VerificationItem) -> str:
+    """
+    Compute the normalized fingerprint of a transaction.
+
+    The entry ID and posting date are left out and numbers in the text are
+    masked, so recurring transactions share a fingerprint. Amounts, their
+    currencies and accounts are kept exactly.
+
+    Args:
+        item: The transaction as sent to the models
+
+    Returns:
+        Lowercase hex SHA-256 of the normalized transaction
+    """
+    postings = sorted(
+        (_normalize(p.account), p.account_type, p.amount_minor, p.currency)
+        for p in item.postings
+    )
+    canonical = json.dumps(
+        [_normalize(item.category), _normalize(item.description), postings],
+        separators=(",", ":"),
+        ensure_ascii=False,
+    )
+    return hashlib.sha256(canonical.encode()).hexdigest()
+
+
+def verdict_key(fingerprint: str, model: str, prompt_version: str) -> str:
+    """
+    Compute the cache key of one model's verdict on a transaction.
+
+    Args:
+        fingerprint: The transaction fingerprint
+        model: The model identity: backend kind, base URL and model ID
+        prompt_version: The prompt version
+
+    Returns:
+        Lowercase hex cache key
+    """
+    return hashlib.sha256(
+        f"{prompt_version}\0{model}\0{fingerprint}".encode()
+    ).hexdigest()
+
+
+@dataclass(frozen=True, slots=True)
+class CachedVerdict:
+    """A model verdict as held by the cache."""
+
+    valid: bool
+    reason: str
+    # Seconds since epoch when the model gave the verdict
+    created_at: int
+
+
+class VerdictCache:
+    """Thread-safe two-tier (memory LRU, SQLite file) verdict cache."""
+
+    def __init__(
+        self,
+        memory_size: int,
+        max_age: float,
+        path: str = "",
+        max_rows: int = 1_000_000,
+    ) -> None:
+        """
+        Create the cache, opening or creating the persistent tier.
+
+        Args:
+            memory_size: Maximum number of verdicts held in memory
+            max_age: Seconds a verdict may be served after it was given
+            path: SQLite file of the persistent tier, or empty for memory only
+            max_rows: Maximum number of verdicts kept in the persistent tier
+        """
+        self.memory_size = memory_size
+        self.max_age = max_age
+        self.path = path
+        self.max_rows = max_rows
+        self._entries: OrderedDict[str, CachedVerdict] = OrderedDict()
+        self._lock = threading.Lock()
+        self._disk: sqlite3.Connection | None = None
+        self._disk_lock = threading.Lock()
+        self._stores_since_prune = 0
+
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.evictions = 0
+
+        if path:
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+            self._disk = sqlite3.connect(path, check_same_thread=False)
+            self._disk.execute("PRAGMA journal_mode=WAL")
+            self._disk.execute("PRAGMA synchronous=NORMAL")
+            self._disk.executescript(DISK_SCHEMA)
+
+    @property
+    def persistent(self) -> bool:
+        """Whether lookups may touch the SQLite file (and should run off-loop)."""
+        return self._disk is not None
+
+    def get_many(self, keys: Iterable[str]) -> dict[str, CachedVerdict]:
+        """
+        Look up verdicts, memory tier first.
+
+        Verdicts found on disk are promoted to the memory tier.
+
+        Args:
+            keys: Cache keys from verdict_key
+
+        Returns:
+            Fresh cached verdicts by key; absent and expired keys are missing
+        """
+        oldest = int(time.time() - self.max_age)
+        found: dict[str, CachedVerdict] = {}
+        missing = []
+        with self._lock:
+            for key in keys:
+                entry = self._entries.get(key)
+                if entry is not None and entry.created_at >= oldest:
+                    self._entries.move_to_end(key)
+                    found[key] = entry
+                    self.memory_hits += 1
+                else:
+                    if entry is not None:
+                        del self._entries[key]
+                    missing.append(key)
+
+        if missing and self._disk is not None:
+            from_disk = self._disk_get(missing, oldest)
+            found.update(from_disk)
+            with self._lock:
+                self.disk_hits += len(from_disk)
+                for key, entry in from_disk.items():
+                    self._memory_put(key, entry)
+            missing = [key for key in missing if key not in from_disk]
+
+        with self._lock:
+            self.misses += len(missing)
+        return found
+
+    def put_many(self, verdicts: Iterable[tuple[str, bool, str]]) -> None:
+        """
+        Store verdicts that a model has just given.
+
+        Args:
+            verdicts: Tuples of (key, valid, reason)
+        """
+        now = int(time.time())
+        entries = {
+            key: CachedVerdict(valid, reason, now) for key, valid, reason in verdicts
+        }
+        if not entries:
+            return
+
+        with self._lock:
+            self.stores += len(entries)
+            for key, entry in entries.items():
+                self._memory_put(key, entry)
+
+        if self._disk is not None:
+            with self._disk_lock:
+                self._disk.executemany(
+                    "INSERT OR REPLACE INTO verdict VALUES (?, ?, ?, ?, ?)",
+                    [
+                        (key, entry.valid, entry.reason, now, now)
+                        for key, entry in entries.items()
+                    ],
+                )
+                self._disk.commit()
+                self._stores_since_prune += len(entries)
+                if self._stores_since_prune >= PRUNE_EVERY:
+                    self._prune()
+
+    def stats(self) -> dict[str, Any]:
+        """
+        Report tier sizes and hit/miss counters.
+
+        Returns:
+            Dictionary with cache statistics
+        """
+        with self._lock:
+            lookups = self.memory_hits + self.disk_hits + self.misses
+            hits = self.memory_hits + self.disk_hits
+            return {
+                "memory_size": len(self._entries),
+                "memory_max_size": self.memory_size,
+                "persistent": self.persistent,
+                "max_age_seconds": self.max_age,
+                "memory_hits": self.memory_hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "stores": self.stores,
+                "evictions": self.evictions,
+                "hit_rate": hits / lookups if lookups else 0.0,
+            }
+
+    def close(self) -> None:
+        """Close the persistent tier."""
+        if self._disk is not None:
+            with self._disk_lock:
+                self._disk.close()
+            self._disk = None
+
+    def _memory_put(self, key: str, entry: CachedVerdict) -> None:
+        """Insert into the memory LRU, evicting the oldest. Caller holds the lock."""
+        if self.memory_size <= 0:
+            return
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.memory_size:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def _disk_get(self, keys: list[str], oldest: int) -> dict[str, CachedVerdict]:
+        """Read fresh verdicts from the persistent tier and mark them used."""
+        found = {}
+        with self._disk_lock:
+            # Stay below SQLite's bound-parameter limit
+            for start in range(0, len(keys), 500):
+                chunk = keys[start:start + 500]
+                placeholders = ",".join("?" * len(chunk))
+                rows = self._disk.execute(
+                    f"SELECT key, valid, reason, created_at FROM verdict "
+                    f"WHERE key IN ({placeholders}) AND created_at >= ?",
+                    [*chunk, oldest],
+                )
+                for key, valid, reason, created_at in rows:
+                    found[key] = CachedVerdict(bool(valid), reason, created_at)
+
+            if found:
+                used = list(found)
+                for start in range(0, len(used), 500):
+                    chunk = used[start:start + 500]
+                    placeholders = ",".join("?" * len(chunk))
+                    self._disk.execute(
+                        f"UPDATE verdict SET used_at = ? WHERE key IN ({placeholders})",
+                        [int(time.time()), *chunk],
+                    )
+                self._disk.commit()
+        return found
+
+    def _prune(self) -> None:
+        """Drop expired and least recently used rows. Caller holds the disk lock."""
+        self._stores_since_prune = 0
+        oldest = int(time.time() - self.max_age)
+        expired = self._disk.execute(
+            "DELETE FROM verdict WHERE created_at < ?", (oldest,)
+        ).rowcount
+        excess = self._disk.execute(
+            "DELETE FROM verdict WHERE key IN ("
+            "SELECT key FROM verdict ORDER BY used_at DESC LIMIT -1 OFFSET ?)",
+            (self.max_rows,),
+        ).rowcount
+        self._disk.commit()
+
+        with self._lock:
+            self.evictions += expired + excess
+        if expired or excess:
+            logger.debug(
+                f"Pruned {expired} expired and {excess} excess cached verdict(s)"
+            )
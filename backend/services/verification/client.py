@@ -0,0 +1,205 @@
+"""
+Verification model client.
+
+This module sends batches of transactions to one verification model over an
+OpenAI-compatible chat completions API. Each model gets its own pooled
+HTTP/2 client and concurrency limit, and failed or rate-limited requests are
+retried with exponential backoff.
+"""
+import asyncio
+import json
+import logging
+import random
+from collections.abc import Sequence
+
+import httpx
+from pydantic import ValidationError
+from schemas.verification import ModelVerdict, VerificationItem
+
+# Configure logger
+logger = logging.getLogger(__name__)
+
+# Bump whenever SYSTEM_PROMPT or the item format changes
+PROMPT_VERSION = "v2"
+
+SYSTEM_PROMPT = """\
+You audit double-entry bookkeeping transactions. For each transaction in the
+user message, decide whether it is plausible and correctly recorded: the
+postings must sum to zero, the accounts must fit the category and
+description, and the amounts must be reasonable for the description.
+Amounts are signed integers in minor units of the posting's ISO 4217
+currency (debits positive); the postings of each currency sum to zero.
+Answer with a JSON object of the form
+{"verdicts": [{"entry_id": <int>, "valid": <bool>, "reason": "<short reason>"}]}
+containing exactly one verdict per transaction."""
+
+# Status codes worth retrying: rate limits and transient server errors
+RETRY_STATUS_CODES = {408, 429, 500, 502, 503, 504}
+
+# Upper bound for a single backoff delay in seconds
+MAX_BACKOFF = 30.0
+
+
+class ModelRequestError(Exception):
+    """Raised when a model request fails after all retries."""
+
+
+class ModelClient:
+    """
+    Client for one verification model.
+
+    Args:
+        name: Model identifier sent in requests and stored with verdicts
+        base_url: Base URL of the OpenAI-compatible API
+        api_key: Bearer token, or empty for none
+        concurrency: Maximum concurrent requests to this model
+        timeout: Seconds before a request times out
+        max_retries: Retries per request on transient errors
+        transport: Optional transport, e.g. ASGITransport for the stub server
+        backend: Kind of model behind the URL ("http" or "stub"), part of
+            the client's cache identity
+    """
+
+    def __init__(
+        self,
+        name: str,
+        base_url: str,
+        api_key: str = "",
+        concurrency: int = 8,
+        timeout: float = 60.0,
+        max_retries: int = 4,
+        transport: httpx.AsyncBaseTransport | None = None,
+        backend: str = "http",
+    ):
+        self.name = name
+        # Verdicts are only shared between clients of the same model
+        self.identity = f"{backend}\0{base_url}\0{name}"
+        self.max_retries = max_retries
+        self._semaphore = asyncio.Semaphore(concurrency)
+        headers = {"Authorization": f"Bearer {api_key}"} if api_key else {}
+        self._client = httpx.AsyncClient(
+            base_url=base_url,
+            headers=headers,
+            http2=transport is None,
+            timeout=timeout,
+            limits=httpx.Limits(
+                max_connections=concurrency, max_keepalive_connections=concurrency
+            ),
+            transport=transport,
+        )
+
+        # Counters reported by the pipeline
+        self.requests = 0
+        self.retries = 0
+        self.failures = 0
+
+    async def verify_batch(
+        self, items: Sequence[VerificationItem]
+    ) -> dict[int, ModelVerdict]:
+        """
+        Ask the model for a verdict on each transaction of a batch.
+
+        Args:
+            items: Transactions to verify in one prompt
+
+        Returns:
+            Verdicts by entry ID; transactions the model skipped are missing
+
+        Raises:
+            ModelRequestError: If the request fails after all retries
+        """
+        body = {
+            "model": self.name,
+            "temperature": 0,
+            "response_format": {"type": "json_object"},
+            "messages": [
+                {"role": "system", "content": SYSTEM_PROMPT},
+                {
+                    "role": "user",
+                    "content": json.dumps(
+                        [item.model_dump(mode="json") for item in items],
+                        separators=(",", ":"),
+                    ),
+                },
+            ],
+        }
+
+        async with self._semaphore:
+            content = await self._post_with_retries(body)
+
+        return self._parse_verdicts(content, {item.entry_id for item in items})
+
+    async def _post_with_retries(self, body: dict) -> str:
+        """Post a chat completion request, retrying transient failures."""
+        for attempt in range(self.max_retries + 1):
+            self.requests += 1
+            delay = None
+            try:
+                response = await self._client.post("/chat/completions", json=body)
+                if response.status_code not in RETRY_STATUS_CODES:
+                    response.raise_for_status()
+                    return response.json()["choices"][0]["message"]["content"]
+
+                error = f"HTTP {response.status_code}"
+                retry_after = response.headers.get("Retry-After")
+                if retry_after and retry_after.isdigit():
+                    delay = float(retry_after)
+            except httpx.TransportError as e:
+                error = f"{type(e).__name__}: {e}"
+            except (httpx.HTTPStatusError, KeyError, IndexError, ValueError) as e:
+                self.failures += 1
+                raise ModelRequestError(f"{self.name}: {e}") from e
+
+            if attempt == self.max_retries:
+                break
+
+            # Full jitter keeps retrying workers from synchronizing
+            if delay is None:
+                delay = random.uniform(0, min(MAX_BACKOFF, 0.5 * 2**attempt))
+            self.retries += 1
+            logger.debug(f"{self.name}: {error}, retrying in {delay:.2f}s")
+            await asyncio.sleep(delay)
+
+        self.failures += 1
+        raise ModelRequestError(
+            f"{self.name}: {error} after {self.max_retries} retries"
+        )
+
+    def _parse_verdicts(
+        self, content: str, expected: set[int]
+    ) -> dict[int, ModelVerdict]:
+        """Parse the model's JSON answer, keeping verdicts for asked entries."""
+        try:
+            raw = json.loads(content)["verdicts"]
+        except (ValueError, KeyError, TypeError) as e:
+            self.failures += 1
+            raise ModelRequestError(f"{self.name}: malformed answer: {e}") from e
+
+        verdicts = {}
+        for value in raw:
+            try:
+                verdict = ModelVerdict.model_validate(value)
+            except ValidationError:
+                continue
+            if verdict.entry_id in expected:
+                verdicts[verdict.entry_id] = verdict
+
+        if len(verdicts) < len(expected):
+            logger.warning(
+                f"{self.name}: answered {len(verdicts)} of {len(expected)} "
+                f"transactions"
+            )
+        return verdicts
+
+    def stats(self) -> dict[str, int | str]:
+        """Request counters for this model."""
+        return {
+            "model": self.name,
+            "requests": self.requests,
+            "retries": self.retries,
+            "failures": self.failures,
+        }
+
+    async def aclose(self) -> None:
+        """Close the pooled connections."""
+        await self._client.aclose()
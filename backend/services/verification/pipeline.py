@@ -0,0 +1,420 @@
+"""
+Dual-model verification pipeline.
+
+Transactions enter a bounded asyncio queue, either submitted directly or
+picked up by a background scan for entries without a verdict. A batcher
+groups them into prompts of VERIFICATION_BATCH_SIZE transactions, and each
+batch is sent to both models concurrently, leaving out transactions whose
+verdict is already cached for that model. The verdicts are reconciled and
+stored from a worker thread. Everything runs as tasks on the API's
+event loop, so request handlers never wait for the models.
+"""
+import asyncio
+import logging
+from collections.abc import Callable, Sequence
+
+import httpx
+from core.config import settings
+from schemas.verification import (
+    ModelVerdict,
+    VerificationItem,
+    VerificationResult,
+    VerificationStatus,
+)
+from services.verification.cache import VerdictCache, fingerprint, verdict_key
+from services.verification.client import PROMPT_VERSION, ModelClient
+from services.verification.store import load_unverified, save_results
+from services.verification.stub_server import create_stub_app
+
+# Configure logger
+logger = logging.getLogger(__name__)
+
+# Stores reconciled verdicts; called in a worker thread
+ResultSink = Callable[[list[VerificationResult]], None]
+
+# Loads up to ``limit`` unverified items after an entry ID; called in a worker thread
+ItemSource = Callable[[int, int], list[VerificationItem]]
+
+
+def reconcile(
+    primary_model: str,
+    primary: ModelVerdict,
+    secondary_model: str,
+    secondary: ModelVerdict,
+) -> VerificationResult:
+    """
+    Combine both models' verdicts on a transaction into one outcome.
+
+    Args:
+        primary_model: Primary model identifier
+        primary: Primary model verdict
+        secondary_model: Secondary model identifier
+        secondary: Secondary model verdict
+
+    Returns:
+        Verified if both accept, rejected if both reject, disputed otherwise
+    """
+    if primary.valid and secondary.valid:
+        status = VerificationStatus.VERIFIED
+    elif not primary.valid and not secondary.valid:
+        status = VerificationStatus.REJECTED
+    else:
+        status = VerificationStatus.DISPUTED
+
+    return VerificationResult(
+        entry_id=primary.entry_id,
+        status=status,
+        primary_model=primary_model,
+        primary=primary,
+        secondary_model=secondary_model,
+        secondary=secondary,
+        prompt_version=PROMPT_VERSION,
+    )
+
+
+class VerificationPipeline:
+    """
+    Queue, batch and verify transactions with two independent models.
+
+    Args:
+        primary: Client for the primary model
+        secondary: Client for the secondary model
+        sink: Stores reconciled verdicts
+        source: Loads unverified entries for the background scan, or None
+        queue_size: Maximum transactions waiting in the queue
+        batch_size: Transactions per model prompt
+        batch_wait: Seconds to wait for a batch to fill
+        max_in_flight: Batches sent to the models at the same time
+        poll_interval: Seconds between scans once no backlog remains
+        cache: Verdict cache consulted before each model request, or None
+    """
+
+    def __init__(
+        self,
+        primary: ModelClient,
+        secondary: ModelClient,
+        sink: ResultSink,
+        source: ItemSource | None = None,
+        queue_size: int = 10_000,
+        batch_size: int = 25,
+        batch_wait: float = 0.5,
+        max_in_flight: int = 8,
+        poll_interval: float = 5.0,
+        cache: VerdictCache | None = None,
+    ):
+        self.primary = primary
+        self.secondary = secondary
+        self.sink = sink
+        self.source = source
+        self.queue_size = queue_size
+        self.batch_size = batch_size
+        self.batch_wait = batch_wait
+        self.max_in_flight = max_in_flight
+        self.poll_interval = poll_interval
+        self.cache = cache
+
+        self._queue: asyncio.Queue[VerificationItem] | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._slots: asyncio.Semaphore | None = None
+        self._tasks: list[asyncio.Task] = []
+        self._in_flight: set[asyncio.Task] = set()
+
+        # Counters reported by stats()
+        self.submitted = 0
+        self.dropped = 0
+        self.batches = 0
+        self.failed = 0
+        self.outcomes = dict.fromkeys(VerificationStatus, 0)
+
+    async def start(self) -> None:
+        """Start the batcher and, with a source, the background scan."""
+        self._loop = asyncio.get_running_loop()
+        self._queue = asyncio.Queue(maxsize=self.queue_size)
+        self._slots = asyncio.Semaphore(self.max_in_flight)
+        self._tasks.append(asyncio.create_task(self._batch_loop()))
+        if self.source is not None:
+            self._tasks.append(asyncio.create_task(self._scan_loop()))
+        logger.info(
+            f"Verification pipeline started with {self.primary.name} and "
+            f"{self.secondary.name}"
+        )
+
+    def submit(self, item: VerificationItem) -> bool:
+        """
+        Queue a transaction without waiting.
+
+        Must be called on the pipeline's event loop. Use submit_threadsafe
+        from other threads.
+
+        Args:
+            item: The transaction to verify
+
+        Returns:
+            False if the queue is full and the transaction was dropped. It
+            stays without a verdict and is queued again by the next startup
+            scan
+        """
+        try:
+            self._queue.put_nowait(item)
+        except asyncio.QueueFull:
+            self.dropped += 1
+            return False
+        self.submitted += 1
+        return True
+
+    def submit_threadsafe(self, item: VerificationItem) -> None:
+        """Queue a transaction from a thread other than the event loop's."""
+        self._loop.call_soon_threadsafe(self.submit, item)
+
+    async def join(self) -> None:
+        """Wait until every queued transaction has been processed."""
+        await self._queue.join()
+
+    async def stop(self) -> None:
+        """Stop all tasks, abandoning queued work, and close the clients."""
+        for task in [*self._tasks, *self._in_flight]:
+            task.cancel()
+        await asyncio.gather(*self._tasks, *self._in_flight, return_exceptions=True)
+        self._tasks.clear()
+        await self.primary.aclose()
+        await self.secondary.aclose()
+        if self.cache is not None:
+            self.cache.close()
+        logger.info("Verification pipeline stopped")
+
+    async def _next_batch(self) -> list[VerificationItem]:
+        """Wait for one item, then collect more until full or out of time."""
+        batch = [await self._queue.get()]
+        deadline = self._loop.time() + self.batch_wait
+        while len(batch) < self.batch_size:
+            try:
+                batch.append(self._queue.get_nowait())
+                continue
+            except asyncio.QueueEmpty:
+                pass
+
+            remaining = deadline - self._loop.time()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), remaining))
+            except TimeoutError:
+                break
+        return batch
+
+    async def _batch_loop(self) -> None:
+        """Form batches and dispatch them, at most max_in_flight at a time."""
+        while True:
+            batch = await self._next_batch()
+            # Waiting for a slot lets the queue fill up, which is the
+            # backpressure that makes submit() drop instead of growing memory
+            await self._slots.acquire()
+            task = asyncio.create_task(self._process(batch))
+            self._in_flight.add(task)
+            task.add_done_callback(self._batch_done)
+
+    def _batch_done(self, task: asyncio.Task) -> None:
+        """Release the batch's slot and surface unexpected errors."""
+        self._in_flight.discard(task)
+        self._slots.release()
+        if not task.cancelled() and task.exception() is not None:
+            logger.error(f"Verification batch failed: {task.exception()!r}")
+
+    async def _process(self, batch: Sequence[VerificationItem]) -> None:
+        """Verify one batch with both models and store the reconciled results."""
+        try:
+            self.batches += 1
+            fingerprints = {item.entry_id: fingerprint(item) for item in batch}
+            primary, secondary = await asyncio.gather(
+                self._model_verdicts(self.primary, batch, fingerprints),
+                self._model_verdicts(self.secondary, batch, fingerprints),
+                return_exceptions=True,
+            )
+            results = []
+            for verdicts in (primary, secondary):
+                if isinstance(verdicts, BaseException):
+                    logger.warning(f"Verification request failed: {verdicts}")
+                    break
+            else:
+                results = [
+                    reconcile(
+                        self.primary.name,
+                        primary[item.entry_id],
+                        self.secondary.name,
+                        secondary[item.entry_id],
+                    )
+                    for item in batch
+                    if item.entry_id in primary and item.entry_id in secondary
+                ]
+
+            # Transactions without both verdicts stay unverified
+            self.failed += len(batch) - len(results)
+            if results:
+                await asyncio.to_thread(self.sink, results)
+                for result in results:
+                    self.outcomes[result.status] += 1
+        finally:
+            for _ in batch:
+                self._queue.task_done()
+
+    async def _model_verdicts(
+        self,
+        client: ModelClient,
+        batch: Sequence[VerificationItem],
+        fingerprints: dict[int, str],
+    ) -> dict[int, ModelVerdict]:
+        """
+        Get one model's verdicts on a batch, asking the model only for misses.
+
+        Cached verdicts are reused, and transactions sharing a fingerprint
+        within the batch are sent once.
+        """
+        keys = {
+            entry_id: verdict_key(value, client.identity, PROMPT_VERSION)
+            for entry_id, value in fingerprints.items()
+        }
+        cached = {}
+        if self.cache is not None:
+            if self.cache.persistent:
+                cached = await asyncio.to_thread(self.cache.get_many, keys.values())
+            else:
+                cached = self.cache.get_many(keys.values())
+
+        verdicts = {}
+        to_send: dict[str, VerificationItem] = {}
+        for item in batch:
+            key = keys[item.entry_id]
+            hit = cached.get(key)
+            if hit is not None:
+                verdicts[item.entry_id] = ModelVerdict(
+                    entry_id=item.entry_id, valid=hit.valid, reason=hit.reason
+                )
+            else:
+                to_send.setdefault(key, item)
+        if not to_send:
+            return verdicts
+
+        fresh = await client.verify_batch(list(to_send.values()))
+        by_key = {keys[entry_id]: verdict for entry_id, verdict in fresh.items()}
+        for item in batch:
+            verdict = by_key.get(keys[item.entry_id])
+            if item.entry_id not in verdicts and verdict is not None:
+                verdicts[item.entry_id] = verdict.model_copy(
+                    update={"entry_id": item.entry_id}
+                )
+
+        if self.cache is not None and by_key:
+            new = [(key, v.valid, v.reason) for key, v in by_key.items()]
+            if self.cache.persistent:
+                await asyncio.to_thread(self.cache.put_many, new)
+            else:
+                self.cache.put_many(new)
+        return verdicts
+
+    async def _scan_loop(self) -> None:
+        """
+        Feed unverified entries into the queue.
+
+        Scans forward by entry ID so each entry is queued once per process;
+        entries whose verification failed are retried after a restart.
+        """
+        after_id = 0
+        limit = self.batch_size * self.max_in_flight
+        while True:
+            try:
+                items = await asyncio.to_thread(self.source, after_id, limit)
+            except Exception as e:
+                logger.error(f"Scanning for unverified entries failed: {e}")
+                items = []
+
+            for item in items:
+                await self._queue.put(item)
+                self.submitted += 1
+            if items:
+                after_id = items[-1].entry_id
+            if len(items) < limit:
+                await asyncio.sleep(self.poll_interval)
+
+    def stats(self) -> dict:
+        """Queue depth, throughput counters and per-model request counters."""
+        return {
+            "queue_size": self._queue.qsize() if self._queue else 0,
+            "queue_max_size": self.queue_size,
+            "in_flight_batches": len(self._in_flight),
+            "submitted": self.submitted,
+            "dropped": self.dropped,
+            "batches": self.batches,
+            "failed": self.failed,
+            "outcomes": {str(status): n for status, n in self.outcomes.items()},
+            "models": [self.primary.stats(), self.secondary.stats()],
+            "prompt_version": PROMPT_VERSION,
+            "cache": self.cache.stats() if self.cache is not None else None,
+        }
+
+
+def build_pipeline(
+    sink: ResultSink = save_results, source: ItemSource | None = load_unverified
+) -> VerificationPipeline:
+    """
+    Create a verification pipeline from the application settings.
+
+    With VERIFICATION_BACKEND=stub both models are served in-process by
+    stub servers that disagree on large amounts, so no network access or
+    API key is needed. With VERDICT_CACHE_ENABLED the pipeline reuses
+    cached verdicts for recurring transactions.
+
+    Args:
+        sink: Stores reconciled verdicts
+        source: Loads unverified entries for the background scan, or None
+
+    Returns:
+        The pipeline (not started)
+    """
+    models = [
+        (settings.VERIFICATION_PRIMARY_MODEL, settings.VERIFICATION_PRIMARY_URL),
+        (settings.VERIFICATION_SECONDARY_MODEL, settings.VERIFICATION_SECONDARY_URL),
+    ]
+    # The stubs accept different maximum amounts so they can disagree
+    stub_limits = [10_000_000, 5_000_000]
+
+    clients = []
+    for (name, url), max_amount in zip(models, stub_limits, strict=True):
+        transport = None
+        if settings.VERIFICATION_BACKEND == "stub":
+            transport = httpx.ASGITransport(
+                app=create_stub_app(max_amount_minor=max_amount)
+            )
+            url = f"http://{name}/v1"
+        clients.append(
+            ModelClient(
+                name,
+                url,
+                api_key=settings.VERIFICATION_API_KEY,
+                concurrency=settings.VERIFICATION_CONCURRENCY,
+                timeout=settings.VERIFICATION_TIMEOUT,
+                max_retries=settings.VERIFICATION_MAX_RETRIES,
+                transport=transport,
+                backend=settings.VERIFICATION_BACKEND,
+            )
+        )
+
+    cache = None
+    if settings.VERDICT_CACHE_ENABLED:
+        cache = VerdictCache(
+            memory_size=settings.VERDICT_CACHE_MEMORY_SIZE,
+            max_age=settings.VERDICT_CACHE_MAX_AGE,
+            path=settings.VERDICT_CACHE_PATH,
+            max_rows=settings.VERDICT_CACHE_MAX_ROWS,
+        )
+
+    return VerificationPipeline(
+        *clients,
+        sink=sink,
+        source=source,
+        queue_size=settings.VERIFICATION_QUEUE_SIZE,
+        batch_size=settings.VERIFICATION_BATCH_SIZE,
+        batch_wait=settings.VERIFICATION_BATCH_WAIT,
+        max_in_flight=settings.VERIFICATION_CONCURRENCY,
+        poll_interval=settings.VERIFICATION_POLL_INTERVAL,
+        cache=cache,
+    )
@@ -0,0 +1,161 @@
+"""
+Verification storage.
+
+This module loads journal entries that have no verdict yet in the shape
+sent to the models, and stores reconciled verdicts. Both run in worker
+threads so the pipeline's event loop never waits on the database.
+"""
+import logging
+import time
+from collections import defaultdict
+from datetime import UTC, datetime
+
+from core.events import VERIFICATION, Event, event_bus, publish_on_commit
+from db.database import SessionLocal
+from db.models.ledger import Account, JournalEntry, Posting
+from db.models.verification import EntryVerification
+from schemas.verification import (
+    VerificationItem,
+    VerificationPosting,
+    VerificationResult,
+)
+from sqlalchemy import delete, insert, select
+from sqlalchemy.orm import Session
+
+# Configure logger
+logger = logging.getLogger(__name__)
+
+
+def load_unverified(after_id: int, limit: int) -> list[VerificationItem]:
+    """
+    Load journal entries without a stored verdict, in entry ID order.
+
+    Args:
+        after_id: Only load entries with IDs greater than this
+        limit: Maximum number of entries to load
+
+    Returns:
+        The entries as verification items
+    """
+    with SessionLocal() as db:
+        entries = db.execute(
+            select(
+                JournalEntry.id,
+                JournalEntry.posted_at,
+                JournalEntry.category,
+                JournalEntry.description,
+            )
+            .where(
+                JournalEntry.id > after_id,
+                ~select(EntryVerification.entry_id)
+                .where(EntryVerification.entry_id == JournalEntry.id)
+                .exists(),
+            )
+            .order_by(JournalEntry.id)
+            .limit(limit)
+        ).all()
+        if not entries:
+            return []
+
+        postings = defaultdict(list)
+        for row in db.execute(
+            select(
+                Posting.entry_id,
+                Account.name,
+                Account.type,
+                Posting.amount_minor,
+                Posting.currency,
+            )
+            .join(Account, Account.id == Posting.account_id)
+            .where(Posting.entry_id.in_([entry.id for entry in entries]))
+            .order_by(Posting.entry_id, Posting.id)
+        ):
+            postings[row.entry_id].append(
+                VerificationPosting(
+                    account=row.name,
+                    account_type=row.type,
+                    amount_minor=row.amount_minor,
+                    currency=row.currency,
+                )
+            )
+
+    return [
+        VerificationItem(
+            entry_id=entry.id,
+            posted_at=datetime.fromtimestamp(entry.posted_at, UTC),
+            category=entry.category,
+            description=entry.description,
+            postings=postings[entry.id],
+        )
+        for entry in entries
+    ]
+
+
+def save_results(results: list[VerificationResult]) -> None:
+    """
+    Store reconciled verdicts, replacing earlier verdicts for the same entries.
+
+    Once stored, each verdict is pushed to the event streams of the users
+    whose accounts the entry posts to.
+
+    Args:
+        results: The reconciled verdicts
+    """
+    now = int(time.time())
+    with SessionLocal() as db:
+        db.execute(
+            delete(EntryVerification).where(
+                EntryVerification.entry_id.in_([r.entry_id for r in results])
+            )
+        )
+        db.execute(
+            insert(EntryVerification),
+            [
+                {
+                    "entry_id": result.entry_id,
+                    "status": result.status,
+                    "primary_model": result.primary_model,
+                    "primary_valid": result.primary.valid,
+                    "primary_reason": result.primary.reason,
+                    "secondary_model": result.secondary_model,
+                    "secondary_valid": result.secondary.valid,
+                    "secondary_reason": result.secondary.reason,
+                    "prompt_version": result.prompt_version,
+                    "verified_at": now,
+                }
+                for result in results
+            ],
+        )
+        if event_bus.running:
+            publish_on_commit(db, _verdict_events(db, results))
+        db.commit()
+    logger.debug(f"Stored {len(results)} verification result(s)")
+
+
+def _verdict_events(
+    db: Session, results: list[VerificationResult]
+) -> list[tuple[str, Event]]:
+    """Build the stream events of stored verdicts for the entries' owners."""
+    by_entry = {result.entry_id: result for result in results}
+    owners = db.execute(
+        select(Posting.entry_id, Account.user_id)
+        .join(Account, Account.id == Posting.account_id)
+        .where(Posting.entry_id.in_(by_entry))
+        .distinct()
+    ).all()
+    return [
+        (
+            user_id,
+            Event(
+                VERIFICATION,
+                {
+                    "entry_id": entry_id,
+                    "status": by_entry[entry_id].status,
+                    "primary_valid": by_entry[entry_id].primary.valid,
+                    "secondary_valid": by_entry[entry_id].secondary.valid,
+                },
+            ),
+        )
+        for entry_id, user_id in owners
+        if event_bus.has_subscribers(user_id)
+    ]
@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+Local stub of a verification model.
+
+Serves the subset of the OpenAI chat completions API that the verification
+client uses, with a simulated per-request latency and deterministic
+rule-based verdicts, so the pipeline can be run and benchmarked offline.
+It can be mounted in-process through httpx.ASGITransport or served with
+uvicorn:
+
+    python services/verification/stub_server.py --port 9001 --latency 0.2
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+
+# Add the backend directory to sys.path before imports
+sys.path.insert(
+    0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+)
+
+from fastapi import FastAPI, Request  # noqa: E402
+from fastapi.responses import JSONResponse  # noqa: E402
+from utils.money import DEFAULT_EXPONENT, currency_exponent  # noqa: E402
+
+
+def judge(item: dict, max_amount_minor: int) -> tuple[bool, str]:
+    """
+    Rule-based verdict on one transaction.
+
+    Args:
+        item: The transaction as sent by the verification client
+        max_amount_minor: Largest posting amount considered plausible, in
+            minor units of a currency with two decimals; it is applied to the
+            major units of every currency, without exchange rates
+
+    Returns:
+        Tuple of (valid, reason)
+    """
+    postings = item.get("postings", [])
+    totals: dict[str, int] = {}
+    for posting in postings:
+        currency = posting["currency"]
+        totals[currency] = totals.get(currency, 0) + posting["amount_minor"]
+    if len(postings) < 2 or any(totals.values()):
+        return False, "Postings do not balance"
+    if any(
+        abs(posting["amount_minor"]) * 10**DEFAULT_EXPONENT
+        > max_amount_minor * 10 ** currency_exponent(posting["currency"])
+        for posting in postings
+    ):
+        return False, "Amount is implausibly large"
+    if not item.get("description", "").strip():
+        return False, "Missing description"
+    return True, "Balanced and plausible"
+
+
+def create_stub_app(
+    latency: float = 0.2,
+    max_amount_minor: int = 10_000_000,
+    error_rate: float = 0.0,
+) -> FastAPI:
+    """
+    Create a stub model server.
+
+    Two stubs with different ``max_amount_minor`` thresholds disagree on
+    large transactions, which exercises the disputed path.
+
+    Args:
+        latency: Seconds each request takes, regardless of batch size
+        max_amount_minor: Largest posting amount the stub accepts
+        error_rate: Fraction of requests answered with 503 to exercise retries
+
+    Returns:
+        The ASGI application
+    """
+    app = FastAPI(title="Verification model stub")
+
+    @app.post("/v1/chat/completions")
+    async def chat_completions(request: Request):
+        """Answer a verification prompt."""
+        body = await request.json()
+        await asyncio.sleep(latency)
+        if error_rate and random.random() < error_rate:
+            return JSONResponse(
+                status_code=503,
+                content={"error": "Simulated overload"},
+                headers={"Retry-After": "0"},
+            )
+
+        items = json.loads(body["messages"][-1]["content"])
+        verdicts = []
+        for item in items:
+            valid, reason = judge(item, max_amount_minor)
+            verdicts.append(
+                {"entry_id": item["entry_id"], "valid": valid, "reason": reason}
+            )
+
+        return {
+            "id": "stub",
+            "object": "chat.completion",
+            "model": body.get("model", "stub"),
+            "choices": [
+                {
+                    "index": 0,
+                    "finish_reason": "stop",
+                    "message": {
+                        "role": "assistant",
+                        "content": json.dumps({"verdicts": verdicts}),
+                    },
+                }
+            ],
+        }
+
+    return app
+
+
+if __name__ == "__main__":
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description="Run a verification model stub")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=9001)
+    parser.add_argument("--latency", type=float, default=0.2)
+    parser.add_argument("--max-amount", type=int, default=10_000_000)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    args = parser.parse_args()
+
+    uvicorn.run(
+        create_stub_app(args.latency, args.max_amount, args.error_rate),
+        host=args.host,
+        port=args.port,
+    )
@@ -0,0 +1,183 @@
+"""
+Startup warm-up service.
+
+The first requests after a (re)start would otherwise pay for opening
+database connections, compiling the SQL of the hot read paths and looking up
+every session in the database. This module does that work before the server
+accepts traffic: it fills the connection pools, loads the most recently
+issued live sessions into the session cache and runs the session, dashboard
+and transaction queries once so SQLAlchemy's compiled statement cache holds
+them. When serve.py preloads the app, the cache and compiled statements are
+warmed once in the parent and shared with every forked worker; connections
+cannot cross a fork, so each worker fills its own pool.
+"""
+import asyncio
+import logging
+import time
+from typing import Any
+
+from core.config import settings
+from core.exceptions import LedgerError
+from core.security import _session_lookup
+from core.session_cache import session_cache
+from db.database import SessionLocal, async_engine, engine
+from db.models.user import Session as DbSession
+from db.models.user import User
+from schemas.user import AuthResponse
+from services.dashboard import build_dashboard_data
+from services.transactions import list_transactions
+from sqlalchemy import select
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import QueuePool
+
+# Configure logger
+logger = logging.getLogger(__name__)
+
+
+def _pool_size(sync_engine: Engine) -> int:
+    """Number of persistent connections an engine's pool keeps."""
+    pool = sync_engine.pool
+    return pool.size() if isinstance(pool, QueuePool) else 1
+
+
+def warm_pool(sync_engine: Engine) -> int:
+    """
+    Open the persistent connections of a pool.
+
+    All connections are checked out at once, so the pool has to open each
+    one (running the connect-time pragmas), and are then returned to it.
+
+    Args:
+        sync_engine: The engine whose pool to fill
+
+    Returns:
+        Number of connections opened
+    """
+    connections = []
+    try:
+        for _ in range(_pool_size(sync_engine)):
+            connections.append(sync_engine.connect())
+    finally:
+        for connection in connections:
+            connection.close()
+    return len(connections)
+
+
+async def warm_async_pool(engine_async: AsyncEngine) -> int:
+    """
+    Open the persistent connections of an async engine's pool.
+
+    Args:
+        engine_async: The async engine whose pool to fill
+
+    Returns:
+        Number of connections opened
+    """
+    connections = []
+    try:
+        for _ in range(_pool_size(engine_async.sync_engine)):
+            connections.append(await engine_async.connect())
+    finally:
+        await asyncio.gather(*(connection.close() for connection in connections))
+    return len(connections)
+
+
+def warm_sessions(db: Session, limit: int) -> list[AuthResponse]:
+    """
+    Load the most recently issued live sessions into the session cache.
+
+    Sessions are issued with a fixed lifetime, so the latest expiry marks
+    the most recently active browsers.
+
+    Args:
+        db: Database session
+        limit: Maximum number of sessions to load
+
+    Returns:
+        The users of the loaded sessions
+    """
+    if not settings.SESSION_CACHE_ENABLED or limit <= 0:
+        return []
+
+    rows = db.execute(
+        select(DbSession.id, DbSession.expires_at, User.id, User.username)
+        .join(User, User.id == DbSession.user_id)
+        .where(DbSession.expires_at > int(time.time()))
+        .order_by(DbSession.expires_at.desc())
+        .limit(min(limit, session_cache.max_size))
+    ).all()
+    for session_id, expires_at, user_id, username in rows:
+        session_cache.put(session_id, user_id, username, expires_at)
+    return [AuthResponse(user_id=row[2], username=row[3]) for row in rows]
+
+
+def warm_queries(db: Session, user: AuthResponse) -> None:
+    """
+    Run the hot read paths once so their compiled statements are cached.
+
+    Args:
+        db: Database session
+        user: A user to read for; one with accounts exercises every query
+    """
+    db.execute(_session_lookup("")).first()
+    build_dashboard_data(db, user)
+    list_transactions(db, user.user_id, limit=1)
+
+
+def warm_up(queries: bool = True) -> dict[str, Any]:
+    """
+    Warm the sync connection pool, the session cache and the hot queries.
+
+    Failures are logged rather than raised, so a database that is not set up
+    yet does not keep the server from starting.
+
+    Args:
+        queries: Also warm the session cache and compiled statements; skip
+            when they were already warmed in a preloading parent process
+
+    Returns:
+        Dictionary with the connections opened, sessions cached and the
+        milliseconds each step took
+    """
+    report: dict[str, Any] = {}
+    started = time.perf_counter()
+    try:
+        report["connections"] = warm_pool(engine)
+        report["pool_ms"] = round((time.perf_counter() - started) * 1000, 1)
+
+        if queries:
+            started = time.perf_counter()
+            with SessionLocal() as db:
+                users = warm_sessions(db, settings.WARMUP_SESSIONS)
+                report["sessions"] = len(users)
+                warm_queries(
+                    db, users[0] if users else AuthResponse(user_id="", username="")
+                )
+                db.rollback()
+            report["queries_ms"] = round((time.perf_counter() - started) * 1000, 1)
+    except (SQLAlchemyError, LedgerError) as e:
+        logger.warning(f"Warm-up failed: {str(e)}")
+        report["error"] = str(e)
+    return report
+
+
+async def warm_up_async(queries: bool = True) -> dict[str, Any]:
+    """
+    Warm up without blocking the event loop, including the async pool.
+
+    Args:
+        queries: Also warm the session cache and compiled statements
+
+    Returns:
+        The warm_up report, with the async connections opened if enabled
+    """
+    report = await asyncio.to_thread(warm_up, queries)
+    if async_engine is not None:
+        try:
+            report["async_connections"] = await warm_async_pool(async_engine)
+        except SQLAlchemyError as e:
+            logger.warning(f"Async pool warm-up failed: {str(e)}")
+    return report
@@ -6,6 +6,15 @@ cryptographic operations needed by the application.
 """
 import hashlib
 import logging
+import os
+from collections.abc import Iterable, Sequence
+
+from cryptography.exceptions import InvalidSignature
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric.ed25519 import (
+    Ed25519PrivateKey,
+    Ed25519PublicKey,
+)
 
 # Configure logger
 logger = logging.getLogger(__name__)
@@ -27,3 +36,264 @@ def sha256_hex(value: str) -> str:
 
     # Convert to lowercase hex to match encodeHexLowerCase from @oslojs/encoding
     return hash_bytes.hex().lower()
+
+
+# Previous-hash value of the first entry of a hash chain
+GENESIS_HASH = "0" * 64
+
+
+def chain_hash(prev_hash: str, payload: bytes) -> str:
+    """
+    Compute the hash of a hash-chain link.
+
+    Args:
+        prev_hash: Lowercase hex hash of the previous link
+        payload: Canonical bytes of this link's content
+
+    Returns:
+        Lowercase hexadecimal SHA-256 of the previous hash and the payload
+    """
+    return hashlib.sha256(prev_hash.encode() + payload).hexdigest()
+
+
+# Domain separation prefixes keep a leaf from ever hashing like an inner node
+MERKLE_LEAF_PREFIX = b"\x00"
+MERKLE_NODE_PREFIX = b"\x01"
+
+
+def merkle_leaf(entry_hash: str) -> bytes:
+    """
+    Compute the Merkle leaf hash of an entry.
+
+    Args:
+        entry_hash: Lowercase hex hash of the journal entry
+
+    Returns:
+        The leaf hash
+    """
+    return hashlib.sha256(MERKLE_LEAF_PREFIX + bytes.fromhex(entry_hash)).digest()
+
+
+def merkle_node(left: bytes, right: bytes) -> bytes:
+    """
+    Compute the hash of an inner Merkle node.
+
+    Args:
+        left: Hash of the left child
+        right: Hash of the right child
+
+    Returns:
+        The node hash
+    """
+    return hashlib.sha256(MERKLE_NODE_PREFIX + left + right).digest()
+
+
+def _merkle_parent_level(level: list[bytes]) -> list[bytes]:
+    """Hash one tree level into the next, promoting an unpaired last node."""
+    parents = [
+        merkle_node(level[i], level[i + 1]) for i in range(0, len(level) - 1, 2)
+    ]
+    if len(level) % 2:
+        parents.append(level[-1])
+    return parents
+
+
+def merkle_root(leaves: list[bytes]) -> str:
+    """
+    Compute the Merkle root of a list of leaf hashes.
+
+    Args:
+        leaves: Leaf hashes in order (must not be empty)
+
+    Returns:
+        Lowercase hex root hash
+    """
+    if not leaves:
+        raise ValueError("Cannot compute the Merkle root of no leaves")
+
+    level = leaves
+    while len(level) > 1:
+        level = _merkle_parent_level(level)
+    return level[0].hex()
+
+
+def merkle_path(leaves: list[bytes], index: int) -> list[tuple[str, str]]:
+    """
+    Compute the inclusion path of one leaf.
+
+    Args:
+        leaves: Leaf hashes in order
+        index: Position of the leaf to prove
+
+    Returns:
+        (side, sibling hash) pairs from the leaf up to the root, where side
+        is "left" or "right" for the sibling's position
+    """
+    if not 0 <= index < len(leaves):
+        raise IndexError(f"Leaf index {index} out of range")
+
+    path = []
+    level = leaves
+    while len(level) > 1:
+        sibling = index ^ 1
+        # An unpaired last node is promoted without a sibling
+        if sibling < len(level):
+            side = "left" if sibling < index else "right"
+            path.append((side, level[sibling].hex()))
+        level = _merkle_parent_level(level)
+        index //= 2
+    return path
+
+
+def verify_merkle_proof(
+    entry_hash: str, path: list[tuple[str, str]], root: str
+) -> bool:
+    """
+    Check that an entry hash is included under a Merkle root.
+
+    Args:
+        entry_hash: Lowercase hex hash of the journal entry
+        path: (side, sibling hash) pairs as returned by merkle_path
+        root: Lowercase hex Merkle root of the block
+
+    Returns:
+        True if the path leads from the entry to the root
+    """
+    node = merkle_leaf(entry_hash)
+    for side, sibling in path:
+        if side == "left":
+            node = merkle_node(bytes.fromhex(sibling), node)
+        elif side == "right":
+            node = merkle_node(node, bytes.fromhex(sibling))
+        else:
+            return False
+    return node.hex() == root
+
+
+def generate_signing_key(path: str) -> Ed25519PrivateKey:
+    """
+    Generate an Ed25519 signing key and write it as an unencrypted PKCS#8 PEM.
+
+    The file is created with owner-only permissions and never overwritten.
+
+    Args:
+        path: Where to write the private key
+
+    Returns:
+        The new private key
+
+    Raises:
+        FileExistsError: If the file already exists
+    """
+    key = Ed25519PrivateKey.generate()
+    pem = key.private_bytes(
+        serialization.Encoding.PEM,
+        serialization.PrivateFormat.PKCS8,
+        serialization.NoEncryption(),
+    )
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+    with os.fdopen(fd, "wb") as f:
+        f.write(pem)
+    return key
+
+
+def load_signing_key(path: str) -> Ed25519PrivateKey:
+    """
+    Load an Ed25519 private key from a PEM file.
+
+    Args:
+        path: Path of the PKCS#8 PEM file
+
+    Returns:
+        The private key
+
+    Raises:
+        ValueError: If the file does not hold an Ed25519 private key
+    """
+    with open(path, "rb") as f:
+        key = serialization.load_pem_private_key(f.read(), password=None)
+    if not isinstance(key, Ed25519PrivateKey):
+        raise ValueError(f"{path} does not contain an Ed25519 private key")
+    return key
+
+
+def load_verify_key(path: str) -> Ed25519PublicKey:
+    """
+    Load an Ed25519 public key from a PEM file.
+
+    Args:
+        path: Path of the SubjectPublicKeyInfo PEM file
+
+    Returns:
+        The public key
+
+    Raises:
+        ValueError: If the file does not hold an Ed25519 public key
+    """
+    with open(path, "rb") as f:
+        key = serialization.load_pem_public_key(f.read())
+    if not isinstance(key, Ed25519PublicKey):
+        raise ValueError(f"{path} does not contain an Ed25519 public key")
+    return key
+
+
+def public_key_bytes(key: Ed25519PublicKey) -> bytes:
+    """Raw 32-byte encoding of an Ed25519 public key."""
+    return key.public_bytes(
+        serialization.Encoding.Raw, serialization.PublicFormat.Raw
+    )
+
+
+def key_id(key: Ed25519PublicKey) -> str:
+    """
+    Short identifier of a public key, stored next to each signature.
+
+    Args:
+        key: The public key
+
+    Returns:
+        First 16 hex digits of the SHA-256 of the raw public key
+    """
+    return hashlib.sha256(public_key_bytes(key)).hexdigest()[:16]
+
+
+def sign_hashes(key: Ed25519PrivateKey, hashes: Iterable[str]) -> list[str]:
+    """
+    Sign a batch of hex digests.
+
+    Args:
+        key: The private key
+        hashes: Lowercase hex digests to sign (their raw bytes are signed)
+
+    Returns:
+        Lowercase hex Ed25519 signatures, in input order
+    """
+    sign = key.sign
+    return [sign(bytes.fromhex(value)).hex() for value in hashes]
+
+
+def verify_signatures(
+    raw_public_key: bytes, pairs: Sequence[tuple[str, str]]
+) -> list[bool]:
+    """
+    Verify a batch of signatures over hex digests.
+
+    Takes the raw public key so it can be sent to worker processes cheaply.
+
+    Args:
+        raw_public_key: Raw 32-byte Ed25519 public key
+        pairs: Tuples of (hex digest, hex signature)
+
+    Returns:
+        Whether each signature is valid, in input order
+    """
+    verify = Ed25519PublicKey.from_public_bytes(raw_public_key).verify
+    results = []
+    for value, signature in pairs:
+        try:
+            verify(bytes.fromhex(signature), bytes.fromhex(value))
+            results.append(True)
+        except (InvalidSignature, ValueError):
+            results.append(False)
+    return results
@@ -0,0 +1,72 @@
+"""
+Money conversion helpers.
+
+The ledger stores amounts as integers in minor units of their account's
+currency; API schemas expose them as decimal amounts. This module converts
+between the two and knows how many minor-unit digits each currency has.
+"""
+from decimal import ROUND_HALF_EVEN, Decimal
+
+# Minor-unit exponent for amounts without an explicit currency
+DEFAULT_EXPONENT = 2
+
+# Currency of accounts created without one (ISO 4217)
+DEFAULT_CURRENCY = "USD"
+
+# ISO 4217 currencies whose minor-unit exponent is not DEFAULT_EXPONENT
+CURRENCY_EXPONENTS = {
+    "BHD": 3,
+    "BIF": 0,
+    "CLP": 0,
+    "IQD": 3,
+    "ISK": 0,
+    "JOD": 3,
+    "JPY": 0,
+    "KMF": 0,
+    "KRW": 0,
+    "KWD": 3,
+    "LYD": 3,
+    "OMR": 3,
+    "PYG": 0,
+    "RWF": 0,
+    "TND": 3,
+    "UGX": 0,
+    "VND": 0,
+    "XAF": 0,
+    "XOF": 0,
+    "XPF": 0,
+}
+
+
+def currency_exponent(currency: str) -> int:
+    """Return the number of minor-unit digits of an ISO 4217 currency."""
+    return CURRENCY_EXPONENTS.get(currency, DEFAULT_EXPONENT)
+
+
+def to_minor(amount: float | Decimal | str, exponent: int = DEFAULT_EXPONENT) -> int:
+    """
+    Convert a decimal amount to integer minor units.
+
+    Args:
+        amount: The amount in major units
+        exponent: Number of minor-unit digits (2 for cents)
+
+    Returns:
+        The amount in minor units, rounded half to even
+    """
+    scaled = Decimal(str(amount)).scaleb(exponent)
+    return int(scaled.quantize(Decimal(1), rounding=ROUND_HALF_EVEN))
+
+
+def from_minor(amount_minor: int, exponent: int = DEFAULT_EXPONENT) -> float:
+    """
+    Convert integer minor units to a decimal amount.
+
+    Args:
+        amount_minor: The amount in minor units
+        exponent: Number of minor-unit digits (2 for cents)
+
+    Returns:
+        The amount in major units
+    """
+    return amount_minor / 10**exponent
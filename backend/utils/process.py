@@ -0,0 +1,73 @@
+"""
+Process memory and age helpers.
+
+Workers forked from a preloaded parent share its pages until they write to
+them, so resident size alone overstates what each worker costs. This module
+reads the proportional and private sizes Linux reports, falling back to the
+peak resident size elsewhere, and how long ago the process started, which
+for a forked worker is the time of the fork.
+"""
+import os
+import resource
+import sys
+import time
+
+# Fallback reference point for process_age() where /proc is unavailable
+_IMPORTED = time.monotonic()
+
+# Fields of /proc/self/smaps_rollup reported, in kB
+SMAPS_FIELDS = {
+    "Rss": "rss",
+    "Pss": "pss",
+    "Private_Clean": "private",
+    "Private_Dirty": "private",
+    "Shared_Clean": "shared",
+    "Shared_Dirty": "shared",
+}
+
+
+def memory_usage() -> dict[str, int]:
+    """
+    Measure the memory of the current process.
+
+    Returns:
+        Bytes by kind: rss (resident), pss (resident with shared pages split
+        between the processes sharing them), private and shared. Only rss
+        (the peak) is available outside Linux.
+    """
+    usage: dict[str, int] = {}
+    try:
+        with open("/proc/self/smaps_rollup") as f:
+            for line in f:
+                name, _, value = line.partition(":")
+                kind = SMAPS_FIELDS.get(name)
+                if kind is not None:
+                    usage[kind] = usage.get(kind, 0) + int(value.split()[0]) * 1024
+    except OSError:
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # Linux reports kilobytes, macOS bytes
+        usage["rss"] = peak if sys.platform == "darwin" else peak * 1024
+    return usage
+
+
+def format_memory(usage: dict[str, int]) -> str:
+    """Format a memory_usage() result as "rss 80.1 MiB, pss 30.2 MiB, ..."."""
+    return ", ".join(f"{kind} {value / 2**20:.1f} MiB" for kind, value in usage.items())
+
+
+def process_age() -> float:
+    """
+    Seconds since the current process was started (or forked).
+
+    Returns:
+        The age from the kernel's start time on Linux, and the time since
+        this module was imported elsewhere
+    """
+    try:
+        with open("/proc/self/stat") as f:
+            # Fields after the parenthesized command name; starttime is 22nd
+            fields = f.read().rsplit(")", 1)[1].split()
+        started = int(fields[19]) / os.sysconf("SC_CLK_TCK")
+        return max(0.0, time.clock_gettime(time.CLOCK_BOOTTIME) - started)
+    except (OSError, ValueError, AttributeError):
+        return time.monotonic() - _IMPORTED
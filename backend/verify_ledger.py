@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+"""
+Script to verify derived ledger data against the postings.
+
+The checkpoints command rebuilds the balance checkpoints from scratch, diffs
+them against the stored rows and, with --fix, replaces the mismatching ones.
+The chain command recomputes the journal entry hash chain, segment by
+segment across worker processes. Exits with status 1 when differences or
+broken links remain. The blocks command recomputes the Merkle root of every
+sealed block and, with --seal, first seals the trailing unsealed entries
+into a final partial block. The signatures command verifies the Ed25519
+signature of every entry across worker processes.
+"""
+
+import argparse
+import logging
+import os
+import sys
+
+# Add the parent directory to sys.path before imports
+parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, parent_dir)
+
+# Application modules are imported by the command that uses them, so --help and usage
+# errors do not pay for SQLAlchemy and the models
+
+# Setup logging
+logging.basicConfig(
+    level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s"
+)
+logger = logging.getLogger(__name__)
+
+
+def describe(row) -> str:
+    """Format a checkpoint row for the report"""
+    if row is None:
+        return "missing"
+    return f"delta={row.delta_minor} closing={row.closing_minor}"
+
+
+def check_checkpoints(account_ids: list[int] | None, fix: bool) -> bool:
+    """Rebuild balance checkpoints and report differences"""
+    from db.database import SessionLocal
+    from services.checkpoints import verify_checkpoints
+
+    with SessionLocal() as db:
+        diffs = verify_checkpoints(db, account_ids=account_ids, fix=fix)
+
+    for diff in diffs:
+        logger.warning(
+            f"Account {diff.account_id} {diff.granularity} {diff.period_start}: "
+            f"expected {describe(diff.expected)}, stored {describe(diff.actual)}"
+        )
+
+    if diffs and fix:
+        logger.info(f"Replaced checkpoints for {len(diffs)} difference(s)")
+        return True
+    return not diffs
+
+
+def check_chain(workers: int | None, batch_size: int) -> bool:
+    """Recompute the hash chain and report broken links"""
+    from services.chain import verify_chain
+
+    report = verify_chain(workers=workers, batch_size=batch_size)
+
+    for error in report.errors:
+        logger.warning(error)
+    if report.error_count > len(report.errors):
+        logger.warning(f"... and {report.error_count - len(report.errors)} more")
+
+    logger.info(
+        f"Checked {report.entries} entries in {report.segments} segment(s) "
+        f"({report.entries / max(report.elapsed, 1e-9):.0f} entries/s)"
+    )
+    return report.ok
+
+
+def check_blocks(seal: bool) -> bool:
+    """Optionally seal pending entries, then verify all Merkle blocks"""
+    from db.database import SessionLocal
+    from services.blocks import seal_blocks, verify_blocks
+    from services.chain import lock_chain_head
+
+    with SessionLocal() as db:
+        if seal:
+            # Serialize with concurrent appends, which also seal blocks
+            lock_chain_head(db)
+            block_ids = seal_blocks(db, partial=True)
+            db.commit()
+            logger.info(f"Sealed {len(block_ids)} block(s)")
+
+        problems = verify_blocks(db)
+
+    for problem in problems:
+        logger.warning(problem)
+    return not problems
+
+
+def check_signatures(workers: int | None, batch_size: int) -> bool:
+    """Verify every entry signature and report failures"""
+    from services.signing import verify_all_signatures
+
+    report = verify_all_signatures(workers=workers, batch_size=batch_size)
+
+    for entry_id in report.failures:
+        logger.warning(f"Entry {entry_id}: invalid signature")
+    if report.invalid > len(report.failures):
+        logger.warning(f"... and {report.invalid - len(report.failures)} more")
+    if report.unknown_key:
+        logger.warning(f"{report.unknown_key} entries signed by another key")
+
+    logger.info(
+        f"Checked {report.entries} signatures "
+        f"({report.entries / max(report.elapsed, 1e-9):.0f} signatures/s)"
+    )
+    return report.ok
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Verify derived ledger data")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    checkpoints = commands.add_parser(
+        "checkpoints", help="Rebuild balance checkpoints and diff them"
+    )
+    checkpoints.add_argument(
+        "--account", type=int, action="append", help="Only verify this account"
+    )
+    checkpoints.add_argument(
+        "--fix",
+        action="store_true",
+        help="Replace mismatching checkpoints (requires DATABASE_READ_ONLY=false)",
+    )
+
+    chain = commands.add_parser("chain", help="Recompute the entry hash chain")
+    chain.add_argument(
+        "--workers", type=int, help="Worker processes (defaults to the CPU count)"
+    )
+    chain.add_argument(
+        "--batch-size", type=int, default=5_000, help="Entries read per query"
+    )
+
+    blocks = commands.add_parser("blocks", help="Recompute Merkle block roots")
+    blocks.add_argument(
+        "--seal",
+        action="store_true",
+        help="Seal unsealed entries first (requires DATABASE_READ_ONLY=false)",
+    )
+
+    signatures = commands.add_parser(
+        "signatures", help="Verify the Ed25519 signature of every entry"
+    )
+    signatures.add_argument(
+        "--workers", type=int, help="Worker processes (defaults to the CPU count)"
+    )
+    signatures.add_argument(
+        "--batch-size", type=int, default=10_000, help="Entries per worker batch"
+    )
+    args = parser.parse_args()
+
+    if args.command == "checkpoints":
+        ok = check_checkpoints(args.account, args.fix)
+    elif args.command == "chain":
+        ok = check_chain(args.workers, args.batch_size)
+    elif args.command == "blocks":
+        ok = check_blocks(args.seal)
+    elif args.command == "signatures":
+        ok = check_signatures(args.workers, args.batch_size)
+    sys.exit(0 if ok else 1)
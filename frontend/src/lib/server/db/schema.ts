@@ -1,4 +1,4 @@
-import { sqliteTable, text, integer } from 'drizzle-orm/sqlite-core';
+import { sqliteTable, text, integer, index } from 'drizzle-orm/sqlite-core';
 
 // Auth tables
 export const user = sqliteTable('user', {
@@ -8,13 +8,18 @@ export const user = sqliteTable('user', {
 	passwordHash: text('password_hash').notNull()
 });
 
-export const session = sqliteTable('session', {
-	id: text('id').primaryKey(),
-	userId: text('user_id')
-		.notNull()
-		.references(() => user.id),
-	expiresAt: integer('expires_at', { mode: 'timestamp' }).notNull()
-});
+export const session = sqliteTable(
+	'session',
+	{
+		id: text('id').primaryKey(),
+		userId: text('user_id')
+			.notNull()
+			.references(() => user.id),
+		expiresAt: integer('expires_at', { mode: 'timestamp' }).notNull()
+	},
+	// Used by the backend's expired-session sweeper
+	(table) => [index('session_expires_at_idx').on(table.expiresAt)]
+);
 
 // Type exports
 export type Session = typeof session.$inferSelect;